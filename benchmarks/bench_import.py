@@ -0,0 +1,62 @@
+"""Cold import time of the addon module, measured with python -X importtime.
+
+Fails (exit code 1) when the cumulative import time exceeds --max-ms or when a
+module that should be deferred (pydantic by default) is imported eagerly.
+
+    python benchmarks/bench_import.py --max-ms 250
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def measure(module: str = "template_rooms_pkg.addon", runs: int = 5) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    timings = []
+    imported = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative_us, name = line[len("import time:"):].split("|")
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+        timings.append(cumulative[module] / 1000)
+        imported = set(cumulative)
+    return {"module": module, "best_ms": min(timings), "runs_ms": timings, "imported": sorted(imported)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="template_rooms_pkg.addon")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail above this cumulative import time")
+    parser.add_argument("--forbid", action="append", default=None, help="module that must not be imported")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    forbidden = [name for name in (args.forbid or ["pydantic"]) if name in result["imported"]]
+    print(json.dumps({"module": result["module"], "best_ms": result["best_ms"], "runs_ms": result["runs_ms"],
+                      "forbidden_imported": forbidden}, indent=2))
+
+    if forbidden:
+        print(f"eagerly imported: {forbidden}", file=sys.stderr)
+        return 1
+    if args.max_ms is not None and result["best_ms"] > args.max_ms:
+        print(f"import time {result['best_ms']:.1f} ms exceeds {args.max_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
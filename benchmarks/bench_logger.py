@@ -0,0 +1,54 @@
+"""Per-call cost of the addon logger with DEBUG filtered out.
+
+Compares the previous per-access PrefixedLogger with the cached bound logger.
+
+    python benchmarks/bench_logger.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from template_rooms_pkg.addon import TemplateRoomsAddon  # noqa: E402
+
+
+class PrefixedLogger:
+    """Logger previously returned by TemplateRoomsAddon.logger on every access."""
+
+    def __init__(self, addon_type):
+        self.addon_type = addon_type
+        self._logger = logger
+
+    def debug(self, message):
+        self._logger.debug(f"[TYPE: {self.addon_type.upper()}] {message}")
+
+
+def main(number: int = 100_000) -> dict[str, float]:
+    logger.remove()
+    logger.add(lambda message: None, level="INFO")
+
+    addon = TemplateRoomsAddon()
+    descriptions = {f"tool_{i}": f"Description of tool {i}" for i in range(50)}
+
+    def legacy():
+        PrefixedLogger(addon.type).debug(f"Tool descriptions provided: {descriptions}")
+
+    def cached():
+        addon.logger.debug("Tool descriptions provided: {}", descriptions)
+
+    def cached_lazy():
+        addon.logger.opt(lazy=True).debug("Tool descriptions provided: {}", lambda: descriptions)
+
+    results = {}
+    for name, func in (("legacy", legacy), ("cached", cached), ("cached_lazy", cached_lazy)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        results[name] = seconds / number * 1e9
+        print(f"{name:>12}: {results[name]:8.1f} ns/call")
+    return results
+
+
+if __name__ == "__main__":
+    main()
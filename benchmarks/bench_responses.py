@@ -0,0 +1,51 @@
+"""CPU and allocation cost of building an ActionResponse.
+
+Compares full pydantic validation with the trusted build_response fast path.
+
+    python benchmarks/bench_responses.py
+"""
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from template_rooms_pkg.actions.base import ActionResponse, TokensSchema, build_model, build_response  # noqa: E402
+from template_rooms_pkg.actions.example import ActionOutput  # noqa: E402
+
+
+def validated():
+    output = ActionOutput(data={"processed": "value- processed -"})
+    tokens = TokensSchema(stepAmount=2000, totalCurrentAmount=16236)
+    return ActionResponse(output=output, tokens=tokens, message="Action executed successfully", code=200)
+
+
+def trusted():
+    output = build_model(ActionOutput, data={"processed": "value- processed -"})
+    return build_response(output, step_amount=2000, total_amount=16236,
+                          message="Action executed successfully", code=200)
+
+
+def allocated_bytes(func, number: int = 1000) -> float:
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    keep = [func() for _ in range(number)]
+    stats = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    tracemalloc.stop()
+    del keep
+    return sum(stat.size_diff for stat in stats) / number
+
+
+def main(number: int = 50_000) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, func in (("validated", validated), ("trusted", trusted)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        results[name] = {"ns_per_call": seconds / number * 1e9, "bytes_per_call": allocated_bytes(func)}
+        print(f"{name:>10}: {results[name]['ns_per_call']:8.1f} ns/call, "
+              f"{results[name]['bytes_per_call']:8.1f} bytes/call")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Timing, allocation and baseline comparison helpers shared by the benchmark suite."""
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(
+    func: Callable[[Any], Any],
+    setup: Optional[Callable[[], Any]] = None,
+    iterations: int = 100,
+    warmup: int = 5,
+    ops_per_call: int = 1,
+) -> dict[str, float]:
+    """
+    Time func(setup()) iterations times and measure its allocations.
+
+    setup runs outside the timed region, so per-iteration state (a fresh registry,
+    a cleared cache) does not count. Latency percentiles are per call, throughput
+    counts ops_per_call operations per call (e.g. addons configured per call).
+    Allocations are traced on a separate run, so tracing does not skew timings.
+    """
+    setup = setup or (lambda: None)
+    for _ in range(warmup):
+        func(setup())
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            state = setup()
+            start = time.perf_counter_ns()
+            func(state)
+            timings.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        func(state)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total_s = sum(timings) / 1e9
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations * ops_per_call / total_s, 1) if total_s else float("inf"),
+        "mean_us": round(sum(timings) / len(timings) / 1000, 3),
+        "p50_us": round(_percentile(timings, 0.50) / 1000, 3),
+        "p99_us": round(_percentile(timings, 0.99) / 1000, 3),
+        "alloc_bytes": current,
+        "alloc_peak_bytes": peak,
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float = 0.2) -> list[dict[str, Any]]:
+    """
+    Benchmarks whose p50 latency or allocated bytes grew by more than threshold over the baseline.
+
+    Benchmarks missing from either side are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("p50_us", "alloc_peak_bytes"):
+            before, after = base.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append({"benchmark": name, "metric": metric, "baseline": before,
+                                    "current": after, "change": round(change, 3)})
+    return regressions
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def write_json(path: Path, data: dict[str, Any]) -> None:
+    Path(path).write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,310 @@
+"""Benchmark suite for the addon hot paths.
+
+Measures throughput, p50/p99 latency and allocations of tool registration and
+validated tool calls (1, 100 and 10k tools), tool schema generation (also per
+schema path, native against pydantic), loadAddonConfig and loadCredentials
+(1 and 1k addon instances) and action invocation, writes the results as JSON
+and optionally compares them with a stored baseline.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Exits with code 1 when a benchmark's p50 latency or peak allocation grew by
+more than --threshold (a fraction) over the baseline. --include-legacy adds the
+standalone logger, response and import benchmarks to the report.
+"""
+import argparse
+import contextlib
+import dataclasses
+import enum
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from harness import compare, load_json, measure, write_json  # noqa: E402
+
+from template_rooms_pkg.addon import TemplateRoomsAddon  # noqa: E402
+from template_rooms_pkg.configuration import config_cache  # noqa: E402
+from template_rooms_pkg.tools import ToolRegistry, schema_cache  # noqa: E402
+
+TOOL_COUNTS = (1, 100, 10_000)
+ADDON_COUNTS = (1, 1000)
+SECRETS = {"example_api_key": "KEY", "example_secret": "SECRET"}
+
+
+def make_tools(count: int) -> dict[str, Callable]:
+    tools = {}
+    for i in range(count):
+        def tool(query: str, limit: int = 10, verbose: bool = False) -> dict:
+            return {"query": query, "limit": limit}
+        tool.__name__ = tool.__qualname__ = f"tool_{i}"
+        tool.__doc__ = f"Benchmark tool {i}"
+        tools[tool.__name__] = tool
+    return tools
+
+
+class Priority(enum.Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+@dataclasses.dataclass
+class Window:
+    start: int
+    end: Optional[int] = None
+
+
+def simple_tool(query: str, limit: int = 10, verbose: bool = False) -> dict:
+    return {}
+
+
+def rich_tool(
+    query: str,
+    tags: list[str],
+    window: Window,
+    mode: Literal["fast", "exact"] = "fast",
+    priority: Priority = Priority.LOW,
+    filters: Optional[dict[str, float]] = None,
+) -> dict:
+    return {}
+
+
+def make_config(index: int) -> dict[str, Any]:
+    return {
+        "id": f"bench_addon_{index}",
+        "type": "example",
+        "name": f"Benchmark addon {index}",
+        "example_param1": "value",
+        "secrets": dict(SECRETS),
+    }
+
+
+def _iterations(base: int, scale: float) -> int:
+    return max(3, int(base * scale))
+
+
+def tool_benchmarks(scale: float) -> dict[str, tuple]:
+    cases = {}
+    for count in TOOL_COUNTS:
+        tools = make_tools(count)
+        iterations = max(1, 2000 // count)
+
+        def registered(tools=tools):
+            registry = ToolRegistry()
+            registry.register_tools(tools)
+            return registry
+
+        def cold(tools=tools):
+            schema_cache.clear()
+            return registered(tools)
+
+        cases[f"register_tools[{count}]"] = (
+            lambda registry, tools=tools: registry.register_tools(tools), ToolRegistry, iterations, 1,
+        )
+        # validators are compiled on first call, so the timed calls only pay validation
+        warm_registry = registered(tools)
+        last_tool = f"tool_{count - 1}"
+        warm_registry.call(last_tool, {"query": "q"})
+        cases[f"tool_call[{count}]"] = (
+            lambda registry, name=last_tool: registry.call(name, {"query": "q", "limit": "5"}),
+            lambda registry=warm_registry: registry, 2000, 1,
+        )
+        cases[f"tool_schemas_cold[{count}]"] = (
+            lambda registry: registry.get_tools_for_action(), cold, max(1, 200 // count), 1,
+        )
+        cases[f"tool_schemas_warm[{count}]"] = (
+            lambda registry: registry.get_tools_for_action(), registered, iterations, 1,
+        )
+
+        def snapshotted(tools=tools):
+            registry = registered(tools)
+            registry.snapshot()
+            return registry
+
+        # handing out the unchanged snapshot again, as hosts do on every LLM request
+        cases[f"tool_snapshot[{count}]"] = (lambda registry: registry.snapshot(), snapshotted, iterations, 1)
+        # serializing the provider payload per request, against reusing the cached bytes
+        cases[f"tool_payload_serialize[{count}]"] = (
+            lambda registry: json.dumps(registry.format_tools("openai")).encode(), snapshotted, iterations, 1,
+        )
+
+        def serialized(tools=tools):
+            registry = snapshotted(tools)
+            registry.format_tools_json("openai")
+            return registry
+
+        cases[f"tool_payload_cached[{count}]"] = (
+            lambda registry: registry.format_tools_json("openai"), serialized, iterations, 1,
+        )
+    return {name: (func, setup, _iterations(iterations, scale), ops) for name, (func, setup, iterations, ops) in cases.items()}
+
+
+def schema_path_benchmarks(scale: float) -> dict[str, tuple]:
+    # one schema build per call, through the native compiler and through a pydantic model
+    cases = {}
+    for label, tool in (("simple", simple_tool), ("rich", rich_tool)):
+        cases[f"schema_native[{label}]"] = (lambda registry, tool=tool: registry._build_schema(tool), ToolRegistry, 2000, 1)
+        cases[f"schema_pydantic[{label}]"] = (
+            lambda registry, tool=tool: registry._build_pydantic_schema(tool), ToolRegistry, 200, 1,
+        )
+    return {name: (func, setup, _iterations(iterations, scale), ops) for name, (func, setup, iterations, ops) in cases.items()}
+
+
+def addon_benchmarks(scale: float) -> dict[str, tuple]:
+    cases = {}
+    for count in ADDON_COUNTS:
+        configs = [make_config(i) for i in range(count)]
+        iterations = max(3, 1000 // count)
+
+        def fresh_addons(count=count):
+            return [TemplateRoomsAddon() for _ in range(count)]
+
+        def configured_addons(configs=configs):
+            addons = fresh_addons(len(configs))
+            for addon, config in zip(addons, configs):
+                addon.loadAddonConfig(config)
+            return addons
+
+        def load_configs(addons, configs=configs):
+            for addon, config in zip(addons, configs):
+                addon.loadAddonConfig(config)
+
+        def load_credentials(addons):
+            for addon in addons:
+                addon.loadCredentials(**SECRETS)
+
+        cases[f"load_addon_config[{count}]"] = (load_configs, fresh_addons, iterations, count)
+        cases[f"load_credentials[{count}]"] = (load_credentials, configured_addons, iterations, count)
+    return {name: (func, setup, _iterations(iterations, scale), ops) for name, (func, setup, iterations, ops) in cases.items()}
+
+
+def action_benchmarks(scale: float) -> dict[str, tuple]:
+    from template_rooms_pkg.actions.cache import ResponseCache, cached_action
+    from template_rooms_pkg.actions.example import ActionInput, example
+
+    # the example action is not cached, a decorated copy measures the response cache
+    cache = ResponseCache()
+    cached_example = cached_action(ActionInput, cache=cache)(example)
+
+    def configured_addon():
+        addon = TemplateRoomsAddon()
+        addon.loadAddonConfig(make_config(0))
+        return addon
+
+    def uncached_addon():
+        cache.clear()
+        return configured_addon()
+
+    def cached_addon():
+        addon = uncached_addon()
+        addon._runAction(cached_example, param1="a", param2="b")
+        return addon
+
+    inputs = [{"param1": f"value {i}", "param2": "b"} for i in range(100)]
+    return {
+        "action_direct": (
+            lambda addon: example(addon.config, param1="a", param2="b"), configured_addon, _iterations(2000, scale), 1,
+        ),
+        "action_invoke": (lambda addon: addon.example("a", "b"), configured_addon, _iterations(2000, scale), 1),
+        "action_invoke_cache_miss": (
+            lambda addon: addon._runAction(cached_example, param1="a", param2="b"),
+            uncached_addon, _iterations(500, scale), 1,
+        ),
+        "action_invoke_cache_hit": (
+            lambda addon: addon._runAction(cached_example, param1="a", param2="b"),
+            cached_addon, _iterations(2000, scale), 1,
+        ),
+        "action_batch[100]": (
+            lambda addon: list(addon.runBatch("example", inputs)), configured_addon, _iterations(50, scale), 100,
+        ),
+    }
+
+
+def legacy_benchmarks(scale: float) -> dict[str, Any]:
+    import bench_import
+    import bench_logger
+    import bench_responses
+
+    # their progress output goes to stderr, stdout may carry the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        return {
+            "logger_ns_per_call": bench_logger.main(number=max(1000, int(100_000 * scale))),
+            "responses": bench_responses.main(number=max(1000, int(50_000 * scale))),
+            "import_ms": bench_import.measure(runs=3)["best_ms"],
+        }
+
+
+def run(scale: float = 1.0, only: Optional[str] = None, include_legacy: bool = False) -> dict[str, Any]:
+    # keep log formatting out of the measurements, as in production with INFO filtered
+    logger.remove()
+    logger.add(lambda message: None, level="WARNING")
+
+    cases = {
+        **tool_benchmarks(scale),
+        **schema_path_benchmarks(scale),
+        **addon_benchmarks(scale),
+        **action_benchmarks(scale),
+    }
+    results = {}
+    for name, (func, setup, iterations, ops_per_call) in cases.items():
+        if only and only not in name:
+            continue
+        results[name] = measure(func, setup, iterations=iterations, warmup=min(3, iterations), ops_per_call=ops_per_call)
+        print(f"{name:>28}: p50 {results[name]['p50_us']:>12.1f} us  p99 {results[name]['p99_us']:>12.1f} us  "
+              f"{results[name]['ops_per_sec']:>12.1f} ops/s  peak {results[name]['alloc_peak_bytes']:>10} B",
+              file=sys.stderr)
+    config_cache.clear()
+    schema_cache.clear()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
+    if include_legacy:
+        report["legacy"] = legacy_benchmarks(scale)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="baseline report to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression, default 0.2")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the iteration counts")
+    parser.add_argument("--only", help="run benchmarks whose name contains this string")
+    parser.add_argument("--include-legacy", action="store_true", help="also run the standalone benchmarks")
+    args = parser.parse_args(argv)
+
+    report = run(args.scale, args.only, args.include_legacy)
+
+    exit_code = 0
+    if args.baseline:
+        regressions = compare(report["results"], load_json(args.baseline)["results"], args.threshold)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']} (+{regression['change']:.0%})", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    if args.output:
+        write_json(args.output, report)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    if args.save_baseline:
+        write_json(args.save_baseline, report)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
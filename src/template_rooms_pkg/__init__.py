@@ -1 +1,6 @@
 # do not remove, required for package imports
+from .utils.lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "TemplateRoomsAddon": ".addon",
+})
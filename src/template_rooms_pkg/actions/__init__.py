@@ -1,3 +1,30 @@
+from ..utils.lazy import lazy_attributes
+
+# action entrypoints share their module's name, so they are bound eagerly: a lazy
+# lookup would return the submodule once it has been imported directly
 from .example import example
+from .example_stream import example_stream
+
+__all__ = [
+    "example",
+    "example_stream",
+    "run_batch",
+    "stream_action",
+    "astream_action",
+    "cached_action",
+    "ResponseCache",
+    "response_cache",
+    "cpu_bound",
+    "ActionProcessPool",
+]
 
-__all__ = ["example"]
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "run_batch": ".batch",
+    "stream_action": ".stream",
+    "astream_action": ".stream",
+    "cached_action": ".cache",
+    "ResponseCache": ".cache",
+    "response_cache": ".cache",
+    "cpu_bound": ".workers",
+    "ActionProcessPool": ".workers",
+})
@@ -1,7 +1,14 @@
-from typing import Optional
+import copy
+import os
+from typing import Any, Callable, Optional, TypeVar
 
 from pydantic import BaseModel
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# set ROOMS_STRICT_VALIDATION=1 to validate responses built with the trusted helpers below
+_strict_validation = os.environ.get("ROOMS_STRICT_VALIDATION", "").lower() in ("1", "true", "yes")
+
 
 class TokensSchema(BaseModel):
     stepAmount: int
@@ -18,3 +25,123 @@ class ActionResponse(BaseModel):
     tokens: TokensSchema
     message: Optional[str] = None
     code: Optional[int] = None
+
+
+class ActionChunk(BaseModel):
+    """Incremental piece of a streamed action response."""
+    index: int
+    output: Optional[OutputBase] = None
+    tokens: Optional[TokensSchema] = None
+    message: Optional[str] = None
+    code: Optional[int] = None
+    final: bool = False
+
+
+def set_strict_validation(enabled: bool) -> None:
+    global _strict_validation
+    _strict_validation = enabled
+
+
+def is_strict_validation() -> bool:
+    return _strict_validation
+
+
+_REQUIRED = object()
+_new = object.__new__
+_setattr = object.__setattr__
+_constructors: dict[type, Callable[[dict[str, Any]], BaseModel]] = {}
+
+
+def _new_model(model_cls: type[ModelT], values: dict[str, Any]) -> ModelT:
+    instance = _new(model_cls)
+    _setattr(instance, "__dict__", values)
+    _setattr(instance, "__pydantic_fields_set__", set(values))
+    _setattr(instance, "__pydantic_extra__", None)
+    _setattr(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _shared_or_copied(default: Any) -> tuple[Any, Optional[Callable[[], Any]]]:
+    # like pydantic, every instance gets its own copy of a mutable default
+    try:
+        hash(default)
+    except TypeError:
+        return _REQUIRED, lambda: copy.deepcopy(default)
+    return default, None
+
+
+def _compile_constructor(model_cls: type[ModelT]) -> Callable[[dict[str, Any]], ModelT]:
+    # model_construct re-inspects every field on each call and ends up slower than
+    # pydantic-core validation, so the field layout is resolved once per class here
+    if model_cls.__private_attributes__ or model_cls.__pydantic_post_init__ or model_cls.model_config.get("extra") == "allow":
+        return lambda fields: model_cls.model_construct(**fields)
+
+    spec = []
+    for name, field in model_cls.model_fields.items():
+        if field.default_factory is not None:
+            spec.append((name, _REQUIRED, field.default_factory))
+        elif field.is_required():
+            spec.append((name, _REQUIRED, None))
+        else:
+            spec.append((name, *_shared_or_copied(field.default)))
+    field_names = frozenset(name for name, _, _ in spec)
+    required = [name for name, default, factory in spec if default is _REQUIRED and factory is None]
+
+    def construct(fields: dict[str, Any]) -> ModelT:
+        if fields.keys() == field_names:
+            return _new_model(model_cls, fields)
+        unknown = fields.keys() - field_names
+        if unknown:
+            raise TypeError(f"{model_cls.__name__} got unexpected fields: {', '.join(sorted(unknown))}")
+        missing = [name for name in required if name not in fields]
+        if missing:
+            raise TypeError(f"{model_cls.__name__} missing required fields: {', '.join(missing)}")
+
+        values = {}
+        for name, default, factory in spec:
+            if name in fields:
+                values[name] = fields[name]
+            elif factory is not None:
+                values[name] = factory()
+            elif default is not _REQUIRED:
+                values[name] = default
+        instance = _new_model(model_cls, values)
+        _setattr(instance, "__pydantic_fields_set__", set(fields))
+        return instance
+
+    return construct
+
+
+def build_model(model_cls: type[ModelT], **fields) -> ModelT:
+    """
+    Build a model from trusted values, skipping validation unless strict validation is on.
+
+    Field names are still checked, unknown or missing required ones raise TypeError.
+    """
+    if _strict_validation:
+        return model_cls(**fields)
+    constructor = _constructors.get(model_cls)
+    if constructor is None:
+        constructor = _constructors[model_cls] = _compile_constructor(model_cls)
+    return constructor(fields)
+
+
+def build_response(
+    output: OutputBase,
+    step_amount: int,
+    total_amount: int,
+    message: Optional[str] = None,
+    code: Optional[int] = None,
+) -> ActionResponse:
+    """
+    Fast path for building an ActionResponse from values produced by the action itself.
+
+    Pydantic validation is skipped unless strict validation is enabled, so the values
+    must already have the right types. Use the models directly for untrusted input.
+    """
+    if _strict_validation:
+        tokens = TokensSchema(stepAmount=step_amount, totalCurrentAmount=total_amount)
+        return ActionResponse(output=output, tokens=tokens, message=message, code=code)
+
+    tokens = _new_model(TokensSchema, {"stepAmount": step_amount, "totalCurrentAmount": total_amount})
+    return _new_model(ActionResponse, {"output": output, "tokens": tokens, "message": message, "code": code})
@@ -0,0 +1,95 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from .base import ActionResponse
+
+if TYPE_CHECKING:
+    from .workers import ActionProcessPool
+
+_list_adapters: dict[type[BaseModel], TypeAdapter] = {}
+
+
+def validate_inputs(input_model: type[BaseModel], inputs: Iterable[Any]) -> list[BaseModel]:
+    """Validate a whole batch of action inputs in a single pydantic call."""
+    adapter = _list_adapters.get(input_model)
+    if adapter is None:
+        adapter = _list_adapters[input_model] = TypeAdapter(list[input_model])
+    return adapter.validate_python(list(inputs))
+
+
+def _call_action(action: Callable[..., ActionResponse], config: Any, params: dict[str, Any]) -> ActionResponse:
+    return action(config, **params)
+
+
+def run_batch(
+    action: Callable[..., ActionResponse],
+    config: Any,
+    inputs: Iterable[Any],
+    input_model: Optional[type[BaseModel]] = None,
+    executor: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+    process_pool: Optional["ActionProcessPool"] = None,
+) -> Iterator[ActionResponse]:
+    """
+    Run an action over a batch of inputs and stream the responses in input order.
+
+    With executor="process" and a process_pool, the batch runs on that warm pool
+    against the config its workers were started with, and config is not sent.
+
+    Args:
+        action: Action entrypoint, called as action(config, **params)
+        config: Addon configuration shared by the whole batch
+        inputs: ActionInput instances or dicts
+        input_model: Model used to validate the batch, skipped if None
+        executor: None to run inline, "thread" or "process" to fan out over a pool
+        max_workers: Pool size, defaults to the executor default
+        chunksize: Items sent per process pool task
+        process_pool: Warm pool used by the "process" executor instead of a new one
+
+    Returns:
+        Iterator[ActionResponse]: One response per input, in input order
+    """
+    if input_model is not None:
+        params = [item.model_dump() for item in validate_inputs(input_model, inputs)]
+    else:
+        params = [item.model_dump() if isinstance(item, BaseModel) else dict(item) for item in inputs]
+
+    if executor not in (None, "thread", "process"):
+        raise ValueError(f"Unknown executor: {executor}")
+
+    # validation runs eagerly, execution is driven by the consumer
+    if executor == "process" and process_pool is not None:
+        return process_pool.map(action, params, chunksize=chunksize)
+    return _stream(action, config, params, executor, max_workers, chunksize)
+
+
+def _stream(
+    action: Callable[..., ActionResponse],
+    config: Any,
+    params: list[dict[str, Any]],
+    executor: Optional[str],
+    max_workers: Optional[int],
+    chunksize: int,
+) -> Iterator[ActionResponse]:
+    if executor is None:
+        for item in params:
+            yield _call_action(action, config, item)
+        return
+
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    with pool:
+        yield from pool.map(
+            _call_action,
+            [action] * len(params),
+            [config] * len(params),
+            params,
+            chunksize=chunksize,
+        )
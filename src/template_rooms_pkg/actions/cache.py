@@ -0,0 +1,175 @@
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from template_rooms_pkg.configuration.cache import config_fingerprint
+
+from .base import ActionResponse
+
+_MISSING = object()
+
+
+def _copy(response: Any) -> Any:
+    if isinstance(response, BaseModel):
+        return response.model_copy(deep=True)
+    return copy.deepcopy(response)
+
+
+class ResponseCache:
+    """
+    Cache of action responses, in an in-memory LRU with TTL and an optional disk tier.
+
+    The disk tier is a storage.DiskCache, set with set_disk. Memory misses that hit
+    the disk are promoted back into memory. The cache keeps its own copy of each
+    response and hands out deep copies, so callers may mutate what they get.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0, disk=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk = disk
+        self._entries: OrderedDict[str, tuple[Optional[float], ActionResponse]] = OrderedDict()
+        self._actions: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def set_disk(self, disk) -> None:
+        self.disk = disk
+
+    def make_key(self, action_name: str, params: dict[str, Any], config: Any) -> str:
+        if isinstance(config, BaseModel):
+            config = config.model_dump(mode="json")
+        return config_fingerprint({"action": action_name, "input": params, "config": config_fingerprint(config)})
+
+    def _count(self, action_name: str, name: str) -> None:
+        counts = self._actions.get(action_name)
+        if counts is None:
+            counts = self._actions[action_name] = {"hits": 0, "misses": 0, "disk_hits": 0}
+        counts[name] += 1
+
+    def get(self, action_name: str, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._count(action_name, "hits")
+                    return _copy(response)
+                del self._entries[key]
+
+        if self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                expires_at, response = entry
+                # promoted for the time the entry has left, not a fresh ttl
+                self._store(key, response, None if expires_at is None else expires_at - time.time())
+                with self._lock:
+                    self._count(action_name, "hits")
+                    self._count(action_name, "disk_hits")
+                return _copy(response)
+
+        with self._lock:
+            self._count(action_name, "misses")
+        return _MISSING
+
+    def _store(self, key: str, response: ActionResponse, ttl: Optional[float]) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, response: ActionResponse, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._store(key, _copy(response), ttl)
+        if self.disk is not None:
+            self.disk.put(key, response, ttl)
+
+    def stats(self, action_name: Optional[str] = None) -> dict[str, Any]:
+        with self._lock:
+            if action_name is not None:
+                counts = dict(self._actions.get(action_name, {"hits": 0, "misses": 0, "disk_hits": 0}))
+            else:
+                counts = {"hits": 0, "misses": 0, "disk_hits": 0}
+                for action_counts in self._actions.values():
+                    for name, value in action_counts.items():
+                        counts[name] += value
+            total = counts["hits"] + counts["misses"]
+            return {
+                **counts,
+                "hit_rate": counts["hits"] / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._actions.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def cached_action(input_model: Optional[type[BaseModel]] = None, ttl: Optional[float] = None, cache: Optional[ResponseCache] = None):
+    """
+    Opt an action into the response cache.
+
+    Only for deterministic actions, whose response depends on nothing but their
+    inputs and config. The key is a hash of the validated input_model dump (or of
+    the raw parameters without input_model) and of the config fingerprint, so
+    repeat calls return the cached response without running the action.
+
+    Args:
+        input_model: The action's ActionInput
+        ttl: Seconds a response stays cached, defaults to the cache ttl
+        cache: Cache to use, defaults to response_cache
+
+    Returns:
+        Callable: Decorator for the action entrypoint. The wrapped entrypoint also
+        has cache_lookup(config, **params), returning (response, hit)
+    """
+    def decorator(action: Callable[..., ActionResponse]) -> Callable[..., ActionResponse]:
+        action_name = f"{action.__module__}.{action.__qualname__}"
+        signature = inspect.signature(action)
+        target = cache if cache is not None else response_cache
+
+        def cache_lookup(config: Any, *args, **params) -> tuple[ActionResponse, bool]:
+            if args:
+                params = signature.bind_partial(config, *args, **params).arguments
+                params.pop(next(iter(signature.parameters)))
+            if input_model is not None:
+                key_params = input_model.model_validate(params).model_dump(mode="json")
+            else:
+                key_params = params
+            key = target.make_key(action_name, key_params, config)
+
+            response = target.get(action_name, key)
+            if response is not _MISSING:
+                return response, True
+            response = action(config, **params)
+            target.put(key, response, ttl)
+            return response, False
+
+        @functools.wraps(action)
+        def wrapper(config: Any, *args, **params) -> ActionResponse:
+            return cache_lookup(config, *args, **params)[0]
+
+        wrapper.cache_lookup = cache_lookup
+        wrapper.cache_name = action_name
+        wrapper.cache_stats = lambda: target.stats(action_name)
+        return wrapper
+
+    return decorator
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 from template_rooms_pkg.configuration import CustomAddonConfig
 from template_rooms_pkg.services.credentials import CredentialsRegistry
 
-from .base import ActionResponse, OutputBase, TokensSchema
+from .base import ActionResponse, OutputBase, build_model, build_response
 
 
 class ActionInput(BaseModel):
@@ -22,14 +22,14 @@ def example(config: CustomAddonConfig, param1: str, param2: str) -> ActionRespon
     # if not isinstance(inputs, ActionInput):
     #     raise ValueError("Invalid input type. Expected ActionInput.")
     logger.debug("Template rooms package - Example action executed successfully!")
-    logger.debug(f"Input received: {param1}, {param2}")
-    logger.debug(f"Config: {config}")
-    credentials = CredentialsRegistry()
+    logger.debug("Input received: {}, {}", param1, param2)
+    logger.debug("Config: {}", config)
+    credentials = CredentialsRegistry().scoped(getattr(config, "id", None))
     if credentials.has("db_user"):
-        logger.debug(f"Database user available: {credentials.get('db_user')}")
+        logger.debug("Database user available: {}", credentials.get("db_user"))
 
-    tokens = TokensSchema(stepAmount=2000, totalCurrentAmount=16236)
+    # values below are produced here, so the trusted helpers can skip validation
     message = "Action executed successfully"
     code = 200
-    output = ActionOutput(data={"processed": param1 + "- processed -"})
-    return ActionResponse(output=output, tokens=tokens, message=message, code=code)
+    output = build_model(ActionOutput, data={"processed": param1 + "- processed -"})
+    return build_response(output, step_amount=2000, total_amount=16236, message=message, code=code)
@@ -0,0 +1,25 @@
+from collections.abc import Iterator
+from typing import Union
+
+from loguru import logger
+from pydantic import BaseModel
+
+from template_rooms_pkg.configuration import CustomAddonConfig
+
+from .base import TokensSchema, build_model
+from .example import ActionOutput
+
+
+class ActionInput(BaseModel):
+    param1: str
+    param2: str
+
+# streaming actions are generators: yield output chunks as they are ready and
+# TokensSchema updates whenever token usage changes.
+def example_stream(config: CustomAddonConfig, param1: str, param2: str) -> Iterator[Union[ActionOutput, TokensSchema]]:
+    logger.debug("Template rooms package - Example stream action started")
+    total = 16236
+    for part in (param1, "- processed -", param2):
+        total += 500
+        yield build_model(ActionOutput, data={"chunk": part})
+        yield build_model(TokensSchema, stepAmount=500, totalCurrentAmount=total)
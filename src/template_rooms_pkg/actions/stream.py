@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Callable, Optional
+
+from .base import ActionChunk, ActionResponse, OutputBase, TokensSchema
+
+_END = object()
+
+
+class _ChunkBuilder:
+    """Turns the items yielded by a streaming action into ActionChunks."""
+
+    def __init__(self):
+        self.index = 0
+        self.tokens: Optional[TokensSchema] = None
+        self.finished = False
+
+    def build(self, item: Any) -> ActionChunk:
+        if isinstance(item, ActionChunk):
+            chunk = item.model_copy(update={"index": self.index})
+        elif isinstance(item, ActionResponse):
+            chunk = ActionChunk(index=self.index, output=item.output, tokens=item.tokens,
+                                message=item.message, code=item.code, final=True)
+        elif isinstance(item, TokensSchema):
+            chunk = ActionChunk(index=self.index, tokens=item)
+        elif isinstance(item, OutputBase):
+            chunk = ActionChunk(index=self.index, output=item, tokens=self.tokens)
+        else:
+            raise TypeError(f"Streaming actions must yield OutputBase or TokensSchema, got {type(item).__name__}")
+
+        if chunk.tokens is not None:
+            self.tokens = chunk.tokens
+        self.finished = chunk.final
+        self.index += 1
+        return chunk
+
+    def final(self) -> Optional[ActionChunk]:
+        if self.finished:
+            return None
+        return ActionChunk(index=self.index, tokens=self.tokens, code=200, final=True)
+
+
+def _start(action: Callable, config: Any, params: dict[str, Any]) -> Any:
+    result = action(config, **params)
+    if isinstance(result, ActionResponse):
+        # plain actions stream as a single final chunk
+        return iter([result])
+    return result
+
+
+def stream_action(action: Callable, config: Any, **params) -> Iterator[ActionChunk]:
+    """
+    Run a streaming action and yield its ActionChunks as they are produced.
+
+    The action is a generator yielding OutputBase chunks and TokensSchema updates.
+    Every output chunk carries the latest token counts, and the stream always ends
+    with a chunk marked final. Actions returning a plain ActionResponse stream as
+    a single final chunk.
+    """
+    source = _start(action, config, params)
+    if inspect.isasyncgen(source):
+        raise TypeError(f"{action.__name__} is asynchronous, use astream_action")
+
+    builder = _ChunkBuilder()
+    for item in source:
+        yield builder.build(item)
+    final = builder.final()
+    if final is not None:
+        yield final
+
+
+async def astream_action(action: Callable, config: Any, **params) -> AsyncIterator[ActionChunk]:
+    """
+    Async variant of stream_action.
+
+    Async generator actions are iterated natively, sync generators are advanced in
+    a worker thread so a slow chunk never blocks the event loop.
+    """
+    if inspect.isasyncgenfunction(action):
+        source = action(config, **params)
+    elif inspect.iscoroutinefunction(action):
+        source = iter([await action(config, **params)])
+    else:
+        source = await asyncio.to_thread(_start, action, config, params)
+
+    builder = _ChunkBuilder()
+    if inspect.isasyncgen(source):
+        async for item in source:
+            yield builder.build(item)
+    else:
+        while True:
+            item = await asyncio.to_thread(next, source, _END)
+            if item is _END:
+                break
+            yield builder.build(item)
+
+    final = builder.final()
+    if final is not None:
+        yield final
@@ -0,0 +1,114 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from .base import ActionResponse
+
+# set in each worker process by _init_worker
+_worker_config: Any = None
+
+
+def cpu_bound(action: Callable[..., ActionResponse]) -> Callable[..., ActionResponse]:
+    """
+    Mark an action as CPU-bound.
+
+    Addons dispatch marked actions to their process pool instead of running them
+    on the caller's thread. The action must stay importable by its module-level
+    name, so it can be sent to the workers.
+    """
+    action.cpu_bound = True
+    return action
+
+
+def is_cpu_bound(action: Callable[..., Any]) -> bool:
+    return getattr(action, "cpu_bound", False) is True
+
+
+def _init_worker(config: Any, credentials: dict[str, str], credentials_scope: Optional[str]) -> None:
+    global _worker_config
+    from ..services.credentials import CredentialsRegistry
+
+    _worker_config = config
+    CredentialsRegistry().scoped(credentials_scope).store_multiple(credentials)
+
+
+def _ping() -> bool:
+    return True
+
+
+def _run_action(action: Callable[..., ActionResponse], params: dict[str, Any]) -> ActionResponse:
+    return action(_worker_config, **params)
+
+
+def _run_chunk(action: Callable[..., ActionResponse], chunk: list[dict[str, Any]]) -> list[ActionResponse]:
+    return [action(_worker_config, **params) for params in chunk]
+
+
+class ActionProcessPool:
+    """
+    Warm process pool running actions against a fixed config and credentials.
+
+    The config and credentials are pickled once per worker, at worker start, and
+    installed as the worker's config and the credentials scope of its id. Calls only
+    send the action reference and its parameters; responses come back pickled.
+    A pool is tied to the config it was started with, start a new one when the
+    config or credentials change.
+    """
+
+    def __init__(
+        self,
+        config: Any,
+        credentials: Optional[dict[str, str]] = None,
+        credentials_scope: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        if credentials_scope is None:
+            # actions read CredentialsRegistry().scoped(config.id)
+            credentials_scope = getattr(config, "id", None)
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(config, dict(credentials or {}), credentials_scope),
+        )
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def warm(self) -> "ActionProcessPool":
+        """Start the workers now rather than on the first calls."""
+        wait([self._executor.submit(_ping) for _ in range(self.max_workers)])
+        return self
+
+    def submit(self, action: Callable[..., ActionResponse], params: dict[str, Any]) -> "Future[ActionResponse]":
+        return self._executor.submit(_run_action, action, params)
+
+    def run(self, action: Callable[..., ActionResponse], **params) -> ActionResponse:
+        return self.submit(action, params).result()
+
+    def map(
+        self,
+        action: Callable[..., ActionResponse],
+        params: Iterable[dict[str, Any]],
+        chunksize: int = 1,
+    ) -> Iterator[ActionResponse]:
+        """Run the action for each params dict, chunksize items per task, results in input order."""
+        params = list(params)
+        chunks = [params[start:start + chunksize] for start in range(0, len(params), max(1, chunksize))]
+        futures = [self._executor.submit(_run_chunk, action, chunk) for chunk in chunks]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        logger.debug("Shutting down action process pool")
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> "ActionProcessPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
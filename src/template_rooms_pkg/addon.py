@@ -1,9 +1,12 @@
 import importlib
+import time
+from functools import cached_property
 
 from loguru import logger
 
-from .actions.example import example
-from .services.credentials import CredentialsRegistry
+from .services.credentials import CredentialResolver, CredentialShard, CredentialsRegistry
+from .services.health import HealthChecker
+from .services.metrics import Metrics, MetricsReporter
 from .tools.base import ToolRegistry
 
 
@@ -20,42 +23,80 @@ class TemplateRoomsAddon:
         self.modules = ["actions", "configuration", "memory", "services", "storage", "tools", "utils"]
         self.config = {}
         self.credentials = CredentialsRegistry()
+        self.credential_resolver = None
+        self._owns_resolver = False
+        # keys this instance loaded into the unscoped registry, moved to its shard once scoped
+        self._unscoped_keys: set[str] = set()
         self.tool_registry = ToolRegistry()
         self.observer_callback = None
         self.addon_id = None
+        self.pool = None
+        self.process_pool = None
+        self.metrics = Metrics()
+        self.metrics_reporter = None
+        self.tool_registry.metrics = self.metrics
+        self.health = HealthChecker(__package__, self.modules)
+        self.health.add_check("config", self._checkConfig)
+        self.health.add_check("credentials", self._checkCredentials)
 
-    @property
+    @cached_property
     def logger(self):
-        """Custom logger that prefixes all messages with addon type"""
-        class PrefixedLogger:
-            def __init__(self, addon_type):
-                self.addon_type = addon_type
-                self._logger = logger
-
-            def debug(self, message):
-                self._logger.debug(f"[TYPE: {self.addon_type.upper()}] {message}")
-
-            def info(self, message):
-                self._logger.info(f"[TYPE: {self.addon_type.upper()}] {message}")
+        """
+        Logger bound to this addon, created once per instance.
 
-            def warning(self, message):
-                self._logger.warning(f"[TYPE: {self.addon_type.upper()}] {message}")
+        Messages are prefixed with the addon type and the type is bound as the
+        addon_type extra. Pass values as format arguments (or use opt(lazy=True))
+        so they are only formatted when the level is enabled.
+        """
+        prefix = f"[TYPE: {self.type.upper()}] "
 
-            def error(self, message):
-                self._logger.error(f"[TYPE: {self.addon_type.upper()}] {message}")
+        def add_prefix(record):
+            record["message"] = prefix + record["message"]
 
-        return PrefixedLogger(self.type)
+        return logger.bind(addon_type=self.type).patch(add_prefix)
 
     def loadTools(self, tool_functions, tool_descriptions=None, tool_max_retries=None):
-        self.logger.debug(f"Tool functions provided: {list(tool_functions.keys())}")
-        self.logger.debug(f"Tool descriptions provided: {tool_descriptions}")
-        self.logger.debug(f"Tool max retries provided: {tool_max_retries}")
+        self.logger.opt(lazy=True).debug("Tool functions provided: {}", lambda: list(tool_functions.keys()))
+        self.logger.debug("Tool descriptions provided: {}", tool_descriptions)
+        self.logger.debug("Tool max retries provided: {}", tool_max_retries)
         self.tool_registry.register_tools(tool_functions, tool_descriptions, tool_max_retries)
-        registered_tools = self.tool_registry.get_tools_for_action()
-        self.logger.info(f"Successfully registered {len(registered_tools)} tools: {list(registered_tools.keys())}")
+        registered_tools = self.tool_registry.get_tool_names()
+        self.logger.info("Successfully registered {} tools: {}", len(registered_tools), registered_tools)
+
+    def syncTools(self, tool_functions, tool_descriptions=None, tool_max_retries=None):
+        """
+        Replace the registered tools with the given set, re-registering only the tools that changed.
+
+        Args:
+            tool_functions (dict): Tool functions by name
+            tool_descriptions (dict): Descriptions by tool name
+            tool_max_retries (dict): Max retries by tool name
 
-    def getTools(self):
-        return self.tool_registry.get_tools_for_action()
+        Returns:
+            dict: Names of the "added", "removed" and "changed" tools
+        """
+        changes = self.tool_registry.sync(tool_functions, tool_descriptions, tool_max_retries)
+        self.logger.info("Synced tools (generation {}): {}", self.tool_registry.generation, changes)
+        return changes
+
+    def getTools(self, tool_names=None, tool_format=None):
+        """
+        Registered tool definitions by name, or a provider payload when tool_format is given.
+
+        Args:
+            tool_names (list): Tools to include, all tools if None
+            tool_format (str): "generic", "openai" or "anthropic", see ToolRegistry.format_tools
+
+        Returns:
+            dict | list: Definitions by tool name, or the list of formatted tools
+        """
+        if tool_format is not None:
+            return self.tool_registry.format_tools(tool_format, tool_names)
+        return self.tool_registry.get_tools_for_action(tool_names)
+
+    def getToolsJson(self, tool_format="generic") -> bytes:
+        """All tools in tool_format as pre-serialized JSON, reused until the tools change."""
+        return self.tool_registry.format_tools_json(tool_format)
 
     def clearTools(self):
         self.tool_registry.clear()
@@ -63,15 +104,182 @@ class TemplateRoomsAddon:
     def setObserverCallback(self, callback, addon_id: str):
         self.observer_callback = callback
         self.addon_id = addon_id
+        self._scopeCredentials()
+
+    def _scopeCredentials(self):
+        # credentials are namespaced by the config id, the same key actions read them
+        # with: CredentialsRegistry().scoped(config.id). Instances loading the same
+        # config share the shard, it is released when the last of them moves or closes
+        config_id = getattr(self.config, "id", None)
+        registry = CredentialsRegistry()
+        if registry.scoped(config_id) is self.credentials:
+            return
+        previous = self.credentials
+        scoped = registry.acquire(config_id)
+        if isinstance(previous, CredentialShard):
+            scoped.store_multiple({key: previous.get(key) for key in previous.keys()})
+            registry.release(previous.addon_id)
+        else:
+            # values loaded before the config, into the unscoped registry, move along too
+            scoped.store_multiple({key: previous.get(key) for key in self._unscoped_keys if previous.has(key)})
+            self._unscoped_keys.clear()
+        self.credentials = scoped
+        self.closeProcessPool()
+
+    def close(self) -> None:
+        """Release the addon's pools, metrics reporting and credentials shard."""
+        self.stopMetricsReporting(flush=False)
+        self.closeProcessPool()
+        self.closeConnectionPool()
+        self.health.shutdown()
+        self._setResolver(None)
+        if isinstance(self.credentials, CredentialShard):
+            CredentialsRegistry().release(self.credentials.addon_id)
+            self.credentials = CredentialsRegistry()
 
     def example(self, param1: str, param2: str) -> dict:
-        return example(self.config, param1=param1, param2=param2)
+        from .actions.example import example
+        return self._runAction(example, param1=param1, param2=param2)
+
+    def _runAction(self, action, **params):
+        # actions opted into the response cache report their hit rate to the observer
+        cache_lookup = getattr(action, "cache_lookup", None)
+        hit = False
+        start = time.perf_counter()
+        try:
+            if getattr(action, "cpu_bound", False):
+                # runs in a worker, with the worker's own response cache
+                cache_lookup = None
+                response = self.startProcessPool(restart=False).run(action, **params)
+            elif cache_lookup is None:
+                response = action(self.config, **params)
+            else:
+                response, hit = cache_lookup(self.config, **params)
+        except Exception:
+            self.metrics.record(action.__name__, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        # a cache hit spends no tokens
+        tokens = 0 if hit else _step_tokens(response)
+        self.metrics.record(action.__name__, (time.perf_counter() - start) * 1000, tokens=tokens)
+        if cache_lookup is not None:
+            self._notifyObserver("action_cache", {"action": action.cache_name, "hit": hit, **action.cache_stats()})
+        return response
+
+    def example_stream(self, param1: str, param2: str):
+        return self.streamAction("example_stream", param1=param1, param2=param2)
+
+    def _notifyObserver(self, event: str, data) -> None:
+        if self.observer_callback is None:
+            return
+        try:
+            self.observer_callback({"addon_id": self.addon_id, "event": event, "data": data})
+        except Exception as e:
+            self.logger.warning("Observer callback failed for {}: {}", event, e)
+
+    def streamAction(self, action_name: str, **params):
+        """
+        Run an action in streaming mode.
+
+        Each ActionChunk is forwarded to the observer callback as it is produced.
+
+        Args:
+            action_name (str): Name of the action module and entrypoint
+            **params: Action parameters
+
+        Returns:
+            Iterator[ActionChunk]: Chunks in production order, the last one marked final
+        """
+        from .actions.stream import stream_action
+        action, _ = self._resolveAction(action_name)
+        timer = _StreamTimer(self.metrics, action_name)
+        with timer:
+            for chunk in stream_action(action, self.config, **params):
+                timer.observe(chunk)
+                self._notifyObserver("action_chunk", chunk)
+                yield chunk
+
+    async def astreamAction(self, action_name: str, **params):
+        """
+        Async iterator variant of streamAction.
+
+        Args:
+            action_name (str): Name of the action module and entrypoint
+            **params: Action parameters
+
+        Returns:
+            AsyncIterator[ActionChunk]: Chunks in production order, the last one marked final
+        """
+        from .actions.stream import astream_action
+        action, _ = self._resolveAction(action_name)
+        timer = _StreamTimer(self.metrics, action_name)
+        with timer:
+            async for chunk in astream_action(action, self.config, **params):
+                timer.observe(chunk)
+                self._notifyObserver("action_chunk", chunk)
+                yield chunk
+
+    def _resolveAction(self, action_name: str):
+        # entrypoint has the same name as the action file, see actions/example.py
+        module = importlib.import_module(f".actions.{action_name}", __package__)
+        return getattr(module, action_name), getattr(module, "ActionInput", None)
+
+    def runBatch(self, action_name: str, inputs, executor: str = None, max_workers: int = None, chunksize: int = 1):
+        """
+        Run an action over a batch of inputs.
+
+        The whole batch is validated against the action's ActionInput in one pass,
+        and the action is resolved and given the addon config once for all items.
+        With executor="process", actions run on the addon's warm process pool (see
+        startProcessPool), whose workers received the config and credentials once
+        at start. Metrics record, per item, the time the consumer waited for its response.
+
+        Args:
+            action_name (str): Name of the action module and entrypoint
+            inputs (list): ActionInput instances or dicts
+            executor (str): None to run inline, "thread" or "process" to fan out
+            max_workers (int): Pool size when an executor is used, for "process" only
+                when the pool is started by this call
+            chunksize (int): Items sent per process pool task
+
+        Returns:
+            Iterator[ActionResponse]: Responses streamed in input order
+        """
+        from .actions.batch import run_batch
+        action, input_model = self._resolveAction(action_name)
+        inputs = list(inputs)
+        self.logger.debug("Running batch of {} items through {} (executor: {})", len(inputs), action_name, executor)
+        responses = run_batch(
+            action,
+            self.config,
+            inputs,
+            input_model=input_model,
+            executor=executor,
+            max_workers=max_workers,
+            chunksize=chunksize,
+            process_pool=self.startProcessPool(max_workers, restart=False) if executor == "process" else None,
+        )
+        return self._measureBatch(action_name, responses)
+
+    def _measureBatch(self, action_name: str, responses):
+        start = time.perf_counter()
+        while True:
+            try:
+                response = next(responses)
+            except StopIteration:
+                return
+            except Exception:
+                self.metrics.record(action_name, (time.perf_counter() - start) * 1000, error=True)
+                raise
+            self.metrics.record(action_name, (time.perf_counter() - start) * 1000, tokens=_step_tokens(response))
+            yield response
+            start = time.perf_counter()
 
     def test(self) -> bool:
         """
         Test function for template rooms package.
         Tests each module and reports available components.
-        Test connections with credentials if required.
+        See healthCheck for a structured readiness report that also
+        checks configuration, credentials and connectivity.
 
         Returns:
             bool: True if test passes, False otherwise
@@ -86,10 +294,10 @@ class TemplateRoomsAddon:
                 component_count = len(components)
                 total_components += component_count
                 for component_name in components:
-                    self.logger.info(f"Processing component: {component_name}")
+                    self.logger.info("Processing component: {}", component_name)
                     if hasattr(module, component_name):
                         component = getattr(module, component_name)
-                        self.logger.info(f"Component {component_name} type: {type(component)}")
+                        self.logger.info("Component {} type: {}", component_name, type(component))
                         if callable(component):
                             try:
                                 skip_instantiation = False
@@ -98,53 +306,312 @@ class TemplateRoomsAddon:
                                     if hasattr(component, '__bases__') and any(
                                         issubclass(base, BaseModel) for base in component.__bases__ if isinstance(base, type)
                                     ):
-                                        self.logger.info(f"Component {component_name} is a Pydantic model, skipping instantiation")
+                                        self.logger.info("Component {} is a Pydantic model, skipping instantiation", component_name)
                                         skip_instantiation = True
                                 except (ImportError, TypeError):
                                     pass
                                 # skip models require parameters
                                 if component_name in ['ActionInput', 'ActionOutput', 'ActionResponse', 'OutputBase', 'TokensSchema']:
-                                    self.logger.info(f"Component {component_name} requires parameters, skipping instantiation")
+                                    self.logger.info("Component {} requires parameters, skipping instantiation", component_name)
                                     skip_instantiation = True
 
                                 if not skip_instantiation:
                                     # result = component()
-                                    self.logger.info(f"Component {component_name}() would be executed successfully")
+                                    self.logger.info("Component {}() would be executed successfully", component_name)
                                 else:
-                                    self.logger.info(f"Component {component_name} exists and is valid (skipped instantiation)")
+                                    self.logger.info("Component {} exists and is valid (skipped instantiation)", component_name)
                             except Exception as e:
-                                self.logger.warning(f"Component {component_name}() failed: {e}")
-                                self.logger.error(f"Exception details for {component_name}: {str(e)}")
+                                self.logger.warning("Component {}() failed: {}", component_name, e)
+                                self.logger.error("Exception details for {}: {}", component_name, e)
                                 raise e
-                self.logger.info(f"{component_count} {module_name} loaded correctly, available imports: {', '.join(components)}")
+                self.logger.info("{} {} loaded correctly, available imports: {}", component_count, module_name, ", ".join(components))
             except ImportError as e:
-                self.logger.error(f"Failed to import {module_name}: {e}")
+                self.logger.error("Failed to import {}: {}", module_name, e)
                 return False
             except Exception as e:
-                self.logger.error(f"Error testing {module_name}: {e}")
+                self.logger.error("Error testing {}: {}", module_name, e)
                 return False
         self.logger.info("Template rooms package test completed successfully!")
-        self.logger.info(f"Total components loaded: {total_components} across {len(self.modules)} modules")
+        self.logger.info("Total components loaded: {} across {} modules", total_components, len(self.modules))
         return True
 
-    def loadAddonConfig(self, addon_config: dict):
+    def _checkConfig(self):
+        if not self.config:
+            raise ValueError("addon configuration not loaded")
+        return {"id": getattr(self.config, "id", None)}
+
+    def _checkCredentials(self):
+        secrets = getattr(self.config, "secrets", None) or {}
+        missing = [key for key in secrets if not self.credentials.has(key)]
+        if missing:
+            raise ValueError(f"Missing credentials: {missing}")
+        return {"count": len(secrets)}
+
+    def registerHealthCheck(self, name: str, check) -> None:
+        """
+        Register a dependency check run by healthCheck.
+
+        Args:
+            name (str): Check name in the report
+            check (callable): Called without arguments, fails by raising or returning False
+        """
+        self.health.add_check(name, check)
+
+    def healthCheck(self, use_cache: bool = True, max_age: float = None) -> dict:
+        """
+        Structured readiness probe.
+
+        Module and dependency checks (configuration, credentials and any check
+        registered with registerHealthCheck) run concurrently with a timeout.
+        Modules are only imported until they have been verified once, and the
+        report is cached for max_age seconds (the checker's cache_ttl by default).
+
+        Args:
+            use_cache (bool): Return the cached report when it is recent enough
+            max_age (float): Maximum age in seconds of a cached report
+
+        Returns:
+            dict: Report with status, timestamp, timings and one entry per check
+        """
+        report = self.health.run(use_cache=use_cache, max_age=max_age)
+        return {"addon_id": self.addon_id, "type": self.type, **report}
+
+    def openConnectionPool(self, connect, **options):
+        """
+        Create this instance's database connection pool from the addon configuration.
+
+        Uses host, port and database from the config and the db_user and db_password
+        credentials, see configuration/examples/database_config.py. The pool is
+        registered as the "database" health check.
+
+        Args:
+            connect (callable): Driver connect function, e.g. storage.sqlite_connect
+            **options: ConnectionPool options (min_size, max_size, timeout, max_idle, ...)
+
+        Returns:
+            ConnectionPool: The opened pool
+        """
+        from .storage.pool import ConnectionPool
+        self.closeConnectionPool()
+        self.pool = ConnectionPool.from_config(self.config, self.credentials, connect, **options).open()
+        self.health.add_check("database", self.pool.health_check)
+        self.logger.info("Opened connection pool (max size: {})", self.pool.max_size)
+        return self.pool
+
+    def connection(self):
+        """
+        Borrow a pooled database connection, as a context manager.
+
+        Returns:
+            ContextManager: Yields a DB-API connection, returned to the pool on exit
+        """
+        if self.pool is None:
+            raise RuntimeError("Connection pool not opened, call openConnectionPool first")
+        return self.pool.connection()
+
+    def closeConnectionPool(self):
+        if self.pool is None:
+            return
+        self.health.remove_check("database")
+        self.pool.close()
+        self.pool = None
+
+    def apiRequest(self, path: str = "", method: str = None, **kwargs):
+        """
+        Call the configured API endpoint through the shared keep-alive HTTP client.
+
+        Uses endpoint, method and timeout from the config, see
+        configuration/examples/api_config.py, and sends the api_key credential as a
+        bearer token.
+
+        Args:
+            path (str): Path resolved against the endpoint
+            method (str): Overrides the configured method
+            **kwargs: HttpClient.request arguments (body, json, headers, timeout)
+
+        Returns:
+            HttpResponse: The endpoint's response
+        """
+        from .services.http import api_request
+        return api_request(self.config, self.credentials, path, method, **kwargs)
+
+    def throttledCall(self, func, *args, coalesce_key=None, **kwargs):
+        """
+        Run an LLM backend call within the provider/model rate limits.
+
+        Uses provider, model and max_tokens from the config, see
+        configuration/examples/llm_config.py. max_tokens is reserved up front and
+        settled with the TokensSchema usage of the result. Identical calls in
+        flight at the same time are sent to the backend once.
+
+        Args:
+            func (callable): Function performing the backend call
+            *args: Positional arguments for func
+            coalesce_key (hashable): Key identifying identical calls, defaults to the pickled arguments
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: The result of func
+        """
+        from .services.ratelimit import llm_rate_limiter
+        return llm_rate_limiter.call(
+            self.config.provider,
+            self.config.model,
+            func,
+            *args,
+            estimated_tokens=getattr(self.config, "max_tokens", 0),
+            coalesce_key=coalesce_key,
+            **kwargs,
+        )
+
+    def startProcessPool(self, max_workers: int = None, restart: bool = True):
+        """
+        Start the process pool that runs CPU-bound actions (see actions.cpu_bound).
+
+        Workers are started up front and receive the current config and credentials
+        once, at worker start. Loading a new config or credentials closes the pool,
+        the next CPU-bound call starts a fresh one.
+
+        Args:
+            max_workers (int): Number of worker processes, defaults to the CPU count
+            restart (bool): Replace a running pool, otherwise return it
+
+        Returns:
+            ActionProcessPool: The running pool
+        """
+        if self.process_pool is not None:
+            if not restart:
+                return self.process_pool
+            self.closeProcessPool()
+        from .actions.workers import ActionProcessPool
+        credentials = {key: self.credentials.get(key) for key in self.credentials.keys()}
+        # workers store them under the config id, where actions look them up
+        scope = getattr(self.config, "id", None)
+        self.process_pool = ActionProcessPool(self.config, credentials, scope, max_workers).warm()
+        self.logger.info("Started action process pool with {} workers", self.process_pool.max_workers)
+        return self.process_pool
+
+    def closeProcessPool(self) -> None:
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+
+    def getMetrics(self) -> dict:
+        """
+        Aggregated per-action metrics: calls, errors, retries, tokens and latency.
+
+        Actions run through this addon, its streams and batches, and tools invoked
+        through the tool registry (named "tool.<name>") are recorded.
+
+        Returns:
+            dict: Metrics per action name
+        """
+        return self.metrics.snapshot()
+
+    def exportMetrics(self, prefix: str = "rooms_action") -> str:
+        """
+        Metrics in the Prometheus text format, labelled with the addon id and type.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text, e.g. to write for a node_exporter textfile collector
+        """
+        return self.metrics.to_prometheus(prefix, {"addon_id": self.addon_id or "", "addon_type": self.type})
+
+    def startMetricsReporting(self, interval: float = 10.0) -> None:
+        """
+        Push a "metrics" event with the getMetrics snapshot to the observer every interval seconds.
+
+        Args:
+            interval (float): Seconds between snapshots
+        """
+        self.stopMetricsReporting(flush=False)
+        self.metrics_reporter = MetricsReporter(
+            self.metrics, lambda snapshot: self._notifyObserver("metrics", snapshot), interval
+        ).start()
+
+    def stopMetricsReporting(self, flush: bool = True) -> None:
+        if self.metrics_reporter is not None:
+            self.metrics_reporter.stop(flush=flush)
+            self.metrics_reporter = None
+
+    def loadAddonConfig(self, addon_config: dict, readonly: bool = False):
         """
         Load addon configuration.
 
+        Validated configurations are cached, so reloading an identical config
+        skips validation.
+
         Args:
             addon_config (dict): Addon configuration dictionary
+            readonly (bool): Share a frozen config instance instead of a private copy
 
         Returns:
             bool: True if configuration is loaded successfully, False otherwise
         """
         try:
-            from template_rooms_pkg.configuration import CustomAddonConfig
-            self.config = CustomAddonConfig(**addon_config)
-            self.logger.info(f"Addon configuration loaded successfully: {self.config}")
+            from template_rooms_pkg.configuration import CustomAddonConfig, config_cache
+            self.config = config_cache.load(CustomAddonConfig, addon_config, readonly=readonly)
+            self._scopeCredentials()
+            self.closeProcessPool()
+            self.logger.info("Addon configuration loaded successfully: {}", self.config)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to load addon configuration: {e}")
+            self.logger.error("Failed to load addon configuration: {}", e)
+            return False
+
+    def resolveCredentials(self, resolver: CredentialResolver = None) -> bool:
+        """
+        Resolve the secrets declared in the addon configuration and load them.
+
+        The addon keeps the resolver, so later calls hit its cache, and secrets it
+        refreshes in the background are written back to the addon's credentials.
+
+        Args:
+            resolver (CredentialResolver): Resolver to use, defaults to the addon's
+                resolver, or a new one over environment variables
+
+        Returns:
+            bool: True if every secret was resolved and loaded, False otherwise
+        """
+        if resolver is None and self.credential_resolver is None:
+            self._setResolver(CredentialResolver(), owned=True)
+        elif resolver is not None and resolver is not self.credential_resolver:
+            self._setResolver(resolver)
+        resolver = self.credential_resolver
+        secrets = getattr(self.config, "secrets", None) or {}
+        try:
+            values = resolver.resolve_secrets(secrets)
+            missing = [key for key, value in values.items() if value is None]
+            if missing:
+                raise ValueError(f"Unresolved secrets: {missing}")
+        except Exception as e:
+            self.logger.error("Failed to resolve credentials: {}", e)
             return False
+        return self.loadCredentials(**values)
+
+    def _setResolver(self, resolver: CredentialResolver = None, owned: bool = False) -> None:
+        # the addon listens for refreshed secrets, and stops the resolvers it created
+        previous = self.credential_resolver
+        if previous is not None:
+            previous.remove_listener(self._onSecretRefreshed)
+            if self._owns_resolver:
+                previous.shutdown(wait=False)
+        if resolver is not None:
+            resolver.add_listener(self._onSecretRefreshed)
+        self.credential_resolver = resolver
+        self._owns_resolver = owned
+
+    def _onSecretRefreshed(self, name: str, value: str) -> None:
+        secrets = getattr(self.config, "secrets", None) or {}
+        keys = [key for key, secret_name in secrets.items() if secret_name == name]
+        if keys:
+            self.credentials.store_multiple(dict.fromkeys(keys, value))
+            # workers hold a copy of the credentials, the next CPU-bound call starts fresh ones
+            self.closeProcessPool()
+            self.logger.debug("Refreshed credentials: {}", keys)
 
     def loadCredentials(self, **kwargs) -> bool:
         """
@@ -158,7 +625,7 @@ class TemplateRoomsAddon:
             bool: True if credentials are loaded successfully, False otherwise
         """
         self.logger.debug("Loading credentials...")
-        self.logger.debug(f"Received credentials: {kwargs}")
+        self.logger.debug("Received credentials: {}", kwargs)
         try:
             if self.config and hasattr(self.config, 'secrets'):
                 required_secrets = list(self.config.secrets.keys())
@@ -167,8 +634,41 @@ class TemplateRoomsAddon:
                     raise ValueError(f"Missing required secrets: {missing_secrets}")
 
             self.credentials.store_multiple(kwargs)
-            self.logger.info(f"Loaded {len(kwargs)} credentials successfully")
+            if not isinstance(self.credentials, CredentialShard):
+                self._unscoped_keys.update(kwargs)
+            self.closeProcessPool()
+            self.logger.info("Loaded {} credentials successfully", len(kwargs))
             return True
         except Exception as e:
-            self.logger.error(f"Failed to load credentials: {e}")
+            self.logger.error("Failed to load credentials: {}", e)
             return False
+
+
+def _step_tokens(response) -> int:
+    tokens = getattr(response, "tokens", None)
+    return tokens.stepAmount if tokens is not None else 0
+
+
+class _StreamTimer:
+    """Records one metrics call per stream, with the token steps of its chunks."""
+
+    def __init__(self, metrics: Metrics, action_name: str):
+        self.metrics = metrics
+        self.action_name = action_name
+        self.tokens = 0
+        self._last_tokens = None
+
+    def observe(self, chunk) -> None:
+        # output chunks repeat the latest TokensSchema, count each one once
+        if chunk.tokens is not None and chunk.tokens is not self._last_tokens:
+            self._last_tokens = chunk.tokens
+            self.tokens += chunk.tokens.stepAmount
+
+    def __enter__(self) -> "_StreamTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        # a consumer that stops early closes the stream with GeneratorExit, which is not an error
+        error = exc_type is not None and not issubclass(exc_type, GeneratorExit)
+        self.metrics.record(self.action_name, (time.perf_counter() - self.start) * 1000, error=error, tokens=self.tokens)
@@ -1,4 +1,11 @@
-from .addonconfig import CustomAddonConfig
-from .baseconfig import BaseAddonConfig
+from ..utils.lazy import lazy_attributes
 
-__all__ = ["BaseAddonConfig", "CustomAddonConfig"]
+__all__ = ["BaseAddonConfig", "CustomAddonConfig", "ConfigCache", "config_cache", "config_fingerprint"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "BaseAddonConfig": ".baseconfig",
+    "CustomAddonConfig": ".addonconfig",
+    "ConfigCache": ".cache",
+    "config_cache": ".cache",
+    "config_fingerprint": ".cache",
+})
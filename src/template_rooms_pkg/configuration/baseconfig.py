@@ -1,6 +1,9 @@
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+_required_secret_names: dict[type, tuple[str, ...]] = {}
+_readonly_classes: dict[type, type] = {}
 
 
 class RequiredSecretsBase(BaseModel):
@@ -19,3 +22,26 @@ class BaseAddonConfig(BaseModel):
     class Config:
         extra = "allow"
         validate_assignment = True
+
+    @classmethod
+    def required_secret_names(cls) -> tuple[str, ...]:
+        """Names of the secrets declared by get_required_secrets, computed once per class."""
+        names = _required_secret_names.get(cls)
+        if names is None:
+            get_required_secrets = getattr(cls, "get_required_secrets", None)
+            names = tuple(type(get_required_secrets()).model_fields) if get_required_secrets else ()
+            _required_secret_names[cls] = names
+        return names
+
+    @classmethod
+    def readonly(cls) -> "type[BaseAddonConfig]":
+        """Frozen variant of this config class, without the validate_assignment overhead."""
+        readonly_cls = _readonly_classes.get(cls)
+        if readonly_cls is None:
+            readonly_cls = type(
+                f"ReadOnly{cls.__name__}",
+                (cls,),
+                {"model_config": ConfigDict(frozen=True, validate_assignment=False), "__module__": cls.__module__},
+            )
+            _readonly_classes[cls] = readonly_cls
+        return readonly_cls
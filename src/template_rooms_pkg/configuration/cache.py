@@ -0,0 +1,65 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .baseconfig import BaseAddonConfig
+
+
+def config_fingerprint(data: Any) -> str:
+    """Stable hash of a configuration dict, independent of key order."""
+    payload = json.dumps(data, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ConfigCache:
+    """
+    LRU cache of validated addon configurations keyed by class and config fingerprint.
+
+    Read-only loads share a single frozen instance. Mutable loads get their own
+    deep copy, so nested values and extra fields are never shared with the cache.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, BaseAddonConfig] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, config_cls: type[BaseAddonConfig], data: dict[str, Any], readonly: bool = False) -> BaseAddonConfig:
+        key = (config_cls, readonly, config_fingerprint(data))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if cached is not None:
+            return cached if readonly else self._copy(cached)
+
+        instance = (config_cls.readonly() if readonly else config_cls)(**data)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = instance if readonly else self._copy(instance)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return instance
+
+    @staticmethod
+    def _copy(config: BaseAddonConfig) -> BaseAddonConfig:
+        # still far cheaper than validating the data again
+        return config.model_copy(deep=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+config_cache = ConfigCache()
@@ -21,9 +21,7 @@ class CustomAddonConfig(BaseAddonConfig):
 
     @model_validator(mode='after')
     def validate_llm_secrets(self):
-        required_secrets_config = self.get_required_secrets()
-        required_secrets = list(required_secrets_config.model_fields.keys())
-        missing = [s for s in required_secrets if s not in self.secrets]
+        missing = [s for s in self.required_secret_names() if s not in self.secrets]
         if missing:
             raise ValueError(f"Missing LLM secrets: {missing}")
         return self
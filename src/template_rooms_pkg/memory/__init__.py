@@ -1,3 +1,8 @@
-from .example import demo_memory
+from ..utils.lazy import lazy_attributes
 
-__all__ = ["demo_memory"]
+__all__ = ["demo_memory", "MemoryStore"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "demo_memory": ".example",
+    "MemoryStore": ".store",
+})
@@ -0,0 +1,328 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from loguru import logger
+
+# meta length, embedding dimension, crc32 of meta + embedding
+_HEADER = struct.Struct("<III")
+_MISSING = object()
+
+
+class _ByteBudgetLRU:
+    """LRU of decoded values and search matrices, bounded by their approximate size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Any, tuple[Any, int]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Any, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        self.discard(key)
+        self._entries[key] = (value, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def discard(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+def _encode_embedding(embedding: Any) -> bytes:
+    if hasattr(embedding, "astype"):
+        return embedding.astype("<f4").tobytes()
+    return struct.pack(f"<{len(embedding)}f", *embedding)
+
+
+class MemoryStore:
+    """
+    Persistent room memory backed by an append-only, memory-mapped log.
+
+    Every put or delete appends one checksummed record to the log, the latest
+    record for a (room, key) wins. The in-memory index only keeps record offsets,
+    values are read from the memory map and decoded values (and the per-room
+    matrices used by search) are kept in an LRU bounded by max_cache_bytes.
+    With max_entries_per_room, the oldest written entries of a room are deleted
+    once it grows past the limit. A torn record at the end of the log, e.g. after
+    a crash, is dropped on open. compact() rewrites the log with live records only.
+
+    search() needs numpy, installed with the "memory" extra.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_cache_bytes: int = 64 * 1024 * 1024,
+        max_entries_per_room: Optional[int] = None,
+        sync: bool = False,
+    ):
+        self.path = Path(path)
+        self.max_entries_per_room = max_entries_per_room
+        self.sync = sync
+        self._cache = _ByteBudgetLRU(max_cache_bytes)
+        self._index: dict[str, dict[str, tuple[int, int, int]]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._open()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._map = None
+        self._mapped_size = 0
+        self._index.clear()
+        self._cache.clear()
+        self._recover()
+
+    def _view(self, end: int) -> mmap.mmap:
+        # remap when the log has grown past the mapped region; views handed out
+        # by earlier maps keep them alive until released
+        if self._map is None or end > self._mapped_size:
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._mapped_size = self._size
+        return self._map
+
+    def _recover(self) -> None:
+        if not self._size:
+            return
+        view = self._view(self._size)
+        offset = 0
+        while offset < self._size:
+            if offset + _HEADER.size > self._size:
+                break
+            meta_len, dim, crc = _HEADER.unpack_from(view, offset)
+            end = offset + _HEADER.size + meta_len + dim * 4
+            if end > self._size or zlib.crc32(view[offset + _HEADER.size:end]) != crc:
+                break
+            meta = json.loads(view[offset + _HEADER.size:offset + _HEADER.size + meta_len])
+            self._apply(meta, (offset, meta_len, dim))
+            offset = end
+
+        if offset < self._size:
+            logger.warning("Truncating {} bytes of incomplete memory log records in {}", self._size - offset, self.path)
+            self._map = None
+            self._file.truncate(offset)
+            self._size = offset
+
+    def _apply(self, meta: dict[str, Any], location: tuple[int, int, int]) -> None:
+        room, key = meta["r"], meta["k"]
+        entries = self._index.setdefault(room, {})
+        if meta.get("d"):
+            entries.pop(key, None)
+            if not entries:
+                del self._index[room]
+        else:
+            # re-insert so rooms stay ordered by last write, oldest first
+            entries.pop(key, None)
+            entries[key] = location
+        self._generations[room] = self._generations.get(room, 0) + 1
+
+    def _append(self, meta: dict[str, Any], embedding: bytes = b"") -> None:
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode()
+        payload = meta_bytes + embedding
+        record = _HEADER.pack(len(meta_bytes), len(embedding) // 4, zlib.crc32(payload)) + payload
+        with self._lock:
+            offset = self._size
+            self._file.write(record)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._size += len(record)
+            self._apply(meta, (offset, len(meta_bytes), len(embedding) // 4))
+
+    def put(self, room: str, key: str, value: Any, embedding: Any = None) -> None:
+        """
+        Store a JSON serializable value, optionally with an embedding used by search.
+
+        Args:
+            room: Room (conversation) the entry belongs to
+            key: Entry key, unique within the room
+            value: JSON serializable value
+            embedding: Sequence of floats or numpy vector
+        """
+        encoded = _encode_embedding(embedding) if embedding is not None else b""
+        with self._lock:
+            self._append({"r": room, "k": key, "v": value, "t": time.time()}, encoded)
+            entries = self._index[room]
+            while self.max_entries_per_room is not None and len(entries) > self.max_entries_per_room:
+                self._append({"r": room, "k": next(iter(entries)), "d": 1})
+
+    def delete(self, room: str, key: str) -> bool:
+        with self._lock:
+            if key not in self._index.get(room, {}):
+                return False
+            self._append({"r": room, "k": key, "d": 1})
+            return True
+
+    def _meta(self, location: tuple[int, int, int]) -> dict[str, Any]:
+        offset, meta_len, dim = location
+        cached = self._cache.get(offset)
+        if cached is not _MISSING:
+            return cached
+        start = offset + _HEADER.size
+        view = self._view(start + meta_len)
+        meta = json.loads(view[start:start + meta_len])
+        self._cache.put(offset, meta, meta_len)
+        return meta
+
+    def get(self, room: str, key: str, default: Any = None) -> Any:
+        """Stored value, shared with the cache so it must not be mutated."""
+        with self._lock:
+            location = self._index.get(room, {}).get(key)
+            if location is None:
+                return default
+            return self._meta(location)["v"]
+
+    def get_embedding(self, room: str, key: str) -> Optional[list[float]]:
+        with self._lock:
+            location = self._index.get(room, {}).get(key)
+            if location is None or not location[2]:
+                return None
+            offset, meta_len, dim = location
+            start = offset + _HEADER.size + meta_len
+            view = self._view(start + dim * 4)
+            return list(struct.unpack_from(f"<{dim}f", view, start))
+
+    def keys(self, room: str) -> list[str]:
+        with self._lock:
+            return list(self._index.get(room, {}))
+
+    def rooms(self) -> list[str]:
+        with self._lock:
+            return list(self._index)
+
+    def items(self, room: str) -> list[tuple[str, Any]]:
+        with self._lock:
+            return [(key, self._meta(location)["v"]) for key, location in self._index.get(room, {}).items()]
+
+    def _matrix(self, room: str, dim: int):
+        import numpy as np
+
+        cache_key = ("matrix", room, dim)
+        generation = self._generations.get(room, 0)
+        cached = self._cache.get(cache_key)
+        if cached is not _MISSING and cached[0] == generation:
+            return cached[1], cached[2]
+
+        keys = []
+        rows = []
+        view = self._view(self._size)
+        for key, (offset, meta_len, entry_dim) in self._index.get(room, {}).items():
+            if entry_dim != dim:
+                continue
+            keys.append(key)
+            rows.append(np.frombuffer(view, dtype="<f4", count=dim, offset=offset + _HEADER.size + meta_len))
+        matrix = np.vstack(rows) if rows else np.empty((0, dim), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        del rows
+        self._cache.put(cache_key, (generation, keys, matrix), matrix.nbytes + 64 * len(keys))
+        return keys, matrix
+
+    def search(self, room: str, embedding: Any, top_k: int = 5) -> list[tuple[str, float]]:
+        """
+        Entries of a room most similar to embedding, by cosine similarity.
+
+        The room's embeddings are stacked into a normalized matrix once and reused
+        until the room changes, so a query is a single matrix-vector product.
+
+        Args:
+            room: Room to search
+            embedding: Query vector
+            top_k: Number of results
+
+        Returns:
+            list[tuple[str, float]]: (key, similarity) pairs, most similar first
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("MemoryStore.search requires numpy, install template-rooms-pkg[memory]") from e
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        with self._lock:
+            if room not in self._index:
+                return []
+            keys, matrix = self._matrix(room, query.shape[0])
+        if not keys or top_k <= 0:
+            return []
+        scores = matrix @ (query / norm if norm else query)
+        top_k = min(top_k, len(keys))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(keys[i], float(scores[i])) for i in best]
+
+    def compact(self) -> None:
+        """Rewrite the log with only the live record of each entry."""
+        with self._lock:
+            if not self._size:
+                return
+            tmp_path = self.path.with_suffix(self.path.suffix + ".compact")
+            view = self._view(self._size)
+            with open(tmp_path, "wb") as out:
+                for entries in self._index.values():
+                    for offset, meta_len, dim in entries.values():
+                        out.write(view[offset:offset + _HEADER.size + meta_len + dim * 4])
+                out.flush()
+                os.fsync(out.fileno())
+            self._close_files()
+            os.replace(tmp_path, self.path)
+            self._open()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rooms": len(self._index),
+                "entries": len(self),
+                "log_bytes": self._size,
+                "cache_bytes": self._cache.size,
+                "cache_evictions": self._cache.evictions,
+            }
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def _close_files(self) -> None:
+        self._map = None
+        self._cache.clear()
+        self._file.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_files()
+
+    def __enter__(self) -> "MemoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
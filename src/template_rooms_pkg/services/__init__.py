@@ -1,4 +1,49 @@
-from .credentials import CredentialsRegistry
-from .example import demo_service
+from ..utils.lazy import lazy_attributes
 
-__all__ = ["demo_service", "CredentialsRegistry"]
+__all__ = [
+    "demo_service",
+    "CredentialsRegistry",
+    "CredentialShard",
+    "CredentialResolver",
+    "SecretProvider",
+    "EnvSecretProvider",
+    "FileSecretProvider",
+    "MockVaultSecretProvider",
+    "HealthChecker",
+    "HttpClient",
+    "HttpResponse",
+    "LatencyHistogram",
+    "api_request",
+    "http_client",
+    "TokenBucket",
+    "RateLimiter",
+    "RateLimitExceeded",
+    "LLMRateLimiter",
+    "llm_rate_limiter",
+    "Metrics",
+    "MetricsReporter",
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "demo_service": ".example",
+    "CredentialsRegistry": ".credentials",
+    "CredentialShard": ".credentials",
+    "CredentialResolver": ".credentials",
+    "SecretProvider": ".credentials",
+    "EnvSecretProvider": ".credentials",
+    "FileSecretProvider": ".credentials",
+    "MockVaultSecretProvider": ".credentials",
+    "HealthChecker": ".health",
+    "HttpClient": ".http",
+    "HttpResponse": ".http",
+    "LatencyHistogram": ".http",
+    "api_request": ".http",
+    "http_client": ".http",
+    "TokenBucket": ".ratelimit",
+    "RateLimiter": ".ratelimit",
+    "RateLimitExceeded": ".ratelimit",
+    "LLMRateLimiter": ".ratelimit",
+    "llm_rate_limiter": ".ratelimit",
+    "Metrics": ".metrics",
+    "MetricsReporter": ".metrics",
+})
@@ -1,11 +1,52 @@
-from typing import Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Union
 
 from loguru import logger
 
+from template_rooms_pkg.utils.singleflight import SingleFlight
+
+
+class CredentialShard:
+    """Credentials of a single addon instance, see CredentialsRegistry.scoped."""
+
+    def __init__(self, addon_id: str):
+        self.addon_id = addon_id
+        self._credentials: dict[str, str] = {}
+
+    def store(self, key: str, value: str) -> None:
+        self._credentials[key] = value
+        logger.debug("Stored credential: {} (addon: {})", key, self.addon_id)
+
+    def store_multiple(self, credentials: dict[str, str]) -> None:
+        self._credentials.update(credentials)
+        logger.debug("Stored {} credentials (addon: {})", len(credentials), self.addon_id)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._credentials.get(key)
+
+    def has(self, key: str) -> bool:
+        return key in self._credentials
+
+    def clear(self) -> None:
+        self._credentials.clear()
+        logger.debug("Cleared credentials of addon {}", self.addon_id)
+
+    def keys(self) -> list:
+        return list(self._credentials.keys())
+
 
 class CredentialsRegistry:
     _instance: Optional['CredentialsRegistry'] = None
     _credentials: dict[str, str] = {}
+    # per addon shards, created under the lock and read without it
+    _shards: dict[str, CredentialShard] = {}
+    # addon instances using each shard, see acquire and release
+    _users: dict[str, int] = {}
+    _shards_lock = threading.Lock()
 
     def __new__(cls) -> 'CredentialsRegistry':
         if cls._instance is None:
@@ -14,7 +55,7 @@ class CredentialsRegistry:
 
     def store(self, key: str, value: str) -> None:
         self._credentials[key] = value
-        logger.debug(f"Stored credential: {key}")
+        logger.debug("Stored credential: {}", key)
 
     def store_multiple(self, credentials: dict[str, str]) -> None:
         for key, value in credentials.items():
@@ -32,3 +73,257 @@ class CredentialsRegistry:
 
     def keys(self) -> list:
         return list(self._credentials.keys())
+
+    def scoped(self, addon_id: Optional[str]):
+        """
+        Credentials namespaced to one addon instance.
+
+        Each addon_id gets its own shard, so instances sharing a process never see
+        or overwrite each other's keys. Lookups in a shard are plain dict reads with
+        no lock. A None addon_id returns the registry itself (unscoped credentials).
+        """
+        if addon_id is None:
+            return self
+        shard = self._shards.get(addon_id)
+        if shard is None:
+            with self._shards_lock:
+                shard = self._shards.get(addon_id)
+                if shard is None:
+                    shard = self._shards[addon_id] = CredentialShard(addon_id)
+        return shard
+
+    def acquire(self, addon_id: Optional[str]):
+        """
+        scoped(addon_id), counted as one more user of the shard.
+
+        Instances loading the same config share its shard; each acquire is paired
+        with a release, and the shard is dropped when its last user releases it.
+        """
+        shard = self.scoped(addon_id)
+        if addon_id is not None:
+            with self._shards_lock:
+                self._users[addon_id] = self._users.get(addon_id, 0) + 1
+        return shard
+
+    def release(self, addon_id: Optional[str]) -> None:
+        if addon_id is None:
+            return
+        with self._shards_lock:
+            users = self._users.get(addon_id, 0) - 1
+            if users > 0:
+                self._users[addon_id] = users
+                return
+            self._users.pop(addon_id, None)
+            self._shards.pop(addon_id, None)
+        logger.debug("Dropped credentials of addon {}", addon_id)
+
+    def drop(self, addon_id: str) -> None:
+        """Drop the shard now, whoever still uses it."""
+        with self._shards_lock:
+            self._shards.pop(addon_id, None)
+            self._users.pop(addon_id, None)
+        logger.debug("Dropped credentials of addon {}", addon_id)
+
+    def addon_ids(self) -> list:
+        return list(self._shards.keys())
+
+
+class SecretProvider:
+    """Source of secret values, looked up by the names found in BaseAddonConfig.secrets."""
+
+    def fetch(self, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class EnvSecretProvider(SecretProvider):
+    def fetch(self, name: str) -> Optional[str]:
+        return os.environ.get(name)
+
+
+class FileSecretProvider(SecretProvider):
+    """Reads secrets from one file per name in a directory (docker/kubernetes secrets layout)."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def fetch(self, name: str) -> Optional[str]:
+        path = self.directory / name
+        if not path.is_file():
+            return None
+        return path.read_text().strip()
+
+
+class MockVaultSecretProvider(SecretProvider):
+    """Local in-memory vault with a simulated round trip, for development and tests."""
+
+    def __init__(self, secrets: Optional[dict[str, str]] = None, latency: float = 0.0):
+        self.secrets = dict(secrets or {})
+        self.latency = latency
+        self.fetch_count = 0
+
+    def fetch(self, name: str) -> Optional[str]:
+        self.fetch_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.secrets.get(name)
+
+
+class CredentialResolver:
+    """
+    Resolves secret names through a chain of providers and caches the values.
+
+    Values are cached for ttl seconds. Once an entry enters the last refresh_ahead
+    fraction of its ttl it is refreshed in the background, on a timer set when the
+    value is cached, so values stay fresh even when nobody reads them through the
+    resolver; reads in the meantime keep returning the cached value. Listeners are
+    called with (name, value) when a refresh returns a new value. Names no provider knows are cached for miss_ttl seconds
+    only (0 disables it), so a secret added later is picked up quickly. Concurrent
+    lookups of a missing or expired name are coalesced into a single provider call.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[list[SecretProvider]] = None,
+        ttl: float = 300.0,
+        refresh_ahead: float = 0.2,
+        max_workers: int = 2,
+        miss_ttl: float = 5.0,
+    ):
+        self.providers = providers if providers is not None else [EnvSecretProvider()]
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_workers = max_workers
+        self.miss_ttl = miss_ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[str, tuple[Optional[str], float]] = {}
+        self._flight = SingleFlight()
+        self._refreshing: set[str] = set()
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._timers: dict[str, threading.Timer] = {}
+        self._closed = False
+
+    def resolve(self, name: str) -> Optional[str]:
+        entry = self._cache.get(name)
+        if entry is not None:
+            value, expires_at = entry
+            now = time.monotonic()
+            if now < expires_at:
+                self.hits += 1
+                if value is not None and now >= expires_at - self.ttl * self.refresh_ahead:
+                    self._schedule_refresh(name)
+                return value
+
+        self.misses += 1
+        return self._flight.do(name, self._load_missing, name)
+
+    def resolve_secrets(self, secrets: dict[str, str]) -> dict[str, Optional[str]]:
+        """Resolve a BaseAddonConfig.secrets mapping into {secret name: value}."""
+        return {key: self.resolve(name) for key, name in secrets.items()}
+
+    def _load_missing(self, name: str) -> Optional[str]:
+        # another caller may have loaded it between our cache check and the flight
+        entry = self._cache.get(name)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return self._load(name)
+
+    def _load(self, name: str) -> Optional[str]:
+        value = None
+        for provider in self.providers:
+            value = provider.fetch(name)
+            if value is not None:
+                break
+        if value is not None:
+            self._cache[name] = (value, time.monotonic() + self.ttl)
+            self._schedule_timer(name)
+        elif self.miss_ttl > 0:
+            self._cache[name] = (None, time.monotonic() + self.miss_ttl)
+        else:
+            self._cache.pop(name, None)
+        return value
+
+    def add_listener(self, callback: Callable[[str, str], None]) -> None:
+        """Call callback(name, value) when a background refresh changes a cached value."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _schedule_timer(self, name: str) -> None:
+        # with refresh_ahead at 0 or 1 there is no window before expiry to refresh in
+        if not 0 < self.refresh_ahead < 1:
+            return
+        timer = threading.Timer(self.ttl * (1 - self.refresh_ahead), self._schedule_refresh, args=(name,))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            previous = self._timers.get(name)
+            self._timers[name] = timer
+            timer.start()
+        if previous is not None:
+            previous.cancel()
+
+    def _cancel_timers(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                timers, self._timers = list(self._timers.values()), {}
+            else:
+                timer = self._timers.pop(name, None)
+                timers = [timer] if timer is not None else []
+        for timer in timers:
+            timer.cancel()
+
+    def _schedule_refresh(self, name: str) -> None:
+        with self._lock:
+            if name in self._refreshing or self._closed:
+                return
+            self._refreshing.add(name)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="credentials")
+            self._pool.submit(self._refresh, name)
+
+    def _refresh(self, name: str) -> None:
+        previous = self._cache.get(name, (None, 0.0))[0]
+        try:
+            value = self._flight.do(name, self._load, name)
+        except Exception as e:
+            logger.warning("Background refresh of secret {} failed: {}", name, e)
+            return
+        finally:
+            with self._lock:
+                self._refreshing.discard(name)
+        if value is None or value == previous:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(name, value)
+            except Exception as e:
+                logger.warning("Listener for refreshed secret {} failed: {}", name, e)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+        self._cancel_timers(name)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "refreshing": len(self._refreshing)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop background refreshes; cached values can still be read."""
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+        self._cancel_timers()
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -0,0 +1,131 @@
+import importlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_for
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+class HealthChecker:
+    """
+    Runs module and dependency checks concurrently and reports them as a dict.
+
+    Module checks import a package module and resolve its public components;
+    modules that passed once are not imported or resolved again. Dependency checks
+    are callables registered with add_check: they fail by raising or returning
+    False, any other return value is reported as the check detail. Reports are
+    cached for cache_ttl seconds. A check still running after its timeout is not
+    started again by later runs, they wait on the running call instead, so a hung
+    check ties up at most one worker.
+    """
+
+    def __init__(
+        self,
+        package: str,
+        modules: list[str],
+        timeout: float = 5.0,
+        cache_ttl: float = 30.0,
+        max_workers: int = 8,
+    ):
+        self.package = package
+        self.modules = list(modules)
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self._checks: dict[str, Callable[[], Any]] = {}
+        self._verified_modules: dict[str, int] = {}
+        self._report: Optional[dict[str, Any]] = None
+        self._report_time = 0.0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._running: dict[tuple[str, str], Future] = {}
+
+    def add_check(self, name: str, check: Callable[[], Any]) -> None:
+        self._checks[name] = check
+        self.invalidate()
+
+    def remove_check(self, name: str) -> None:
+        self._checks.pop(name, None)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._report = None
+
+    def _check_module(self, module_name: str) -> dict[str, Any]:
+        if module_name in self._verified_modules:
+            return {"components": self._verified_modules[module_name], "verified": True}
+
+        module = importlib.import_module(f"{self.package}.{module_name}")
+        components = getattr(module, "__all__", [])
+        for component_name in components:
+            getattr(module, component_name)
+        self._verified_modules[module_name] = len(components)
+        return {"components": len(components), "verified": False}
+
+    def _timed(self, func: Callable[[], Any]) -> tuple[Any, Optional[BaseException], float]:
+        start = time.perf_counter()
+        try:
+            return func(), None, (time.perf_counter() - start) * 1000
+        except Exception as e:
+            return None, e, (time.perf_counter() - start) * 1000
+
+    def run(self, use_cache: bool = True, max_age: Optional[float] = None) -> dict[str, Any]:
+        max_age = self.cache_ttl if max_age is None else max_age
+        with self._lock:
+            if use_cache and self._report is not None and time.monotonic() - self._report_time < max_age:
+                return {**self._report, "cached": True}
+
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health")
+
+            start = time.perf_counter()
+            targets = [("module", name, lambda name=name: self._check_module(name)) for name in self.modules]
+            targets += [("dependency", name, check) for name, check in self._checks.items()]
+            futures = []
+            for kind, name, func in targets:
+                future = self._running.get((kind, name))
+                if future is None or future.done():
+                    future = self._pool.submit(self._timed, func)
+                futures.append(future)
+            wait_for(futures, timeout=self.timeout)
+            self._running = {
+                (kind, name): future for (kind, name, _), future in zip(targets, futures) if not future.done()
+            }
+
+            checks = []
+            for (kind, name, _), future in zip(targets, futures):
+                check = {"name": name, "kind": kind}
+                if not future.done():
+                    check.update(status="timeout", duration_ms=self.timeout * 1000, error=f"timed out after {self.timeout}s")
+                else:
+                    detail, error, duration_ms = future.result()
+                    check["duration_ms"] = round(duration_ms, 3)
+                    if error is not None:
+                        check.update(status="error", error=f"{type(error).__name__}: {error}")
+                    elif detail is False:
+                        check.update(status="error", error="check returned False")
+                    else:
+                        check["status"] = "ok"
+                        if detail is not None and detail is not True:
+                            check["detail"] = detail
+                checks.append(check)
+
+            failed = [check["name"] for check in checks if check["status"] != "ok"]
+            if failed:
+                logger.warning("Health check failed for: {}", failed)
+            self._report = {
+                "status": "fail" if failed else "ok",
+                "checked_at": time.time(),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "checks": checks,
+            }
+            self._report_time = time.monotonic()
+            return {**self._report, "cached": False}
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        self._running = {}
@@ -0,0 +1,359 @@
+import http.client
+import json as jsonlib
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+from urllib.parse import urljoin, urlsplit
+
+from loguru import logger
+
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# errors raised when the server silently dropped a kept-alive connection
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+# a stale connection may fail after the server received the request, only these are safe to send twice
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+
+
+class LatencyHistogram:
+    """Fixed bucket latency histogram in milliseconds, percentiles are bucket upper bounds."""
+
+    def __init__(self, buckets_ms: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        index = bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value_ms
+            self._max = max(self._max, value_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._count:
+                return None
+            rank = q * self._count
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.buckets_ms[index] if index < len(self.buckets_ms) else self._max
+            return self._max
+
+    def snapshot(self) -> dict[str, Any]:
+        p50, p99 = self.percentile(0.5), self.percentile(0.99)
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets_ms, self._counts)}
+            buckets["le_inf"] = self._counts[-1]
+            return {
+                "count": self._count,
+                "sum_ms": round(self._sum, 3),
+                "max_ms": round(self._max, 3),
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "buckets": buckets,
+            }
+
+
+class HttpResponse:
+    __slots__ = ("status", "headers", "body", "elapsed_ms")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes, elapsed_ms: float):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.body)
+
+
+class _EndpointPool:
+    """Kept-alive connections to one scheme://host:port, idle ones as (connection, idle since)."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], max_connections: int, keep_alive: float):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.keep_alive = keep_alive
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self.lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.stats = {"requests": 0, "errors": 0, "connections": 0, "reused": 0, "expired": 0}
+
+    def checkout(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        # connections idle for longer than keep_alive were likely closed by the server,
+        # reusing them would fail the request (and non-idempotent ones are not retried)
+        expired = []
+        connection = None
+        with self.lock:
+            deadline = time.monotonic() - self.keep_alive
+            while self.idle and self.idle[0][1] < deadline:
+                expired.append(self.idle.pop(0)[0])
+            self.stats["expired"] += len(expired)
+            if self.idle:
+                connection = self.idle.pop()[0]
+                self.stats["reused"] += 1
+                reused = True
+            else:
+                self.stats["connections"] += 1
+                reused = False
+        for stale in expired:
+            stale.close()
+        if connection is None:
+            connection_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_cls(self.host, self.port, timeout=timeout)
+        else:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+        return connection, reused
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    def checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            self.idle.append((connection, time.monotonic()))
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            connection.close()
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client shared by API addons, see configuration/examples/api_config.py.
+
+    Connections are pooled per endpoint (scheme, host and port) and reused across
+    requests and addons, with at most max_connections open per endpoint. At most
+    max_in_flight requests run at once across all endpoints, further callers wait
+    for a slot. timeout applies to connecting, to each socket read and to waiting
+    for a slot. Idle connections are dropped after keep_alive seconds, set it below
+    the servers' keep-alive timeout. Latencies are recorded per endpoint in a
+    LatencyHistogram.
+    """
+
+    def __init__(self, timeout: float = 30.0, max_connections: int = 10, max_in_flight: int = 32, keep_alive: float = 4.0):
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._pools: dict[tuple[str, str, Optional[int]], _EndpointPool] = {}
+        self._pools_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self, scheme: str, host: str, port: Optional[int]) -> _EndpointPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = _EndpointPool(scheme, host, port, self.max_connections, self.keep_alive)
+        return pool
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        json: Any = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: Absolute http(s) URL
+            body: Raw request body
+            json: Object sent as a JSON body, instead of body
+            headers: Request headers
+            timeout: Seconds, defaults to the client timeout
+
+        Returns:
+            HttpResponse: Status, headers and the fully read body, whatever the status code
+
+        Raises:
+            TimeoutError: If no request slot frees up or the server does not answer in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = dict(headers or {})
+        if json is not None:
+            body = jsonlib.dumps(json).encode()
+            headers.setdefault("Content-Type", "application/json")
+
+        pool = self._get_pool(parts.scheme, parts.hostname, parts.port)
+        if not self._in_flight.acquire(timeout=timeout):
+            raise TimeoutError(f"No request slot available within {timeout}s")
+        try:
+            if not pool.slots.acquire(timeout=timeout):
+                raise TimeoutError(f"No connection to {parts.hostname} available within {timeout}s")
+            try:
+                return self._send(pool, method, path, body, headers, timeout)
+            finally:
+                pool.slots.release()
+        finally:
+            self._in_flight.release()
+
+    def _send(self, pool, method, path, body, headers, timeout) -> HttpResponse:
+        start = time.perf_counter()
+        connection, reused = pool.checkout(timeout)
+        try:
+            try:
+                response = self._exchange(connection, method, path, body, headers)
+            except _STALE_ERRORS:
+                if not reused or method.upper() not in _IDEMPOTENT_METHODS:
+                    raise
+                # the server closed the kept-alive connection, retry once on a new socket
+                connection.close()
+                pool.count("connections")
+                response = self._exchange(connection, method, path, body, headers)
+        except Exception:
+            connection.close()
+            pool.count("errors")
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        pool.latency.observe(elapsed_ms)
+        pool.count("requests")
+        status, response_headers, response_body, will_close = response
+        if will_close:
+            connection.close()
+        else:
+            pool.checkin(connection)
+        return HttpResponse(status, response_headers, response_body, elapsed_ms)
+
+    @staticmethod
+    def _exchange(connection, method, path, body, headers):
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except socket.timeout as e:
+            raise TimeoutError(f"Request timed out: {e}") from e
+        return response.status, dict(response.getheaders()), data, response.will_close
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("POST", url, **kwargs)
+
+    def request_many(self, requests: Iterable[dict[str, Any]], return_exceptions: bool = False) -> list[Any]:
+        """
+        Send several requests concurrently, bounded by max_in_flight.
+
+        Args:
+            requests: Keyword arguments for request(), one dict per request
+            return_exceptions: Return errors in place of responses instead of raising
+
+        Returns:
+            list: Responses in request order
+        """
+        if self._executor is None:
+            with self._pools_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="http")
+        futures = [self._executor.submit(self.request, **kwargs) for kwargs in requests]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            f"{scheme}://{host}" + (f":{port}" if port else ""): {
+                **pool.stats,
+                "idle": len(pool.idle),
+                "latency": pool.latency.snapshot(),
+            }
+            for (scheme, host, port), pool in list(self._pools.items())
+        }
+
+    def close(self) -> None:
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+            executor, self._executor = self._executor, None
+        for pool in pools:
+            pool.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        logger.debug("Closed {} HTTP endpoint pools", len(pools))
+
+
+def api_request(
+    config: Any,
+    credentials: Any,
+    path: str = "",
+    method: Optional[str] = None,
+    client: Optional[HttpClient] = None,
+    **kwargs,
+) -> HttpResponse:
+    """
+    Call an API addon's endpoint with its configured method and timeout.
+
+    The api_key credential, when present, is sent as a bearer token.
+
+    Args:
+        config: Addon config with endpoint, method and timeout fields
+        credentials: Credentials holding the api_key secret
+        path: Path resolved against the endpoint
+        method: Overrides the configured method
+        client: Client to use, defaults to the shared http_client
+        **kwargs: request() arguments (body, json, headers)
+
+    Returns:
+        HttpResponse: The endpoint's response
+    """
+    client = client or http_client
+    headers = dict(kwargs.pop("headers", None) or {})
+    api_key = credentials.get("api_key")
+    if api_key:
+        headers.setdefault("Authorization", f"Bearer {api_key}")
+    url = urljoin(config.endpoint, path) if path else config.endpoint
+    return client.request(
+        method or getattr(config, "method", "GET"),
+        url,
+        headers=headers,
+        timeout=kwargs.pop("timeout", getattr(config, "timeout", None)),
+        **kwargs,
+    )
+
+
+http_client = HttpClient()
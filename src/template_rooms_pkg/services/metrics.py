@@ -0,0 +1,212 @@
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any, Callable, Optional
+
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class _ActionStats:
+    __slots__ = ("calls", "errors", "retries", "tokens", "latency_sum", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.tokens = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * bucket_count
+
+
+class Metrics:
+    """
+    Per-action call, error, retry and token counters with latency histograms.
+
+    Every thread records into its own shard, so the hot path is a few integer
+    increments on objects no other thread writes, without locks. snapshot() and
+    to_prometheus() merge the shards; a snapshot taken while other threads record
+    may miss their in-progress updates, which show up in the next one. Shards of
+    threads that have exited are folded into a retired total.
+    """
+
+    def __init__(self, buckets_ms: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._local = threading.local()
+        self._shards: list[tuple[weakref.ref, dict[str, _ActionStats]]] = []
+        self._retired: dict[str, _ActionStats] = {}
+        self._shards_lock = threading.Lock()
+
+    def _stats(self, action: str) -> _ActionStats:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._retire_dead_shards()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        stats = shard.get(action)
+        if stats is None:
+            stats = shard[action] = _ActionStats(len(self.buckets_ms) + 1)
+        return stats
+
+    def record(self, action: str, duration_ms: float, error: bool = False, tokens: int = 0) -> None:
+        stats = self._stats(action)
+        stats.calls += 1
+        stats.latency_sum += duration_ms
+        stats.buckets[bisect_left(self.buckets_ms, duration_ms)] += 1
+        if error:
+            stats.errors += 1
+        if tokens:
+            stats.tokens += tokens
+
+    def record_retry(self, action: str) -> None:
+        self._stats(action).retries += 1
+
+    def _retire_dead_shards(self) -> None:
+        # called with _shards_lock held; a dead thread no longer writes its shard
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+            else:
+                self._add(self._retired, shard)
+        self._shards = live
+
+    def _add(self, merged: dict[str, _ActionStats], shard: dict[str, _ActionStats]) -> None:
+        for action, stats in list(shard.items()):
+            total = merged.get(action)
+            if total is None:
+                total = merged[action] = _ActionStats(len(self.buckets_ms) + 1)
+            total.calls += stats.calls
+            total.errors += stats.errors
+            total.retries += stats.retries
+            total.tokens += stats.tokens
+            total.latency_sum += stats.latency_sum
+            total.buckets = [a + b for a, b in zip(total.buckets, stats.buckets)]
+
+    def _merged(self) -> dict[str, _ActionStats]:
+        merged: dict[str, _ActionStats] = {}
+        with self._shards_lock:
+            self._retire_dead_shards()
+            self._add(merged, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            self._add(merged, shard)
+        return merged
+
+    def _percentile(self, buckets: list[int], count: int, q: float) -> Optional[float]:
+        if not count:
+            return None
+        seen = 0
+        for index, bucket in enumerate(buckets):
+            seen += bucket
+            if bucket and seen >= q * count:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else float("inf")
+        return None
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Totals per action, with latency percentiles estimated as bucket upper bounds."""
+        return {
+            action: {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "retries": stats.retries,
+                "tokens": stats.tokens,
+                "latency": {
+                    "sum_ms": round(stats.latency_sum, 3),
+                    "mean_ms": round(stats.latency_sum / stats.calls, 3) if stats.calls else None,
+                    "p50_ms": self._percentile(stats.buckets, stats.calls, 0.5),
+                    "p99_ms": self._percentile(stats.buckets, stats.calls, 0.99),
+                    "buckets": dict(zip([*self.buckets_ms, "inf"], stats.buckets)),
+                },
+            }
+            for action, stats in sorted(self._merged().items())
+        }
+
+    def to_prometheus(self, prefix: str = "rooms_action", labels: Optional[dict[str, str]] = None) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Constant labels added to every sample, e.g. addon_id
+
+        Returns:
+            str: Exposition text, e.g. for a textfile collector or an HTTP handler
+        """
+        def label_text(action: str, **extra: str) -> str:
+            pairs = {**(labels or {}), "action": action, **extra}
+            escaped = (f'{key}="{_escape(str(value))}"' for key, value in pairs.items())
+            return "{" + ",".join(escaped) + "}"
+
+        merged = sorted(self._merged().items())
+        lines = []
+        for name, attribute, help_text in (
+            ("calls_total", "calls", "Action calls"),
+            ("errors_total", "errors", "Action calls that raised"),
+            ("retries_total", "retries", "Action retries"),
+            ("tokens_total", "tokens", "Tokens reported by action responses"),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}.")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for action, stats in merged:
+                lines.append(f"{prefix}_{name}{label_text(action)} {getattr(stats, attribute)}")
+
+        histogram = f"{prefix}_latency_seconds"
+        lines.append(f"# HELP {histogram} Action latency.")
+        lines.append(f"# TYPE {histogram} histogram")
+        for action, stats in merged:
+            cumulative = 0
+            for bound, count in zip([*self.buckets_ms, None], stats.buckets):
+                cumulative += count
+                le = "+Inf" if bound is None else repr(bound / 1000)
+                lines.append(f"{histogram}_bucket{label_text(action, le=le)} {cumulative}")
+            lines.append(f"{histogram}_sum{label_text(action)} {stats.latency_sum / 1000}")
+            lines.append(f"{histogram}_count{label_text(action)} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            self._retired.clear()
+            for _, shard in self._shards:
+                shard.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsReporter:
+    """Pushes Metrics snapshots to a callback every interval seconds from a daemon thread."""
+
+    def __init__(self, metrics: Metrics, callback: Callable[[dict[str, Any]], None], interval: float = 10.0):
+        self.metrics = metrics
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsReporter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        self.callback({"timestamp": time.time(), "interval": self.interval, "actions": self.metrics.snapshot()})
+
+    def stop(self, flush: bool = True) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        if flush:
+            self.flush()
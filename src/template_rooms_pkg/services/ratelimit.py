@@ -0,0 +1,247 @@
+import pickle
+import threading
+import time
+from collections import deque
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from template_rooms_pkg.utils.singleflight import SingleFlight
+
+
+class RateLimitExceeded(TimeoutError):
+    pass
+
+
+def _arguments_key(func: Callable[..., Any], args: tuple, kwargs: dict) -> Optional[Hashable]:
+    # the exact pickled arguments, lossy keys like reprs would merge distinct calls
+    try:
+        hash(func)
+        return func, pickle.dumps((args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+class TokenBucket:
+    """Continuously refilled bucket, the level may go negative when usage is settled after the fact."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    Requests-per-second and tokens-per-minute budget for one provider/model.
+
+    Callers reserve a request and an estimate of their tokens with acquire(), and
+    settle() the reservation with the tokens actually used once the call returns,
+    refunding or charging the difference. Callers that have to wait are served
+    in arrival order.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+    ):
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = TokenBucket(requests_per_second, burst or max(1, requests_per_second)) if requests_per_second else None
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self._queue: deque[object] = deque()
+        self._cond = threading.Condition()
+        self.stats = {"requests": 0, "throttled": 0, "tokens": 0, "wait_ms_total": 0.0}
+
+    def _wait_time(self, tokens: int) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        if self._requests is not None:
+            self._requests.refill(now)
+            wait = self._requests.wait_time(1)
+        if self._tokens is not None and tokens:
+            self._tokens.refill(now)
+            wait = max(wait, self._tokens.wait_time(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> None:
+        """
+        Block until a request and tokens fit in the budget.
+
+        Raises:
+            RateLimitExceeded: If the budget does not free up within timeout seconds
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    wait = self._wait_time(tokens) if self._queue[0] is ticket else None
+                    if wait == 0:
+                        break
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitExceeded(f"Rate limit budget not available within {timeout}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(min(tokens, self._tokens.capacity))
+            waited_ms = (time.monotonic() - start) * 1000
+            self.stats["requests"] += 1
+            self.stats["wait_ms_total"] += waited_ms
+            if waited_ms >= 1:
+                self.stats["throttled"] += 1
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Replace a reservation made with acquire() by the tokens actually used."""
+        with self._cond:
+            self.stats["tokens"] += used
+            if self._tokens is not None:
+                self._tokens.take(used - min(reserved, self._tokens.capacity))
+                self._cond.notify_all()
+
+
+def used_tokens(result: Any) -> Optional[int]:
+    """Tokens reported by an ActionResponse, ActionChunk or TokensSchema result."""
+    tokens = getattr(result, "tokens", result)
+    return getattr(tokens, "stepAmount", None)
+
+
+class LLMRateLimiter:
+    """
+    Rate limits and coalesces LLM calls per provider/model.
+
+    Each (provider, model) gets a RateLimiter with the budget passed to
+    set_budget, or the default budget. Identical calls in flight at the same time,
+    e.g. the same prompt sent by parallel rooms, run once and share the result,
+    and only that call counts against the budget. Token usage is read from the
+    TokensSchema of the result.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.default_budget = {"requests_per_second": requests_per_second, "tokens_per_minute": tokens_per_minute}
+        self.timeout = timeout
+        self._limiters: dict[tuple[str, str], RateLimiter] = {}
+        self._budgets: dict[tuple[str, str], dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.coalesced = 0
+
+    def set_budget(
+        self,
+        provider: str,
+        model: str,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            self._budgets[(provider, model)] = {
+                "requests_per_second": requests_per_second,
+                "tokens_per_minute": tokens_per_minute,
+                "burst": burst,
+            }
+            self._limiters.pop((provider, model), None)
+
+    def limiter(self, provider: str, model: str) -> RateLimiter:
+        key = (provider, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(key)
+                if limiter is None:
+                    budget = self._budgets.get(key, self.default_budget)
+                    limiter = self._limiters[key] = RateLimiter(**budget)
+        return limiter
+
+    def call(
+        self,
+        provider: str,
+        model: str,
+        func: Callable[..., Any],
+        *args,
+        estimated_tokens: int = 0,
+        coalesce_key: Optional[Hashable] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run func(*args, **kwargs) within the provider/model budget.
+
+        Args:
+            provider: LLM provider
+            model: Model name
+            func: Function performing the backend call
+            estimated_tokens: Tokens reserved before the call, e.g. the config's max_tokens
+            coalesce_key: Calls sharing a key while in flight run once, defaults to the function and
+                its pickled arguments; calls with arguments that cannot be pickled are not coalesced
+
+        Returns:
+            Any: The result of func
+        """
+        if coalesce_key is None:
+            coalesce_key = _arguments_key(func, args, kwargs)
+
+        leader = []
+
+        def run():
+            leader.append(True)
+            limiter = self.limiter(provider, model)
+            limiter.acquire(estimated_tokens, timeout=self.timeout)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                limiter.settle(estimated_tokens, 0)
+                raise
+            used = used_tokens(result)
+            limiter.settle(estimated_tokens, estimated_tokens if used is None else used)
+            return result
+
+        if coalesce_key is None:
+            return run()
+        result = self._flight.do((provider, model, coalesce_key), run)
+        if not leader:
+            with self._lock:
+                self.coalesced += 1
+            logger.debug("Coalesced call to {}/{}", provider, model)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "coalesced": self.coalesced,
+            "in_flight": self._flight.in_flight(),
+            "limiters": {f"{provider}/{model}": dict(limiter.stats) for (provider, model), limiter in self._limiters.items()},
+        }
+
+
+llm_rate_limiter = LLMRateLimiter()
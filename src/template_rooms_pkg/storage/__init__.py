@@ -1,3 +1,29 @@
-from .example import demo_storage
+from ..utils.lazy import lazy_attributes
 
-__all__ = ["demo_storage"]
+__all__ = [
+    "demo_storage",
+    "ConnectionPool",
+    "PoolTimeout",
+    "PoolClosed",
+    "sqlite_connect",
+    "DiskCache",
+    "StorageBackend",
+    "MemoryBackend",
+    "FilesystemBackend",
+    "SQLiteBackend",
+    "open_storage",
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "demo_storage": ".example",
+    "ConnectionPool": ".pool",
+    "PoolTimeout": ".pool",
+    "PoolClosed": ".pool",
+    "sqlite_connect": ".pool",
+    "DiskCache": ".diskcache",
+    "StorageBackend": ".backends",
+    "MemoryBackend": ".backends",
+    "FilesystemBackend": ".backends",
+    "SQLiteBackend": ".backends",
+    "open_storage": ".backends",
+})
@@ -0,0 +1,303 @@
+import io
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+Data = Union[bytes, bytearray, memoryview]
+Items = Union[Mapping[str, Data], Iterable[tuple[str, Data]]]
+
+
+def _check_key(key: str) -> str:
+    if not key or key.startswith("/") or "\\" in key or ".." in key.split("/"):
+        raise ValueError(f"Invalid storage key: {key!r}")
+    return key
+
+
+def _items(items: Items) -> Iterable[tuple[str, Data]]:
+    return items.items() if isinstance(items, Mapping) else items
+
+
+class _BufferedWriter(io.BytesIO):
+    """Collects a streamed write and hands the bytes to the backend on close."""
+
+    def __init__(self, commit):
+        super().__init__()
+        self._commit = commit
+
+    def close(self) -> None:
+        if not self.closed and self._commit is not None:
+            with self.getbuffer() as data:
+                self._commit(data)
+        super().close()
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is not None:
+            self._commit = None
+        self.close()
+
+
+class StorageBackend:
+    """
+    Key/value store for action artifacts.
+
+    Keys are relative, slash separated paths. get returns a memoryview over the
+    stored bytes instead of a copy, get_many returns found keys only, and
+    open_read/open_write stream values through binary file objects; a streamed
+    write becomes visible when the file is closed.
+    """
+
+    def put(self, key: str, data: Data) -> None:
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[memoryview]:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def keys(self, prefix: str = "") -> list[str]:
+        raise NotImplementedError
+
+    def open_write(self, key: str) -> BinaryIO:
+        _check_key(key)
+        return _BufferedWriter(lambda data: self.put(key, data))
+
+    def open_read(self, key: str) -> BinaryIO:
+        data = self.get(key)
+        if data is None:
+            raise KeyError(key)
+        return io.BytesIO(data)
+
+    def exists(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def put_many(self, items: Items) -> None:
+        for key, data in _items(items):
+            self.put(key, data)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, memoryview]:
+        found = {}
+        for key in keys:
+            data = self.get(key)
+            if data is not None:
+                found[key] = data
+        return found
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StorageBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MemoryBackend(StorageBackend):
+    def __init__(self):
+        self._blobs: dict[str, bytes] = {}
+
+    def put(self, key: str, data: Data) -> None:
+        self._blobs[_check_key(key)] = bytes(data)
+
+    def get(self, key: str) -> Optional[memoryview]:
+        data = self._blobs.get(key)
+        return None if data is None else memoryview(data)
+
+    def delete(self, key: str) -> bool:
+        return self._blobs.pop(key, None) is not None
+
+    def exists(self, key: str) -> bool:
+        return key in self._blobs
+
+    def keys(self, prefix: str = "") -> list[str]:
+        return sorted(key for key in self._blobs if key.startswith(prefix))
+
+
+class _AtomicFileWriter(io.FileIO):
+    """Writes to a temporary file next to the target and renames it over the target on close."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        os.close(fd)
+        super().__init__(self._tmp_path, "wb")
+        self._path = path
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        super().close()
+        os.replace(self._tmp_path, self._path)
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is not None and not self.closed:
+            super().close()
+            os.unlink(self._tmp_path)
+            return
+        self.close()
+
+
+class FilesystemBackend(StorageBackend):
+    """
+    One file per key under root, written atomically.
+
+    Values of at least mmap_threshold bytes are memory-mapped rather than read,
+    so large artifacts are served from the page cache without a copy.
+    """
+
+    def __init__(self, root: Union[str, Path], mmap_threshold: int = 1024 * 1024):
+        self.root = Path(root)
+        self.mmap_threshold = mmap_threshold
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / _check_key(key)
+
+    def put(self, key: str, data: Data) -> None:
+        with self.open_write(key) as f:
+            f.write(data)
+
+    def open_write(self, key: str) -> BinaryIO:
+        return _AtomicFileWriter(self._path(key))
+
+    def open_read(self, key: str) -> BinaryIO:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def get(self, key: str) -> Optional[memoryview]:
+        try:
+            with open(self._path(key), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size and size >= self.mmap_threshold:
+                    return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                return memoryview(f.read())
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> bool:
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def keys(self, prefix: str = "") -> list[str]:
+        keys = []
+        for path in self.root.rglob("*"):
+            if path.is_file() and not path.name.startswith(".tmp-"):
+                key = path.relative_to(self.root).as_posix()
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Blobs in a single SQLite table, bulk operations run in one transaction.
+
+    On Python 3.11+ open_read streams from the database through an incremental
+    blob handle instead of loading the whole value.
+    """
+
+    _batch_size = 500
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        self.path = str(path)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS blobs (key TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, data: Data) -> None:
+        self.put_many([(key, data)])
+
+    def put_many(self, items: Items) -> None:
+        rows = [(_check_key(key), sqlite3.Binary(data)) for key, data in _items(items)]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO blobs (key, data) VALUES (?, ?)", rows)
+
+    def get(self, key: str) -> Optional[memoryview]:
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM blobs WHERE key = ?", (key,)).fetchone()
+        return None if row is None else memoryview(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, memoryview]:
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._batch_size):
+                batch = keys[start:start + self._batch_size]
+                placeholders = ",".join("?" * len(batch))
+                query = f"SELECT key, data FROM blobs WHERE key IN ({placeholders})"
+                for key, data in self._connection.execute(query, batch):
+                    found[key] = memoryview(data)
+        return {key: found[key] for key in keys if key in found}
+
+    def open_read(self, key: str) -> BinaryIO:
+        if not hasattr(self._connection, "blobopen"):
+            return super().open_read(key)
+        with self._lock:
+            row = self._connection.execute("SELECT rowid FROM blobs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            return self._connection.blobopen("blobs", "data", row[0], readonly=True)
+
+    def delete(self, key: str) -> bool:
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM blobs WHERE key = ?", (key,)).rowcount > 0
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM blobs WHERE key = ?", (key,)).fetchone() is not None
+
+    def keys(self, prefix: str = "") -> list[str]:
+        # LIKE is case-insensitive for ASCII, the other backends match prefixes exactly
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM blobs WHERE substr(key, 1, length(?1)) = ?1 ORDER BY key", (prefix,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_backends = {
+    "memory": MemoryBackend,
+    "file": FilesystemBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def open_storage(uri: str, **options) -> StorageBackend:
+    """
+    Create a backend from a URI: memory://, file:///path/to/dir or sqlite:///path/to/db.
+
+    Args:
+        uri: Backend URI
+        **options: Backend specific options, e.g. mmap_threshold
+
+    Returns:
+        StorageBackend: The backend
+    """
+    scheme, _, location = uri.partition("://")
+    backend_cls = _backends.get(scheme)
+    if backend_cls is None:
+        raise ValueError(f"Unknown storage backend: {scheme}")
+    if backend_cls is MemoryBackend:
+        return backend_cls(**options)
+    if not location:
+        raise ValueError(f"Missing storage location in {uri}")
+    return backend_cls(location, **options)
@@ -0,0 +1,76 @@
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from loguru import logger
+
+MISSING = object()
+
+
+class DiskCache:
+    """
+    Pickle-per-entry cache in a directory, shared by processes using the same path.
+
+    Entries are written atomically (temporary file then rename) under a two
+    character fan-out directory, with an optional expiry timestamp. Expired or
+    unreadable entries are removed on lookup.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl: Optional[float] = None):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def get_entry(self, key: str) -> Optional[tuple[Optional[float], Any]]:
+        """(expiry as a time.time() timestamp or None, value), or None if the key is missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Dropping unreadable cache entry {}: {}", path, e)
+            self.delete(key)
+            return None
+        if expires_at is not None and time.time() >= expires_at:
+            self.delete(key)
+            return None
+        return expires_at, value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*/*.pkl"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*/*.pkl"))
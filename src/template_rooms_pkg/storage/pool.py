@@ -0,0 +1,280 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from loguru import logger
+
+
+class PoolTimeout(TimeoutError):
+    pass
+
+
+class PoolClosed(RuntimeError):
+    pass
+
+
+def sqlite_connect(database: str = ":memory:", **_) -> sqlite3.Connection:
+    """Local stand-in for a database driver, accepts the same keyword arguments as from_config passes."""
+    return sqlite3.connect(database, check_same_thread=False)
+
+
+def ping(connection: Any) -> None:
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+class _PooledConnection:
+    __slots__ = ("connection", "created_at", "last_used")
+
+    def __init__(self, connection: Any, now: float):
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    Connections are created on demand by connect, up to max_size, and handed out
+    through the connection() context manager. Idle connections are closed after
+    max_idle seconds (keeping min_size of them), and every connection is retired
+    once it is max_lifetime seconds old. Connections idle for more than
+    check_interval seconds are pinged before they are handed out, and replaced if
+    the ping fails. Uncommitted work is rolled back when a connection is returned.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        check_interval: float = 5.0,
+        check: Callable[[Any], None] = ping,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+        self.check = check
+        self._idle: deque[_PooledConnection] = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "acquired": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "failed_checks": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    @classmethod
+    def from_config(cls, config: Any, credentials: Any, connect: Callable[..., Any], **options) -> "ConnectionPool":
+        """
+        Pool for a database addon, see configuration/examples/database_config.py.
+
+        Args:
+            config: Addon config with host, port and database fields
+            credentials: Credentials holding the db_user and db_password secrets
+            connect: Driver connect function, called with host, port, database, user and password
+            **options: ConnectionPool options
+
+        Returns:
+            ConnectionPool: Pool connecting with the addon's settings
+        """
+        params = {
+            "host": getattr(config, "host", None),
+            "port": getattr(config, "port", None),
+            "database": getattr(config, "database", None),
+            "user": credentials.get("db_user"),
+            "password": credentials.get("db_password"),
+        }
+        return cls(lambda: connect(**params), **options)
+
+    def open(self) -> "ConnectionPool":
+        """Create min_size connections up front."""
+        while True:
+            # one slot at a time, so a failed connect gives back only its own reservation
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return self
+                self._size += 1
+            self._release(self._create())
+
+    def _create(self) -> _PooledConnection:
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return _PooledConnection(connection, time.monotonic())
+
+    def _close(self, entries: list[_PooledConnection]) -> None:
+        for entry in entries:
+            try:
+                entry.connection.close()
+            except Exception as e:
+                logger.warning("Failed to close pooled connection: {}", e)
+        if entries:
+            with self._cond:
+                self._stats["closed"] += len(entries)
+
+    def _take_expired(self, now: float) -> list[_PooledConnection]:
+        # caller holds the lock, idle connections are ordered oldest use first
+        expired = []
+        keep = deque()
+        for entry in self._idle:
+            too_old = now - entry.created_at >= self.max_lifetime
+            too_idle = now - entry.last_used >= self.max_idle and self._size - len(expired) > self.min_size
+            if too_old or too_idle:
+                expired.append(entry)
+            else:
+                keep.append(entry)
+        if expired:
+            self._idle = keep
+            self._size -= len(expired)
+            self._cond.notify(len(expired))
+        return expired
+
+    def _acquire(self) -> _PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            entry = None
+            error = None
+            expired = []
+            with self._cond:
+                while True:
+                    if self._closed:
+                        error = PoolClosed("Connection pool is closed")
+                        break
+                    now = time.monotonic()
+                    expired += self._take_expired(now)
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        error = PoolTimeout(f"No connection available within {self.timeout}s")
+                        break
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+            self._close(expired)
+            if error is not None:
+                raise error
+
+            if entry is None:
+                entry = self._create()
+            elif now - entry.last_used >= self.check_interval:
+                try:
+                    self.check(entry.connection)
+                except Exception as e:
+                    logger.warning("Discarding pooled connection that failed its health check: {}", e)
+                    with self._cond:
+                        self._stats["failed_checks"] += 1
+                        self._size -= 1
+                        self._cond.notify()
+                    self._close([entry])
+                    continue
+
+            wait_ms = (time.monotonic() - start) * 1000
+            with self._cond:
+                self._stats["acquired"] += 1
+                self._stats["wait_ms_total"] += wait_ms
+                self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+            return entry
+
+    def _release(self, entry: _PooledConnection, discard: bool = False) -> None:
+        now = time.monotonic()
+        with self._cond:
+            if discard or self._closed or now - entry.created_at >= self.max_lifetime:
+                self._size -= 1
+                self._cond.notify()
+            else:
+                entry.last_used = now
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+        self._close([entry])
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of the block.
+
+        Raises:
+            PoolTimeout: If no connection frees up within timeout seconds
+            PoolClosed: If the pool has been closed
+        """
+        entry = self._acquire()
+        discard = False
+        try:
+            yield entry.connection
+        finally:
+            try:
+                entry.connection.rollback()
+            except Exception:
+                discard = True
+            self._release(entry, discard=discard)
+
+    def prune(self) -> int:
+        """Close idle and expired connections now instead of on the next checkout."""
+        with self._cond:
+            expired = self._take_expired(time.monotonic())
+        self._close(expired)
+        return len(expired)
+
+    def health_check(self) -> dict[str, Any]:
+        """Ping a pooled connection, for HealthChecker.add_check."""
+        with self.connection() as connection:
+            self.check(connection)
+        return self.metrics()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close(idle)
@@ -1,3 +1,10 @@
-from .base import ToolRegistry
+from ..utils.lazy import lazy_attributes
 
-__all__ = ["ToolRegistry"]
+__all__ = ["ToolRegistry", "SchemaCache", "schema_cache", "ToolExecutor"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "ToolRegistry": ".base",
+    "SchemaCache": ".cache",
+    "schema_cache": ".cache",
+    "ToolExecutor": ".executor",
+})
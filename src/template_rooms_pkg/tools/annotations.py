@@ -0,0 +1,164 @@
+import dataclasses
+import enum
+import inspect
+import types
+import typing
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Literal, Optional, Union
+
+_UnionType = getattr(types, "UnionType", None)  # X | Y, Python 3.10+
+
+_SCALARS = {str: "string", int: "integer", float: "number", bool: "boolean", type(None): "null"}
+_ARRAYS = {list: False, tuple: False, set: True, frozenset: True, Sequence: False, typing.Sequence: False}
+_OBJECTS = (dict, Mapping, typing.Mapping)
+
+
+class UnsupportedAnnotation(TypeError):
+    """The annotation has no native JSON schema, the pydantic path handles it."""
+
+
+def _json_value(value: Any) -> Any:
+    """value as JSON data, raises UnsupportedAnnotation if it has no JSON form."""
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {key: _json_value(item) for key, item in value.items()}
+    raise UnsupportedAnnotation(f"Default {value!r} is not JSON serializable")
+
+
+def _with_default(schema: dict[str, Any], default: Any) -> dict[str, Any]:
+    try:
+        return {**schema, "default": _json_value(default)}
+    except UnsupportedAnnotation:
+        # the parameter stays optional, its default is just not advertised
+        return schema
+
+
+def _enum_schema(values: list[Any]) -> dict[str, Any]:
+    values = [_json_value(value) for value in values]
+    types_ = {_SCALARS.get(type(value)) for value in values}
+    schema: dict[str, Any] = {"enum": values}
+    if len(types_) == 1 and None not in types_:
+        schema["type"] = types_.pop()
+    return schema
+
+
+def _object_schema(fields: list[tuple[str, Any, bool, Any]], seen: frozenset) -> dict[str, Any]:
+    # fields are (name, annotation, required, default or inspect.Parameter.empty)
+    properties = {}
+    required = []
+    for name, annotation, is_required, default in fields:
+        schema = annotation_schema(annotation, seen)
+        if is_required:
+            required.append(name)
+        elif default is not inspect.Parameter.empty:
+            schema = _with_default(schema, default)
+        properties[name] = schema
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def _dataclass_fields(cls: type) -> list[tuple[str, Any, bool, Any]]:
+    hints = typing.get_type_hints(cls, include_extras=True)
+    fields = []
+    for field in dataclasses.fields(cls):
+        if not field.init:
+            continue
+        if field.default is not dataclasses.MISSING:
+            fields.append((field.name, hints[field.name], False, field.default))
+        elif field.default_factory is not dataclasses.MISSING:
+            fields.append((field.name, hints[field.name], False, inspect.Parameter.empty))
+        else:
+            fields.append((field.name, hints[field.name], True, inspect.Parameter.empty))
+    return fields
+
+
+def _is_typeddict(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, dict) and hasattr(annotation, "__required_keys__")
+
+
+def annotation_schema(annotation: Any, seen: frozenset = frozenset()) -> dict[str, Any]:
+    """
+    JSON schema of a type annotation, without building a pydantic model.
+
+    Covers str, int, float, bool and None, Any, Optional and Union, list, tuple,
+    set and dict (with or without type arguments), Literal, Enum, TypedDict and
+    dataclasses. Enums, TypedDicts and dataclasses are inlined rather than put in
+    $defs. Raises UnsupportedAnnotation for anything else (pydantic models,
+    Annotated metadata, recursive types, ...).
+    """
+    if annotation is Any:
+        return {}
+    if annotation is None:
+        return {"type": "null"}
+    if isinstance(annotation, type) and annotation in _SCALARS:
+        return {"type": _SCALARS[annotation]}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is Union or (_UnionType is not None and origin is _UnionType):
+        return {"anyOf": [annotation_schema(arg, seen) for arg in args]}
+    if origin is Literal:
+        return _enum_schema(list(args))
+
+    container = origin if origin is not None else annotation
+    if container in _ARRAYS:
+        schema: dict[str, Any] = {"type": "array"}
+        if container is tuple and args and args[-1] is not Ellipsis:
+            items = [annotation_schema(arg, seen) for arg in args]
+            schema.update(prefixItems=items, minItems=len(items), maxItems=len(items))
+        elif args:
+            schema["items"] = annotation_schema(args[0], seen)
+        if _ARRAYS[container]:
+            schema["uniqueItems"] = True
+        return schema
+    if container in _OBJECTS:
+        if args and args[0] is not str:
+            raise UnsupportedAnnotation(f"Non-string mapping keys in {annotation!r}")
+        schema = {"type": "object"}
+        if args:
+            schema["additionalProperties"] = annotation_schema(args[1], seen)
+        return schema
+    if origin is not None:
+        raise UnsupportedAnnotation(f"Unsupported annotation {annotation!r}")
+
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return _enum_schema([member.value for member in annotation])
+    if annotation in seen:
+        raise UnsupportedAnnotation(f"Recursive annotation {annotation!r}")
+    if _is_typeddict(annotation):
+        hints = typing.get_type_hints(annotation, include_extras=True)
+        fields = [(name, hint, name in annotation.__required_keys__, inspect.Parameter.empty) for name, hint in hints.items()]
+        return _object_schema(fields, seen | {annotation})
+    if dataclasses.is_dataclass(annotation) and isinstance(annotation, type):
+        return _object_schema(_dataclass_fields(annotation), seen | {annotation})
+    raise UnsupportedAnnotation(f"Unsupported annotation {annotation!r}")
+
+
+def signature_schema(func: Callable) -> Optional[dict[str, Any]]:
+    """
+    JSON schema of a function's parameters, or None if any of them needs pydantic.
+
+    Every parameter must be annotated with a type annotation_schema supports;
+    parameters with a default are optional and advertise the default when it is
+    JSON serializable.
+    """
+    try:
+        signature = inspect.signature(func)
+        hints = typing.get_type_hints(func, include_extras=True)
+    except Exception:
+        return None
+
+    fields = []
+    for name, param in signature.parameters.items():
+        if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD) or name not in hints:
+            return None
+        fields.append((name, hints[name], param.default is inspect.Parameter.empty, param.default))
+    try:
+        return _object_schema(fields, frozenset())
+    except (UnsupportedAnnotation, TypeError, NameError):
+        return None
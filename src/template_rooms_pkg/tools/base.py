@@ -1,4 +1,38 @@
-from typing import Any, Callable
+import json
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .cache import schema_cache
+
+if TYPE_CHECKING:
+    from ..services.metrics import Metrics
+    from .executor import ToolExecutor
+    from .validation import ToolValidator
+
+
+def _generic_tool(definition: dict[str, Any]) -> dict[str, Any]:
+    return {"name": definition["name"], "description": definition["description"], "input_schema": definition["input_schema"]}
+
+
+def _openai_tool(definition: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": definition["name"],
+            "description": definition["description"],
+            "parameters": definition["input_schema"],
+        },
+    }
+
+
+# converts one tool definition (name, description, input_schema) to a provider's tool format
+tool_formats: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "generic": _generic_tool,
+    "openai": _openai_tool,
+    # the generic shape is Anthropic's tool format
+    "anthropic": _generic_tool,
+}
 
 
 class ToolRegistry:
@@ -6,6 +40,24 @@ class ToolRegistry:
         self.functions: dict[str, Callable] = {}
         self.tool_definitions: dict[str, dict[str, Any]] = {}
         self.tool_max_retries: dict[str, int] = {}
+        self._executor: Optional[ToolExecutor] = None
+        # argument validators, compiled on a tool's first call
+        self._validators: dict[str, ToolValidator] = {}
+        # invocations are recorded here as "tool.<name>" when set
+        self.metrics: Optional[Metrics] = None
+        # bumped by every change to the registered tools, see snapshot
+        self.generation = 0
+        self._snapshot: Optional[Mapping[str, dict[str, Any]]] = None
+        self._snapshot_generation = -1
+        # per format: (generation, payload, JSON bytes or None until requested)
+        self._formatted: dict[str, tuple[int, list[dict[str, Any]], Optional[bytes]]] = {}
+
+    @staticmethod
+    def _default_description(action_name: str) -> str:
+        if "::" in action_name:
+            addon_name = action_name.split("::")[0]
+            return f"Execute {action_name.split('::')[-1]} action from {addon_name} addon"
+        return f"Execute {action_name} action"
 
     def register_tools(self, tool_functions: dict[str, Callable], tool_descriptions: dict[str, str] = None, tool_max_retries: dict[str, int] = None):
         tool_descriptions = tool_descriptions or {}
@@ -15,11 +67,7 @@ class ToolRegistry:
             if action_name in tool_descriptions:
                 custom_description = tool_descriptions[action_name]
             else:
-                if "::" in action_name:
-                    addon_name = action_name.split("::")[0]
-                    custom_description = f"Execute {action_name.split('::')[-1]} action from {addon_name} addon"
-                else:
-                    custom_description = f"Execute {action_name} action"
+                custom_description = self._default_description(action_name)
 
             max_retry = tool_max_retries.get(action_name, 0)
             self.tool_max_retries[action_name] = max_retry
@@ -27,14 +75,36 @@ class ToolRegistry:
 
     def _register_single_tool(self, action_name: str, func: Callable, context: str):
         self.functions[action_name] = func
+        self._validators.pop(action_name, None)
+        self.generation += 1
 
+        # input_schema is built on first access, see get_tool_definition
         self.tool_definitions[action_name] = {
             "name": action_name,
             "description": context or f"Execute {action_name} action",
-            "input_schema": self._convert_annotations_to_schema(func)
         }
 
     def _convert_annotations_to_schema(self, func: Callable) -> dict[str, Any]:
+        key = schema_cache.make_key(func)
+        if key is not None:
+            schema = schema_cache.get(key)
+            if schema is not None:
+                return schema
+
+        schema = self._build_schema(func)
+        if key is not None:
+            schema_cache.put(key, schema)
+        return schema
+
+    def _build_schema(self, func: Callable) -> dict[str, Any]:
+        # simple signatures are compiled natively, without creating a pydantic model
+        from .annotations import signature_schema
+        schema = signature_schema(func)
+        if schema is not None:
+            return schema
+        return self._build_pydantic_schema(func)
+
+    def _build_pydantic_schema(self, func: Callable) -> dict[str, Any]:
         try:
             import inspect
 
@@ -73,6 +143,9 @@ class ToolRegistry:
             return self._basic_type_converter(func)
 
     def _basic_type_converter(self, func: Callable) -> dict[str, Any]:
+        import inspect
+
+        from .annotations import annotation_schema
 
         if not hasattr(func, '__annotations__'):
             return {"type": "object", "properties": {}, "required": []}
@@ -83,40 +156,246 @@ class ToolRegistry:
             "properties": {},
             "required": []
         }
+        try:
+            parameters = inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            parameters = {}
 
         for param_name, param_type in annotations.items():
             if param_name == 'return':
                 continue
 
-            if param_type is str:
-                schema["properties"][param_name] = {"type": "string"}
-            elif param_type is int:
-                schema["properties"][param_name] = {"type": "integer"}
-            elif param_type is float:
-                schema["properties"][param_name] = {"type": "number"}
-            elif param_type is bool:
-                schema["properties"][param_name] = {"type": "boolean"}
-            elif param_type is dict or str(param_type) == "<class 'dict'>":
-                schema["properties"][param_name] = {"type": "object"}
-            else:
+            try:
+                schema["properties"][param_name] = annotation_schema(param_type)
+            except Exception:
                 from loguru import logger
                 logger.warning(f"Unknown type '{param_type}' for parameter '{param_name}' in function '{func.__name__}', defaulting to string")
                 schema["properties"][param_name] = {"type": "string"}
 
-            schema["required"].append(param_name)
+            param = parameters.get(param_name)
+            if param is None or param.default is inspect.Parameter.empty:
+                schema["required"].append(param_name)
 
         return schema
 
-    def get_tools_for_action(self) -> dict[str, Any]:
-        return self.tool_definitions.copy()
+    def get_tool_definition(self, action_name: str) -> Optional[dict[str, Any]]:
+        definition = self.tool_definitions.get(action_name)
+        if definition is not None and "input_schema" not in definition:
+            definition["input_schema"] = self._convert_annotations_to_schema(self.functions[action_name])
+        return definition
+
+    def get_tools_for_action(self, action_names: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        if action_names is None:
+            return dict(self.snapshot())
+        tools = {}
+        for action_name in action_names:
+            definition = self.get_tool_definition(action_name)
+            if definition is not None:
+                tools[action_name] = definition
+        return tools
+
+    def snapshot(self) -> Mapping[str, dict[str, Any]]:
+        """
+        Read-only view of all tool definitions, with their input schemas built.
+
+        The view is rebuilt only when the generation has changed since the last
+        call, so handing it out per request costs nothing. Definitions are shared
+        with the registry and must not be mutated.
+        """
+        if self._snapshot_generation != self.generation:
+            generation = self.generation
+            definitions = {name: self.get_tool_definition(name) for name in self.tool_definitions}
+            self._snapshot = MappingProxyType(definitions)
+            self._snapshot_generation = generation
+        return self._snapshot
+
+    def format_tools(self, tool_format: str = "generic", action_names: Optional[Iterable[str]] = None) -> list[dict[str, Any]]:
+        """
+        Tool definitions in a provider's function-calling format.
+
+        Formats are "generic", "openai" and "anthropic", more can be added to
+        tool_formats. The payload for all tools is built once per format and
+        generation, and shared: do not mutate it. A subset of action_names is
+        formatted on each call.
+
+        Args:
+            tool_format: Name of the format in tool_formats
+            action_names: Tools to include, all tools if None
+
+        Returns:
+            list[dict]: One entry per tool, ready to send as the request's tools
+        """
+        adapter = tool_formats.get(tool_format)
+        if adapter is None:
+            raise ValueError(f"Unknown tool format: {tool_format}")
+        if action_names is not None:
+            definitions = (self.get_tool_definition(name) for name in action_names)
+            return [adapter(definition) for definition in definitions if definition is not None]
+        return self._formatted_tools(tool_format, adapter)[1]
+
+    def format_tools_json(self, tool_format: str = "generic") -> bytes:
+        """format_tools for all tools serialized to compact JSON, built once per format and generation."""
+        adapter = tool_formats.get(tool_format)
+        if adapter is None:
+            raise ValueError(f"Unknown tool format: {tool_format}")
+        generation, payload, encoded = self._formatted_tools(tool_format, adapter)
+        if encoded is None:
+            encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+            self._formatted[tool_format] = (generation, payload, encoded)
+        return encoded
+
+    def _formatted_tools(self, tool_format: str, adapter: Callable) -> tuple[int, list[dict[str, Any]], Optional[bytes]]:
+        cached = self._formatted.get(tool_format)
+        if cached is not None and cached[0] == self.generation:
+            return cached
+        generation = self.generation
+        cached = self._formatted[tool_format] = (generation, [adapter(definition) for definition in self.snapshot().values()], None)
+        return cached
+
+    def add_tool(self, action_name: str, func: Callable, description: Optional[str] = None, max_retries: int = 0) -> None:
+        """Register a new tool, raises ValueError if the name is taken."""
+        if action_name in self.functions:
+            raise ValueError(f"Tool already registered: {action_name}")
+        self.tool_max_retries[action_name] = max_retries
+        self._register_single_tool(action_name, func, description or self._default_description(action_name))
+
+    def replace_tool(self, action_name: str, func: Callable, description: Optional[str] = None, max_retries: Optional[int] = None) -> None:
+        """
+        Replace a registered tool, raises ValueError if it is unknown.
+
+        The description and max retries are kept unless given.
+        """
+        if action_name not in self.functions:
+            raise ValueError(f"Unknown tool: {action_name}")
+        if max_retries is not None:
+            self.tool_max_retries[action_name] = max_retries
+        self._register_single_tool(action_name, func, description or self.tool_definitions[action_name]["description"])
+
+    def remove_tool(self, action_name: str) -> bool:
+        if action_name not in self.functions:
+            return False
+        del self.functions[action_name]
+        del self.tool_definitions[action_name]
+        self.tool_max_retries.pop(action_name, None)
+        self._validators.pop(action_name, None)
+        self.generation += 1
+        return True
+
+    def diff(self, tool_functions: dict[str, Callable], tool_descriptions: dict[str, str] = None, tool_max_retries: dict[str, int] = None) -> dict[str, list[str]]:
+        """
+        Changes needed to go from the registered tools to the given tool set.
+
+        A tool is changed when its function, description or max retries differ,
+        with the same defaults as register_tools.
+
+        Returns:
+            dict: "added", "removed" and "changed" tool names
+        """
+        tool_descriptions = tool_descriptions or {}
+        tool_max_retries = tool_max_retries or {}
+        added, changed = [], []
+        for action_name, func in tool_functions.items():
+            if action_name not in self.functions:
+                added.append(action_name)
+                continue
+            description = tool_descriptions.get(action_name) or self._default_description(action_name)
+            if (
+                self.functions[action_name] is not func
+                or self.tool_definitions[action_name]["description"] != description
+                or self.tool_max_retries.get(action_name, 0) != tool_max_retries.get(action_name, 0)
+            ):
+                changed.append(action_name)
+        removed = [action_name for action_name in self.functions if action_name not in tool_functions]
+        return {"added": added, "removed": removed, "changed": changed}
+
+    def sync(self, tool_functions: dict[str, Callable], tool_descriptions: dict[str, str] = None, tool_max_retries: dict[str, int] = None) -> dict[str, list[str]]:
+        """
+        Make the registered tools match the given tool set, touching only the tools that differ.
+
+        Unchanged tools keep their built schemas and validators, and the generation
+        only moves when something changed.
+
+        Returns:
+            dict: The applied diff, see diff
+        """
+        changes = self.diff(tool_functions, tool_descriptions, tool_max_retries)
+        for action_name in changes["removed"]:
+            self.remove_tool(action_name)
+        updates = {action_name: tool_functions[action_name] for action_name in changes["added"] + changes["changed"]}
+        if updates:
+            self.register_tools(updates, tool_descriptions, tool_max_retries)
+        return changes
+
+    def get_tool_names(self) -> list[str]:
+        return list(self.tool_definitions.keys())
 
     def get_function(self, action_name: str) -> Callable:
         return self.functions.get(action_name)
 
+    def call(self, action_name: str, arguments: Optional[dict[str, Any]] = None) -> Any:
+        """
+        Validate tool call arguments, e.g. from an LLM, and call the tool.
+
+        Arguments are coerced and validated against the tool's signature by a
+        pydantic validator compiled on the tool's first call and reused after,
+        so registering tools stays cheap and each call pays one dict lookup plus
+        the validation itself. Timings are reported by get_call_stats.
+
+        Args:
+            action_name: Registered tool name
+            arguments: Tool arguments by parameter name
+
+        Returns:
+            Any: The tool's return value, a coroutine for async tools
+
+        Raises:
+            ValueError: Unknown tool
+            pydantic.ValidationError: Invalid arguments
+        """
+        validator = self._validators.get(action_name)
+        if validator is None:
+            validator = self._compile_validator(action_name)
+        return validator.call(arguments, self.metrics, f"tool.{action_name}")
+
+    def _compile_validator(self, action_name: str) -> "ToolValidator":
+        from .validation import ToolValidator
+        func = self.functions.get(action_name)
+        if func is None:
+            raise ValueError(f"Unknown tool: {action_name}")
+        validator = self._validators[action_name] = ToolValidator(func)
+        return validator
+
+    def get_call_stats(self) -> dict[str, dict[str, Any]]:
+        """Call counts, errors and mean validation and run times of tools called through call."""
+        return {name: validator.stats() for name, validator in self._validators.items()}
+
     def get_max_retries(self, action_name: str) -> int:
         return self.tool_max_retries.get(action_name, 0)
 
+    @property
+    def executor(self) -> "ToolExecutor":
+        # asyncio is only imported once a host actually invokes tools
+        from .executor import ToolExecutor
+        if self._executor is None:
+            self._executor = ToolExecutor(self)
+        return self._executor
+
+    def configure_executor(self, **options) -> "ToolExecutor":
+        from .executor import ToolExecutor
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ToolExecutor(self, **options)
+        return self._executor
+
+    async def invoke(self, action_name: str, arguments: Optional[dict[str, Any]] = None) -> Any:
+        return await self.executor.invoke(action_name, arguments)
+
+    async def invoke_many(self, calls: Iterable[tuple[str, Optional[dict[str, Any]]]], return_exceptions: bool = False) -> list[Any]:
+        return await self.executor.invoke_many(calls, return_exceptions=return_exceptions)
+
     def clear(self):
         self.functions.clear()
         self.tool_definitions.clear()
         self.tool_max_retries.clear()
+        self._validators.clear()
+        self.generation += 1
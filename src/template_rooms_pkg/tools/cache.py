@@ -0,0 +1,83 @@
+import copy
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class SchemaCache:
+    """Process-wide LRU cache of generated tool input schemas.
+
+    Entries are keyed by the function identity (module + qualified name) and a
+    fingerprint of its signature, so re-registering a known tool skips schema
+    generation entirely. The cache keeps its own copy of each schema and hands
+    out deep copies, so registries may mutate the schemas they get.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(func: Callable) -> Optional[tuple]:
+        try:
+            sig = inspect.signature(func)
+        except (TypeError, ValueError):
+            return None
+
+        fingerprint = tuple(
+            (name, param.kind, _hashable(param.annotation), type(param.default), _hashable(param.default))
+            for name, param in sig.parameters.items()
+        )
+        identity = (getattr(func, "__module__", None), getattr(func, "__qualname__", repr(func)))
+        return identity + (fingerprint,)
+
+    def get(self, key: tuple) -> Optional[dict[str, Any]]:
+        with self._lock:
+            schema = self._entries.get(key)
+            if schema is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(schema)
+
+    def put(self, key: tuple, schema: dict[str, Any]) -> None:
+        schema = copy.deepcopy(schema)
+        with self._lock:
+            self._entries[key] = schema
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+schema_cache = SchemaCache()
@@ -0,0 +1,133 @@
+import asyncio
+import functools
+import inspect
+import random
+import threading
+import time
+import weakref
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from loguru import logger
+
+
+class ToolExecutor:
+    """Runs registered tools on asyncio with retries and concurrency caps.
+
+    Coroutine tools are awaited natively, sync tools run in a bounded thread
+    pool. Failed calls are retried up to the registry's max retries for the
+    tool, with exponential backoff and jitter. When the registry has metrics,
+    each invocation is recorded as "tool.<name>", including its retries.
+    """
+
+    def __init__(
+        self,
+        registry,
+        max_workers: int = 8,
+        max_concurrency: int = 16,
+        per_tool_concurrency: int = 4,
+        tool_concurrency: Optional[dict[str, int]] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+    ):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.per_tool_concurrency = per_tool_concurrency
+        self.tool_concurrency = tool_concurrency or {}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # asyncio semaphores are bound to one loop, each loop gets its own
+        # (global limit, per-tool limits). A used semaphore references its loop,
+        # so entries of closed loops are also pruned when a new loop shows up
+        self._limits: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[asyncio.Semaphore, dict[str, asyncio.Semaphore]]
+        ] = weakref.WeakKeyDictionary()
+        self._limits_lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+        return self._pool
+
+    def _get_limits(self, action_name: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            with self._limits_lock:
+                limits = self._limits.get(loop)
+                if limits is None:
+                    for closed in [other for other in self._limits if other.is_closed()]:
+                        del self._limits[closed]
+                    limits = self._limits[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        global_limit, tool_limits = limits
+
+        # only this loop's thread touches its per-tool limits
+        tool_limit = tool_limits.get(action_name)
+        if tool_limit is None:
+            limit = self.tool_concurrency.get(action_name, self.per_tool_concurrency)
+            tool_limit = tool_limits[action_name] = asyncio.Semaphore(limit)
+        return global_limit, tool_limit
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    async def _run(self, func, arguments: dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(func):
+            return await func(**arguments)
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._get_pool(), functools.partial(func, **arguments))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def invoke(self, action_name: str, arguments: Optional[dict[str, Any]] = None) -> Any:
+        func = self.registry.get_function(action_name)
+        if func is None:
+            raise ValueError(f"Unknown tool: {action_name}")
+
+        arguments = arguments or {}
+        max_retries = self.registry.get_max_retries(action_name)
+        global_limit, tool_limit = self._get_limits(action_name)
+
+        metrics = self.registry.metrics
+        metric_name = f"tool.{action_name}"
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                async with tool_limit, global_limit:
+                    result = await self._run(func, arguments)
+                if metrics is not None:
+                    metrics.record(metric_name, (time.perf_counter() - start) * 1000)
+                return result
+            except Exception as e:
+                if attempt >= max_retries:
+                    if metrics is not None:
+                        metrics.record(metric_name, (time.perf_counter() - start) * 1000, error=True)
+                    raise
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                if metrics is not None:
+                    metrics.record_retry(metric_name)
+                logger.warning(f"Tool '{action_name}' failed ({e}), retry {attempt}/{max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def invoke_many(
+        self,
+        calls: Iterable[tuple[str, Optional[dict[str, Any]]]],
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        return await asyncio.gather(
+            *(self.invoke(action_name, arguments) for action_name, arguments in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
@@ -0,0 +1,126 @@
+import inspect
+import time
+from typing import Any, Callable, Optional
+
+from loguru import logger
+from pydantic import ConfigDict, Field, create_model
+
+
+class ToolValidator:
+    """
+    Argument validator compiled once from a tool's signature.
+
+    Arguments are validated and coerced by a pydantic model built from the
+    annotations and defaults, unknown arguments are rejected unless the tool
+    takes **kwargs. If no model can be built for the signature, arguments are
+    passed through unvalidated. Also keeps the tool's call counters and timings,
+    which are plain attribute updates and may undercount under concurrent calls.
+    """
+
+    def __init__(self, func: Callable):
+        self.func = func
+        self.calls = 0
+        self.errors = 0
+        self.validation_errors = 0
+        self.validate_ns = 0
+        self.run_ns = 0
+
+        start = time.perf_counter_ns()
+        self._validator = None
+        self._positional: list[str] = []
+        self._names: dict[str, str] = {}
+        try:
+            self._validator = self._compile(func)
+        except Exception as e:
+            logger.warning("Argument validation disabled for tool '{}': {}", getattr(func, "__name__", func), e)
+        self.compile_ns = time.perf_counter_ns() - start
+
+    def _compile(self, func: Callable):
+        # fields get internal names and take the parameter name as alias, pydantic
+        # would treat _private parameters as private attributes and model_config,
+        # model_fields, ... as reserved
+        fields = {}
+        extra = "forbid"
+        for name, param in inspect.signature(func).parameters.items():
+            if param.kind is inspect.Parameter.VAR_POSITIONAL:
+                continue
+            if param.kind is inspect.Parameter.VAR_KEYWORD:
+                extra = "allow"
+                continue
+            if param.kind is inspect.Parameter.POSITIONAL_ONLY:
+                self._positional.append(name)
+            annotation = Any if param.annotation is inspect.Parameter.empty else param.annotation
+            default = ... if param.default is inspect.Parameter.empty else param.default
+            field_name = f"field_{len(fields)}"
+            self._names[field_name] = name
+            fields[field_name] = (annotation, Field(default, alias=name))
+        model = create_model("ToolArguments", __config__=ConfigDict(extra=extra, arbitrary_types_allowed=True), **fields)
+        return model.__pydantic_validator__
+
+    def validate(self, arguments: dict[str, Any]) -> tuple[list[Any], dict[str, Any]]:
+        """Positional and keyword arguments to call the tool with, raises pydantic.ValidationError."""
+        if self._validator is None:
+            return [], dict(arguments)
+        instance = self._validator.validate_python(arguments)
+        kwargs = {self._names[field_name]: value for field_name, value in instance.__dict__.items()}
+        if instance.__pydantic_extra__:
+            kwargs.update(instance.__pydantic_extra__)
+        args = [kwargs.pop(name) for name in self._positional]
+        return args, kwargs
+
+    def call(self, arguments: Optional[dict[str, Any]], metrics: Any = None, metric_name: str = "") -> Any:
+        """
+        Validate the arguments, call the tool and record the timings.
+
+        For async tools the result is a coroutine wrapping the tool's, which
+        records the timings and errors when it completes.
+        """
+        start = time.perf_counter_ns()
+        try:
+            args, kwargs = self.validate(arguments or {})
+        except Exception:
+            self.validation_errors += 1
+            self.validate_ns += time.perf_counter_ns() - start
+            raise
+        validated = time.perf_counter_ns()
+        self.validate_ns += validated - start
+        self.calls += 1
+
+        try:
+            result = self.func(*args, **kwargs)
+        except Exception:
+            self._finish(start, validated, True, metrics, metric_name)
+            raise
+        if inspect.isawaitable(result):
+            # async tools are timed once the returned coroutine is awaited
+            return self._await(result, start, validated, metrics, metric_name)
+        self._finish(start, validated, False, metrics, metric_name)
+        return result
+
+    async def _await(self, awaitable: Any, start: int, validated: int, metrics: Any, metric_name: str) -> Any:
+        try:
+            result = await awaitable
+        except Exception:
+            self._finish(start, validated, True, metrics, metric_name)
+            raise
+        self._finish(start, validated, False, metrics, metric_name)
+        return result
+
+    def _finish(self, start: int, validated: int, error: bool, metrics: Any, metric_name: str) -> None:
+        end = time.perf_counter_ns()
+        self.run_ns += end - validated
+        if error:
+            self.errors += 1
+        if metrics is not None:
+            metrics.record(metric_name, (end - start) / 1e6, error=error)
+
+    def stats(self) -> dict[str, Any]:
+        validated = self.calls + self.validation_errors
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "validation_errors": self.validation_errors,
+            "compile_us": round(self.compile_ns / 1000, 3),
+            "mean_validate_us": round(self.validate_ns / validated / 1000, 3) if validated else None,
+            "mean_run_us": round(self.run_ns / self.calls / 1000, 3) if self.calls else None,
+        }
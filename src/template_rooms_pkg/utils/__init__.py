@@ -1,3 +1,8 @@
-from .example import demo_util
+from .lazy import lazy_attributes
 
-__all__ = ["demo_util"]
+__all__ = ["demo_util", "SingleFlight", "lazy_attributes"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "demo_util": ".example",
+    "SingleFlight": ".singleflight",
+})
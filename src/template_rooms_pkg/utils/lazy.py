@@ -0,0 +1,28 @@
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def lazy_attributes(package: str, attributes: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list]]:
+    """
+    Build PEP 562 module __getattr__ and __dir__ hooks for a package.
+
+    Each public name is imported from its submodule on first access and then bound
+    on the package, so later lookups are plain attribute reads.
+
+    Args:
+        package: Package __name__
+        attributes: Mapping of public name to the relative submodule defining it
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,41 @@
+import threading
+from collections.abc import Hashable
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key into a single execution.
+
+    The first caller for a key runs the function, callers arriving while it is
+    in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
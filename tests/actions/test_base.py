@@ -0,0 +1,103 @@
+import pytest
+from pydantic import ValidationError
+
+from template_rooms_pkg.actions import base
+from template_rooms_pkg.actions.base import (
+    ActionResponse,
+    TokensSchema,
+    build_model,
+    build_response,
+    is_strict_validation,
+    set_strict_validation,
+)
+from template_rooms_pkg.actions.example import ActionOutput
+
+
+class TestTrustedConstruction:
+    def setup_method(self):
+        self._previous = is_strict_validation()
+        set_strict_validation(False)
+
+    def teardown_method(self):
+        set_strict_validation(self._previous)
+
+    def test_build_response(self):
+        output = ActionOutput(data={"key": "value"})
+
+        response = build_response(output, step_amount=10, total_amount=100, message="ok", code=200)
+
+        assert isinstance(response, ActionResponse)
+        assert response.output is output
+        assert response.tokens == TokensSchema(stepAmount=10, totalCurrentAmount=100)
+        assert response.message == "ok"
+        assert response.code == 200
+
+    def test_build_response_defaults(self):
+        response = build_response(ActionOutput(), step_amount=0, total_amount=0)
+
+        assert response.message is None
+        assert response.code is None
+
+    def test_build_model_skips_validation(self):
+        tokens = build_model(TokensSchema, stepAmount="not validated", totalCurrentAmount=1)
+
+        assert tokens.stepAmount == "not validated"
+
+    def test_build_model_fills_defaults(self):
+        tokens = TokensSchema(stepAmount=1, totalCurrentAmount=2)
+
+        response = build_model(ActionResponse, output=ActionOutput(), tokens=tokens)
+
+        assert response.message is None
+        assert response.code is None
+        assert response.model_fields_set == {"output", "tokens"}
+        assert list(response.model_dump().keys()) == ["output", "tokens", "message", "code"]
+
+    def test_build_model_copies_mutable_defaults(self):
+        from pydantic import BaseModel
+
+        class Items(BaseModel):
+            n: int
+            items: list = []
+
+        build_model(Items, n=1).items.append(1)
+
+        assert build_model(Items, n=2).items == []
+        assert Items(n=3).items == []
+
+    def test_build_model_rejects_missing_required_fields(self):
+        with pytest.raises(TypeError, match="missing required fields: totalCurrentAmount"):
+            build_model(TokensSchema, stepAmount=1)
+
+    @pytest.mark.parametrize("model_cls, fields", [
+        (TokensSchema, {"stepAmount": 1, "totalAmount": 2}),
+        (ActionOutput, {"datta": {}}),
+    ])
+    def test_build_model_rejects_unknown_fields(self, model_cls, fields):
+        with pytest.raises(TypeError, match="unexpected fields"):
+            build_model(model_cls, **fields)
+
+    def test_strict_validation_validates(self):
+        set_strict_validation(True)
+
+        with pytest.raises(ValidationError):
+            build_model(TokensSchema, stepAmount="not validated", totalCurrentAmount=1)
+        with pytest.raises(ValidationError):
+            build_response(ActionOutput(), step_amount="x", total_amount=1)
+
+    def test_strict_validation_flag(self):
+        set_strict_validation(True)
+        assert is_strict_validation() is True
+        assert base._strict_validation is True
+
+        set_strict_validation(False)
+        assert is_strict_validation() is False
+
+    def test_trusted_response_serializes_like_validated(self):
+        output = ActionOutput(data={"processed": "x"})
+        validated = ActionResponse(output=output, tokens=TokensSchema(stepAmount=1, totalCurrentAmount=2),
+                                   message="ok", code=200)
+
+        trusted = build_response(output, step_amount=1, total_amount=2, message="ok", code=200)
+
+        assert trusted.model_dump() == validated.model_dump()
@@ -0,0 +1,79 @@
+import pytest
+from pydantic import ValidationError
+
+from template_rooms_pkg.actions.base import ActionResponse
+from template_rooms_pkg.actions.batch import run_batch, validate_inputs
+from template_rooms_pkg.actions.example import ActionInput, example
+
+
+class TestRunBatch:
+    def test_validate_inputs_accepts_dicts_and_models(self):
+        inputs = [{"param1": "a", "param2": "b"}, ActionInput(param1="c", param2="d")]
+
+        result = validate_inputs(ActionInput, inputs)
+
+        assert all(isinstance(item, ActionInput) for item in result)
+        assert [item.param1 for item in result] == ["a", "c"]
+
+    def test_validation_error_raised_before_execution(self):
+        calls = []
+
+        def action(config, param1, param2):
+            calls.append(param1)
+
+        with pytest.raises(ValidationError):
+            run_batch(action, None, [{"param1": "a", "param2": "b"}, {"param1": "c"}], input_model=ActionInput)
+
+        assert calls == []
+
+    def test_run_batch_inline(self):
+        inputs = [{"param1": f"item{i}", "param2": "x"} for i in range(5)]
+
+        results = list(run_batch(example, None, inputs, input_model=ActionInput))
+
+        assert all(isinstance(result, ActionResponse) for result in results)
+        assert [r.output.data["processed"] for r in results] == [f"item{i}- processed -" for i in range(5)]
+
+    def test_run_batch_is_lazy(self):
+        calls = []
+
+        def action(config, param1, param2):
+            calls.append(param1)
+            return param1
+
+        results = run_batch(action, None, [{"param1": "a", "param2": "b"}, {"param1": "c", "param2": "d"}])
+
+        assert calls == []
+        assert next(results) == "a"
+        assert calls == ["a"]
+
+    def test_run_batch_passes_config_once(self):
+        config = {"shared": True}
+        seen = []
+
+        def action(cfg, param1, param2):
+            seen.append(cfg)
+            return param1
+
+        list(run_batch(action, config, [{"param1": "a", "param2": "b"}] * 3))
+
+        assert all(cfg is config for cfg in seen)
+
+    def test_run_batch_thread_pool_keeps_order(self):
+        inputs = [{"param1": str(i), "param2": "x"} for i in range(20)]
+
+        results = list(run_batch(example, None, inputs, input_model=ActionInput, executor="thread", max_workers=4))
+
+        assert [r.output.data["processed"] for r in results] == [f"{i}- processed -" for i in range(20)]
+
+    def test_run_batch_process_pool(self):
+        inputs = [{"param1": str(i), "param2": "x"} for i in range(4)]
+
+        results = list(run_batch(example, None, inputs, input_model=ActionInput, executor="process",
+                                 max_workers=2, chunksize=2))
+
+        assert [r.output.data["processed"] for r in results] == [f"{i}- processed -" for i in range(4)]
+
+    def test_run_batch_unknown_executor(self):
+        with pytest.raises(ValueError, match="Unknown executor"):
+            run_batch(example, None, [], executor="gpu")
@@ -0,0 +1,205 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+from pydantic import BaseModel
+
+from template_rooms_pkg.actions.base import OutputBase, build_response
+from template_rooms_pkg.actions.cache import ResponseCache, cached_action
+from template_rooms_pkg.storage.diskcache import DiskCache
+
+
+class ActionInput(BaseModel):
+    text: str
+    count: int = 1
+
+
+class ActionOutput(OutputBase):
+    value: str
+
+
+def make_action(cache, ttl=None):
+    calls = []
+
+    @cached_action(ActionInput, ttl=ttl, cache=cache)
+    def repeat(config, text: str, count: int = 1):
+        calls.append((text, count))
+        return build_response(ActionOutput(value=text * count), step_amount=1, total_amount=1)
+
+    return repeat, calls
+
+
+class TestResponseCache:
+    def test_repeat_call_skips_execution(self):
+        action, calls = make_action(ResponseCache())
+
+        first = action({}, text="a", count=2)
+        second = action({}, text="a", count=2)
+
+        assert first == second
+        assert calls == [("a", 2)]
+
+    def test_hits_do_not_share_mutable_state(self):
+        action, calls = make_action(ResponseCache())
+
+        first = action({}, text="a")
+        first.output.value = "changed"
+        second = action({}, text="a")
+        second.output.value = "changed again"
+
+        assert action({}, text="a").output.value == "a"
+        assert calls == [("a", 1)]
+
+    def test_key_uses_validated_input(self):
+        action, calls = make_action(ResponseCache())
+
+        action({}, text="a")
+        action({}, text="a", count=1)
+        action({}, "a", count="1")
+
+        assert len(calls) == 1
+
+    def test_different_inputs_and_configs(self):
+        action, calls = make_action(ResponseCache())
+
+        action({"id": "one"}, text="a")
+        action({"id": "two"}, text="a")
+        action({"id": "one"}, text="b")
+
+        assert len(calls) == 3
+
+    def test_ttl_expiry(self):
+        action, calls = make_action(ResponseCache(), ttl=0)
+
+        action({}, text="a")
+        action({}, text="a")
+
+        assert len(calls) == 2
+
+    def test_lru_eviction(self):
+        action, calls = make_action(ResponseCache(maxsize=2))
+
+        for text in ["a", "b", "c", "a"]:
+            action({}, text=text)
+
+        assert [text for text, _ in calls] == ["a", "b", "c", "a"]
+
+    def test_stats(self):
+        cache = ResponseCache()
+        action, _ = make_action(cache)
+
+        action({}, text="a")
+        action({}, text="a")
+        action({}, text="a")
+
+        stats = action.cache_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+        assert cache.stats()["size"] == 1
+
+    def test_cache_lookup_reports_hit(self):
+        action, _ = make_action(ResponseCache())
+
+        assert action.cache_lookup({}, text="a")[1] is False
+        assert action.cache_lookup({}, text="a")[1] is True
+
+    def test_invalid_input_raises_before_execution(self):
+        action, calls = make_action(ResponseCache())
+
+        with pytest.raises(ValueError):
+            action({}, text="a", count="many")
+        assert calls == []
+
+    def test_disk_tier(self, tmp_path):
+        action, calls = make_action(ResponseCache(disk=DiskCache(tmp_path)))
+        action({}, text="a")
+
+        # a fresh memory tier, e.g. after a restart, is filled from disk
+        other_action, other_calls = make_action(ResponseCache(disk=DiskCache(tmp_path)))
+        response = other_action({}, text="a")
+
+        assert response.output.value == "a"
+        assert other_calls == []
+        assert other_action.cache_stats()["disk_hits"] == 1
+
+    def test_disk_hit_keeps_remaining_ttl(self, tmp_path):
+        cache = ResponseCache(disk=DiskCache(tmp_path))
+        action, calls = make_action(cache, ttl=0.2)
+        action({}, text="a")
+        cache._entries.clear()
+
+        action({}, text="a")
+        time.sleep(0.25)
+        action({}, text="a")
+
+        assert calls == [("a", 1), ("a", 1)]
+
+    def test_clear(self, tmp_path):
+        cache = ResponseCache(disk=DiskCache(tmp_path))
+        action, calls = make_action(cache)
+        action({}, text="a")
+
+        cache.clear()
+        action({}, text="a")
+
+        assert len(calls) == 2
+
+
+class TestDiskCache:
+    def test_put_get(self, tmp_path):
+        disk = DiskCache(tmp_path)
+
+        disk.put("abcdef", {"value": 1})
+
+        assert disk.get("abcdef") == {"value": 1}
+        assert disk.get("missing", None) is None
+        assert len(disk) == 1
+
+    def test_expiry(self, tmp_path):
+        disk = DiskCache(tmp_path, ttl=0)
+
+        disk.put("abcdef", 1)
+
+        assert disk.get("abcdef", None) is None
+        assert len(disk) == 0
+
+    def test_corrupt_entry_dropped(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        disk.put("abcdef", 1)
+        disk._path("abcdef").write_bytes(b"not a pickle")
+
+        assert disk.get("abcdef", None) is None
+        assert len(disk) == 0
+
+
+class TestAddonCacheReporting:
+    def test_observer_receives_hit_rate(self):
+        from template_rooms_pkg.addon import TemplateRoomsAddon
+
+        action, calls = make_action(ResponseCache())
+        addon = TemplateRoomsAddon()
+        observer = Mock()
+        addon.setObserverCallback(observer, "cache_addon")
+
+        addon._runAction(action, text="a")
+        addon._runAction(action, text="a")
+
+        events = [call.args[0] for call in observer.call_args_list if call.args[0]["event"] == "action_cache"]
+        assert [event["data"]["hit"] for event in events] == [False, True]
+        assert events[-1]["data"]["hit_rate"] == 0.5
+        assert events[-1]["data"]["action"] == action.cache_name
+        assert calls == [("a", 1)]
+
+    def test_hits_record_no_tokens(self):
+        from template_rooms_pkg.addon import TemplateRoomsAddon
+
+        action, _ = make_action(ResponseCache())
+        addon = TemplateRoomsAddon()
+
+        addon._runAction(action, text="a")
+        addon._runAction(action, text="a")
+
+        stats = addon.getMetrics()[action.__name__]
+        assert stats["calls"] == 2
+        assert stats["tokens"] == 1
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from template_rooms_pkg.actions.base import ActionChunk, ActionResponse, TokensSchema
+from template_rooms_pkg.actions.example import ActionOutput, example
+from template_rooms_pkg.actions.example_stream import example_stream
+from template_rooms_pkg.actions.stream import astream_action, stream_action
+
+
+async def collect(aiterator):
+    return [chunk async for chunk in aiterator]
+
+
+class TestStreamAction:
+    def test_example_stream_chunks(self):
+        chunks = list(stream_action(example_stream, None, param1="hello", param2="world"))
+
+        outputs = [c.output.data["chunk"] for c in chunks if c.output is not None]
+        assert outputs == ["hello", "- processed -", "world"]
+        assert [c.index for c in chunks] == list(range(len(chunks)))
+        assert chunks[-1].final is True
+        assert chunks[-1].tokens.totalCurrentAmount == 16236 + 1500
+
+    def test_output_chunks_carry_latest_tokens(self):
+        def action(config):
+            yield TokensSchema(stepAmount=1, totalCurrentAmount=1)
+            yield ActionOutput(data={"part": 1})
+
+        chunks = list(stream_action(action, None))
+
+        assert chunks[1].output.data == {"part": 1}
+        assert chunks[1].tokens.totalCurrentAmount == 1
+
+    def test_stream_is_incremental(self):
+        produced = []
+
+        def action(config):
+            for i in range(3):
+                produced.append(i)
+                yield ActionOutput(data={"i": i})
+
+        stream = stream_action(action, None)
+        next(stream)
+
+        assert produced == [0]
+
+    def test_plain_action_streams_single_final_chunk(self):
+        chunks = list(stream_action(example, None, param1="a", param2="b"))
+
+        assert len(chunks) == 1
+        assert chunks[0].final is True
+        assert chunks[0].code == 200
+        assert chunks[0].output.data["processed"] == "a- processed -"
+
+    def test_explicit_final_chunk_is_not_duplicated(self):
+        def action(config):
+            yield ActionOutput(data={"part": 1})
+            yield ActionChunk(index=0, message="done", code=201, final=True)
+
+        chunks = list(stream_action(action, None))
+
+        assert len(chunks) == 2
+        assert chunks[1].index == 1
+        assert chunks[1].code == 201
+
+    def test_invalid_chunk_type(self):
+        def action(config):
+            yield {"not": "a model"}
+
+        with pytest.raises(TypeError, match="must yield"):
+            list(stream_action(action, None))
+
+    def test_sync_stream_rejects_async_action(self):
+        async def action(config):
+            yield ActionOutput(data={})
+
+        with pytest.raises(TypeError, match="astream_action"):
+            list(stream_action(action, None))
+
+    def test_astream_sync_generator(self):
+        chunks = asyncio.run(collect(astream_action(example_stream, None, param1="a", param2="b")))
+
+        assert [c.output.data["chunk"] for c in chunks if c.output] == ["a", "- processed -", "b"]
+        assert chunks[-1].final is True
+
+    def test_astream_async_generator(self):
+        async def action(config, count: int):
+            for i in range(count):
+                await asyncio.sleep(0)
+                yield ActionOutput(data={"i": i})
+
+        chunks = asyncio.run(collect(astream_action(action, None, count=2)))
+
+        assert [c.output.data["i"] for c in chunks if c.output] == [0, 1]
+        assert chunks[-1].final is True
+
+    def test_astream_coroutine_action(self):
+        async def action(config):
+            return example(config, param1="x", param2="y")
+
+        chunks = asyncio.run(collect(astream_action(action, None)))
+
+        assert len(chunks) == 1
+        assert isinstance(chunks[0].output, ActionOutput)
+        assert not isinstance(chunks[0], ActionResponse)
@@ -0,0 +1,37 @@
+import os
+from types import SimpleNamespace
+
+from template_rooms_pkg.actions.base import build_model, build_response
+from template_rooms_pkg.actions.example import ActionOutput
+from template_rooms_pkg.actions.workers import ActionProcessPool, cpu_bound, is_cpu_bound
+from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+
+@cpu_bound
+def worker_info(config, value: str):
+    credentials = CredentialsRegistry().scoped(getattr(config, "id", None))
+    data = {"value": value, "pid": os.getpid(), "config_id": config.id, "api_key": credentials.get("api_key")}
+    return build_response(build_model(ActionOutput, data=data), step_amount=1, total_amount=1)
+
+
+class TestActionProcessPool:
+    def test_cpu_bound_marker(self):
+        assert is_cpu_bound(worker_info)
+        assert not is_cpu_bound(lambda config: None)
+
+    def test_workers_receive_config_and_credentials(self):
+        config = SimpleNamespace(id="worker_addon")
+
+        with ActionProcessPool(config, {"api_key": "secret"}, max_workers=2).warm() as pool:
+            response = pool.run(worker_info, value="a")
+
+        assert response.output.data["config_id"] == "worker_addon"
+        assert response.output.data["api_key"] == "secret"
+        assert response.output.data["pid"] != os.getpid()
+        assert response.tokens.stepAmount == 1
+
+    def test_map_keeps_order(self):
+        with ActionProcessPool(SimpleNamespace(id="worker_addon"), max_workers=2) as pool:
+            responses = list(pool.map(worker_info, [{"value": str(i)} for i in range(7)], chunksize=3))
+
+        assert [r.output.data["value"] for r in responses] == [str(i) for i in range(7)]
@@ -0,0 +1,140 @@
+import pytest
+
+from template_rooms_pkg.memory.store import MemoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemoryStore(tmp_path / "memory.log")
+    yield store
+    store.close()
+
+
+class TestMemoryStore:
+    def test_put_get(self, store):
+        store.put("room1", "greeting", {"text": "hello"})
+        store.put("room2", "greeting", {"text": "bonjour"})
+
+        assert store.get("room1", "greeting") == {"text": "hello"}
+        assert store.get("room2", "greeting") == {"text": "bonjour"}
+        assert store.get("room1", "missing", "default") == "default"
+        assert sorted(store.rooms()) == ["room1", "room2"]
+
+    def test_latest_write_wins(self, store):
+        store.put("room", "key", 1)
+        store.put("room", "key", 2)
+
+        assert store.get("room", "key") == 2
+        assert len(store) == 1
+
+    def test_delete(self, store):
+        store.put("room", "key", 1)
+
+        assert store.delete("room", "key") is True
+        assert store.delete("room", "key") is False
+        assert store.get("room", "key") is None
+        assert store.rooms() == []
+
+    def test_persists_across_reopen(self, tmp_path):
+        path = tmp_path / "memory.log"
+        with MemoryStore(path) as store:
+            store.put("room", "a", "first", embedding=[1.0, 0.0])
+            store.put("room", "b", "second")
+            store.delete("room", "b")
+
+        with MemoryStore(path) as store:
+            assert store.items("room") == [("a", "first")]
+            assert store.get_embedding("room", "a") == [1.0, 0.0]
+
+    def test_torn_tail_dropped(self, tmp_path):
+        path = tmp_path / "memory.log"
+        with MemoryStore(path) as store:
+            store.put("room", "a", "kept")
+            store.put("room", "b", "torn")
+        path.write_bytes(path.read_bytes()[:-3])
+
+        with MemoryStore(path) as store:
+            assert store.keys("room") == ["a"]
+            store.put("room", "c", "after recovery")
+
+        with MemoryStore(path) as store:
+            assert store.keys("room") == ["a", "c"]
+
+    def test_value_cache_bounded(self, tmp_path):
+        with MemoryStore(tmp_path / "memory.log", max_cache_bytes=200) as store:
+            for i in range(50):
+                store.put("room", f"key{i}", "x" * 20)
+            values = [store.get("room", f"key{i}") for i in range(50)]
+
+            assert values == ["x" * 20] * 50
+            assert store.stats()["cache_bytes"] <= 200
+            assert store.stats()["cache_evictions"] > 0
+
+    def test_max_entries_per_room(self, tmp_path):
+        with MemoryStore(tmp_path / "memory.log", max_entries_per_room=2) as store:
+            store.put("room", "a", 1)
+            store.put("room", "b", 2)
+            store.put("room", "a", 3)
+            store.put("room", "c", 4)
+
+            assert store.keys("room") == ["a", "c"]
+
+    def test_compact(self, tmp_path):
+        path = tmp_path / "memory.log"
+        with MemoryStore(path) as store:
+            for i in range(10):
+                store.put("room", "key", i, embedding=[float(i), 1.0])
+            store.put("room", "other", "value")
+            size_before = store.stats()["log_bytes"]
+
+            store.compact()
+
+            assert store.stats()["log_bytes"] < size_before
+            assert store.get("room", "key") == 9
+            assert store.get_embedding("room", "key") == [9.0, 1.0]
+            assert store.get("room", "other") == "value"
+
+
+class TestMemorySearch:
+    def test_search_orders_by_cosine_similarity(self, store):
+        np = pytest.importorskip("numpy")
+        store.put("room", "north", "n", embedding=[0.0, 1.0])
+        store.put("room", "east", "e", embedding=np.array([1.0, 0.0]))
+        store.put("room", "north_east", "ne", embedding=[1.0, 1.0])
+        store.put("other", "north", "n", embedding=[0.0, 1.0])
+
+        results = store.search("room", [0.1, 1.0], top_k=2)
+
+        assert [key for key, _ in results] == ["north", "north_east"]
+        assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+
+    def test_search_sees_new_entries(self, store):
+        pytest.importorskip("numpy")
+        store.put("room", "a", 1, embedding=[1.0, 0.0])
+        assert [key for key, _ in store.search("room", [0.0, 1.0])] == ["a"]
+
+        store.put("room", "b", 2, embedding=[0.0, 1.0])
+        store.delete("room", "a")
+
+        assert [key for key, _ in store.search("room", [0.0, 1.0])] == ["b"]
+
+    def test_search_skips_entries_without_matching_embedding(self, store):
+        pytest.importorskip("numpy")
+        store.put("room", "text_only", "no embedding")
+        store.put("room", "three_dims", 1, embedding=[1.0, 0.0, 0.0])
+
+        assert store.search("room", [1.0, 0.0]) == []
+        assert store.search("missing", [1.0, 0.0]) == []
+
+    def test_search_many_entries(self, store):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(2000, 16)).astype(np.float32)
+        for i, vector in enumerate(vectors):
+            store.put("room", f"key{i}", i, embedding=vector)
+
+        results = store.search("room", vectors[1234], top_k=3)
+
+        assert results[0][0] == "key1234"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(results) == 3
@@ -0,0 +1,121 @@
+import mmap
+
+import pytest
+
+from template_rooms_pkg.storage.backends import (
+    FilesystemBackend,
+    MemoryBackend,
+    SQLiteBackend,
+    open_storage,
+)
+
+
+@pytest.fixture(params=["memory", "filesystem", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend()
+    elif request.param == "filesystem":
+        backend = FilesystemBackend(tmp_path / "blobs")
+    else:
+        backend = SQLiteBackend(tmp_path / "blobs.db")
+    yield backend
+    backend.close()
+
+
+class TestStorageBackends:
+    def test_put_get(self, backend):
+        backend.put("reports/a.txt", b"hello")
+
+        data = backend.get("reports/a.txt")
+
+        assert isinstance(data, memoryview)
+        assert bytes(data) == b"hello"
+        assert backend.get("missing") is None
+
+    def test_overwrite_and_delete(self, backend):
+        backend.put("key", b"first")
+        backend.put("key", bytearray(b"second"))
+
+        assert bytes(backend.get("key")) == b"second"
+        assert backend.delete("key") is True
+        assert backend.delete("key") is False
+        assert backend.exists("key") is False
+
+    def test_put_many_get_many(self, backend):
+        backend.put_many({f"batch/{i}": bytes([i]) * 3 for i in range(10)})
+        backend.put_many([("other", b"x")])
+
+        found = backend.get_many(["batch/3", "missing", "batch/7"])
+
+        assert list(found) == ["batch/3", "batch/7"]
+        assert bytes(found["batch/7"]) == b"\x07\x07\x07"
+        assert backend.keys("batch/") == [f"batch/{i}" for i in range(10)]
+        assert len(backend.keys()) == 11
+
+    def test_streaming(self, backend):
+        with backend.open_write("stream.bin") as f:
+            for _ in range(4):
+                f.write(b"chunk")
+
+        with backend.open_read("stream.bin") as f:
+            assert f.read(5) == b"chunk"
+            assert f.read() == b"chunk" * 3
+
+    def test_failed_streaming_write_discarded(self, backend):
+        with pytest.raises(RuntimeError), backend.open_write("partial") as f:
+            f.write(b"data")
+            raise RuntimeError("interrupted")
+
+        assert backend.get("partial") is None
+
+    def test_open_read_missing(self, backend):
+        with pytest.raises(KeyError):
+            backend.open_read("missing")
+
+    def test_keys_prefix_is_case_sensitive(self, backend):
+        backend.put_many({"Reports/a": b"1", "reports/b": b"2", "reports_c": b"3", "100%/d": b"4"})
+
+        assert backend.keys("reports/") == ["reports/b"]
+        assert backend.keys("Reports/") == ["Reports/a"]
+        assert backend.keys("reports") == ["reports/b", "reports_c"]
+        assert backend.keys("100%") == ["100%/d"]
+
+    def test_invalid_keys(self, backend):
+        for key in ["", "/abs", "../escape", "a/../../b"]:
+            with pytest.raises(ValueError):
+                backend.put(key, b"x")
+
+
+class TestFilesystemBackend:
+    def test_large_blob_memory_mapped(self, tmp_path):
+        backend = FilesystemBackend(tmp_path, mmap_threshold=1024)
+        backend.put("large", b"x" * 4096)
+        backend.put("small", b"x" * 10)
+
+        large = backend.get("large")
+
+        assert isinstance(large.obj, mmap.mmap)
+        assert len(large) == 4096
+        assert isinstance(backend.get("small").obj, bytes)
+
+    def test_temporary_files_not_listed(self, tmp_path):
+        backend = FilesystemBackend(tmp_path)
+        writer = backend.open_write("pending")
+        writer.write(b"data")
+
+        assert backend.keys() == []
+        writer.close()
+        assert backend.keys() == ["pending"]
+
+
+class TestOpenStorage:
+    def test_uris(self, tmp_path):
+        assert isinstance(open_storage("memory://"), MemoryBackend)
+        assert isinstance(open_storage(f"file://{tmp_path}/files"), FilesystemBackend)
+        assert open_storage(f"sqlite://{tmp_path}/db.sqlite").path == f"{tmp_path}/db.sqlite"
+
+    def test_invalid_uris(self):
+        with pytest.raises(ValueError):
+            open_storage("s3://bucket")
+        with pytest.raises(ValueError):
+            open_storage("file://")
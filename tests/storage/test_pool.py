@@ -0,0 +1,157 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from template_rooms_pkg.storage.pool import ConnectionPool, PoolClosed, PoolTimeout, sqlite_connect
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "pool.db")
+
+
+class TestConnectionPool:
+    def test_connection_reused(self, db_path):
+        pool = ConnectionPool(lambda: sqlite_connect(db_path), max_size=2)
+
+        with pool.connection() as first:
+            first.execute("CREATE TABLE items (name TEXT)")
+            first.commit()
+        with pool.connection() as second:
+            assert second.execute("SELECT count(*) FROM items").fetchone() == (0,)
+
+        assert first is second
+        assert pool.metrics()["created"] == 1
+        assert pool.metrics()["acquired"] == 2
+
+    def test_uncommitted_work_rolled_back(self, db_path):
+        pool = ConnectionPool(lambda: sqlite_connect(db_path), max_size=1)
+        with pool.connection() as connection:
+            connection.execute("CREATE TABLE items (name TEXT)")
+            connection.commit()
+
+        with pytest.raises(RuntimeError), pool.connection() as connection:
+            connection.execute("INSERT INTO items VALUES ('a')")
+            raise RuntimeError("action failed")
+
+        with pool.connection() as connection:
+            assert connection.execute("SELECT count(*) FROM items").fetchone() == (0,)
+
+    def test_bounded_size_and_timeout(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1, timeout=0.05)
+
+        with pool.connection(), pytest.raises(PoolTimeout), pool.connection():
+            pass
+
+        metrics = pool.metrics()
+        assert metrics["timeouts"] == 1
+        assert metrics["waits"] == 1
+        assert metrics["size"] == 1
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1, timeout=1.0)
+        results = []
+
+        def borrow():
+            with pool.connection() as connection:
+                results.append(connection)
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 4
+        assert len(set(map(id, results))) == 1
+        assert pool.metrics()["in_use"] == 0
+
+    def test_open_creates_min_size(self):
+        pool = ConnectionPool(sqlite_connect, min_size=2, max_size=4).open()
+
+        assert pool.metrics()["idle"] == 2
+        assert pool.metrics()["created"] == 2
+
+    def test_idle_eviction_keeps_min_size(self):
+        pool = ConnectionPool(sqlite_connect, min_size=1, max_size=3, max_idle=0.01).open()
+        with pool.connection(), pool.connection():
+            pass
+        assert pool.metrics()["idle"] == 2
+
+        time.sleep(0.02)
+
+        assert pool.prune() == 1
+        assert pool.metrics()["size"] == 1
+
+    def test_max_lifetime(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1, max_lifetime=0.01)
+        with pool.connection() as first:
+            pass
+
+        time.sleep(0.02)
+
+        with pool.connection() as second:
+            pass
+        assert first is not second
+        assert pool.metrics()["closed"] == 1
+
+    def test_failed_health_check_replaces_connection(self):
+        check = Mock(side_effect=RuntimeError("connection lost"))
+        pool = ConnectionPool(sqlite_connect, max_size=1, check_interval=0, check=check)
+        with pool.connection() as first:
+            pass
+
+        with pool.connection() as second:
+            pass
+
+        assert first is not second
+        assert pool.metrics()["failed_checks"] == 1
+
+    def test_connect_failure_releases_slot(self):
+        pool = ConnectionPool(Mock(side_effect=ConnectionError("refused")), max_size=1, timeout=0.01)
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError), pool.connection():
+                pass
+
+        assert pool.metrics()["size"] == 0
+
+    def test_open_failure_releases_unused_reservations(self):
+        connect = Mock(side_effect=[sqlite_connect(), ConnectionError("refused"), sqlite_connect(), sqlite_connect()])
+        pool = ConnectionPool(connect, min_size=3, max_size=3, timeout=0.05)
+
+        with pytest.raises(ConnectionError):
+            pool.open()
+
+        assert pool.metrics()["size"] == 1
+        with pool.connection(), pool.connection(), pool.connection():
+            assert pool.metrics()["size"] == 3
+
+    def test_close(self):
+        pool = ConnectionPool(sqlite_connect, min_size=1).open()
+
+        pool.close()
+
+        assert pool.metrics()["size"] == 0
+        with pytest.raises(PoolClosed), pool.connection():
+            pass
+
+    def test_from_config(self):
+        connect = Mock(return_value=sqlite_connect())
+        config = SimpleNamespace(host="db.local", port=5432, database="rooms")
+        credentials = {"db_user": "user", "db_password": "secret"}
+
+        pool = ConnectionPool.from_config(config, credentials, connect, max_size=2)
+        with pool.connection():
+            pass
+
+        connect.assert_called_once_with(host="db.local", port=5432, database="rooms", user="user", password="secret")
+        assert pool.max_size == 2
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ConnectionPool(sqlite_connect, min_size=3, max_size=2)
@@ -1,3 +1,5 @@
+import sys
+import time
 from unittest.mock import Mock, patch
 
 import pytest
@@ -25,14 +27,52 @@ class TestTemplateRoomsAddon:
         assert hasattr(logger, 'info')
         assert hasattr(logger, 'warning')
         assert hasattr(logger, 'error')
-        assert logger.addon_type == "Unknown"
+        assert addon.logger is logger
+
+    def test_logger_prefixes_and_binds_addon_type(self):
+        from loguru import logger as base_logger
+
+        addon = TemplateRoomsAddon()
+        records = []
+        handler_id = base_logger.add(lambda message: records.append(message.record), level="DEBUG")
+        try:
+            addon.logger.info("Loaded {} items", 3)
+        finally:
+            base_logger.remove(handler_id)
+
+        assert records[0]["message"] == "[TYPE: UNKNOWN] Loaded 3 items"
+        assert records[0]["extra"]["addon_type"] == "Unknown"
+
+    def test_logger_skips_formatting_when_level_disabled(self):
+        from loguru import logger as base_logger
+
+        formatted = []
+
+        class Payload:
+            def __format__(self, spec):
+                formatted.append(spec)
+                return "payload"
+
+        addon = TemplateRoomsAddon()
+        build_payload = Mock(return_value=Payload())
+        base_logger.remove()
+        handler_id = base_logger.add(lambda message: None, level="INFO")
+        try:
+            addon.logger.debug("Payload: {}", Payload())
+            addon.logger.opt(lazy=True).debug("Payload: {}", build_payload)
+        finally:
+            base_logger.remove(handler_id)
+            base_logger.add(sys.stderr)
+
+        assert formatted == []
+        build_payload.assert_not_called()
 
 
     def test_load_tools(self, sample_tools, sample_tool_descriptions):
         addon = TemplateRoomsAddon()
 
         with patch.object(addon.tool_registry, 'register_tools') as mock_register, \
-             patch.object(addon.tool_registry, 'get_tools_for_action', return_value={"tool1": {}, "tool2": {}}):
+             patch.object(addon.tool_registry, 'get_tool_names', return_value=["tool1", "tool2"]):
 
             addon.loadTools(sample_tools, sample_tool_descriptions)
 
@@ -47,6 +87,39 @@ class TestTemplateRoomsAddon:
 
             assert result == expected_tools
 
+    def test_sync_tools(self, sample_tools):
+        addon = TemplateRoomsAddon()
+        addon.loadTools(sample_tools)
+
+        changes = addon.syncTools({"test_tool": sample_tools["test_tool"]})
+
+        assert changes == {"added": [], "removed": ["another_tool"], "changed": []}
+        assert list(addon.getTools()) == ["test_tool"]
+
+    def test_get_tools_in_provider_format(self, sample_tools):
+        import json
+
+        addon = TemplateRoomsAddon()
+        addon.loadTools(sample_tools)
+
+        tools = addon.getTools(["test_tool"], tool_format="openai")
+
+        assert tools[0]["function"]["name"] == "test_tool"
+        assert len(json.loads(addon.getToolsJson("anthropic"))) == 2
+
+    def test_load_tools_does_not_build_schemas(self, sample_tools):
+        addon = TemplateRoomsAddon()
+
+        with patch.object(addon.tool_registry, '_convert_annotations_to_schema') as mock_convert:
+            addon.loadTools(sample_tools)
+
+            mock_convert.assert_not_called()
+
+        tools = addon.getTools(["test_tool"])
+
+        assert list(tools.keys()) == ["test_tool"]
+        assert "input_schema" in tools["test_tool"]
+
     def test_clear_tools(self):
         addon = TemplateRoomsAddon()
 
@@ -65,6 +138,116 @@ class TestTemplateRoomsAddon:
         assert addon.observer_callback == callback
         assert addon.addon_id == addon_id
 
+    def test_credentials_scoped_by_config_id(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        first, second = TemplateRoomsAddon(), TemplateRoomsAddon()
+        first.config = Mock(id="scoped_config_1", secrets={})
+        second.config = Mock(id="scoped_config_2", secrets={})
+        first._scopeCredentials()
+        second._scopeCredentials()
+
+        first.loadCredentials(api_key="first")
+        second.loadCredentials(api_key="second")
+
+        assert first.credentials is CredentialsRegistry().scoped("scoped_config_1")
+        assert first.credentials.get("api_key") == "first"
+        assert second.credentials.get("api_key") == "second"
+        assert CredentialsRegistry().has("api_key") is False
+
+    def test_actions_read_credentials_when_addon_id_differs(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        def read_api_key(config):
+            return CredentialsRegistry().scoped(config.id).get("api_key")
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="config_id", secrets={})
+        addon._scopeCredentials()
+        addon.loadCredentials(api_key="first")
+
+        addon.setObserverCallback(Mock(), "host-1")
+        addon.loadCredentials(api_key="second")
+
+        assert addon.addon_id != addon.config.id
+        assert addon._runAction(read_api_key) == "second"
+        assert "host-1" not in CredentialsRegistry().addon_ids()
+
+    def test_credentials_follow_config_id_change(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="old_config_id", secrets={})
+        addon._scopeCredentials()
+        addon.loadCredentials(api_key="value")
+
+        addon.config = Mock(id="new_config_id", secrets={})
+        addon._scopeCredentials()
+
+        assert addon.credentials.addon_id == "new_config_id"
+        assert addon.credentials.get("api_key") == "value"
+        assert "old_config_id" not in CredentialsRegistry().addon_ids()
+
+    def test_hot_reload_keeps_shared_shard(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        old, new = TemplateRoomsAddon(), TemplateRoomsAddon()
+        for addon in (old, new):
+            addon.config = Mock(id="reloaded_config_id", secrets={})
+            addon._scopeCredentials()
+        new.loadCredentials(api_key="value")
+
+        old.close()
+
+        assert new.credentials is CredentialsRegistry().scoped("reloaded_config_id")
+        assert CredentialsRegistry().scoped("reloaded_config_id").get("api_key") == "value"
+
+        new.config = Mock(id="other_config_id", secrets={})
+        new._scopeCredentials()
+        assert "reloaded_config_id" not in CredentialsRegistry().addon_ids()
+        new.close()
+
+    def test_rescoping_keeps_shard_used_by_another_instance(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        first, second = TemplateRoomsAddon(), TemplateRoomsAddon()
+        for addon in (first, second):
+            addon.config = Mock(id="shared_config_id", secrets={})
+            addon._scopeCredentials()
+        first.loadCredentials(api_key="value")
+
+        first.config = Mock(id="moved_config_id", secrets={})
+        first._scopeCredentials()
+
+        assert second.credentials.get("api_key") == "value"
+        assert CredentialsRegistry().scoped("shared_config_id") is second.credentials
+        first.close()
+        second.close()
+
+    def test_credentials_loaded_before_config_are_scoped(self):
+        addon = TemplateRoomsAddon()
+        addon.loadCredentials(early_key="value")
+
+        addon.config = Mock(id="late_config_id", secrets={})
+        addon._scopeCredentials()
+
+        assert addon.credentials.keys() == ["early_key"]
+        assert addon.credentials.get("early_key") == "value"
+        addon.close()
+
+    def test_close_drops_credentials_shard(self):
+        from template_rooms_pkg.services.credentials import CredentialsRegistry
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="closed_config_id", secrets={})
+        addon._scopeCredentials()
+        addon.loadCredentials(api_key="value")
+
+        addon.close()
+
+        assert "closed_config_id" not in CredentialsRegistry().addon_ids()
+        assert addon.credentials is CredentialsRegistry()
+
     def test_example_action(self):
         addon = TemplateRoomsAddon()
 
@@ -74,11 +257,73 @@ class TestTemplateRoomsAddon:
         assert result.code == 200
         assert result.output.data["processed"] == "param1_value- processed -"
 
+    def test_run_batch(self):
+        addon = TemplateRoomsAddon()
+        inputs = [{"param1": "first", "param2": "x"}, {"param1": "second", "param2": "y"}]
+
+        results = list(addon.runBatch("example", inputs))
+
+        assert [r.output.data["processed"] for r in results] == ["first- processed -", "second- processed -"]
+
+    def test_run_batch_uses_addon_config(self):
+        addon = TemplateRoomsAddon()
+        addon.config = Mock()
+
+        with patch('template_rooms_pkg.actions.batch.run_batch', return_value=iter([])) as mock_run_batch:
+            addon.runBatch("example", [{"param1": "a", "param2": "b"}], executor="thread", max_workers=2)
+
+        args, kwargs = mock_run_batch.call_args
+        assert args[1] is addon.config
+        assert kwargs["executor"] == "thread"
+        assert kwargs["max_workers"] == 2
+
+    def test_run_batch_unknown_action(self):
+        addon = TemplateRoomsAddon()
+
+        with pytest.raises(ImportError):
+            addon.runBatch("nonexistent", [])
+
+    def test_stream_action_forwards_chunks_to_observer(self):
+        addon = TemplateRoomsAddon()
+        callback = Mock()
+        addon.setObserverCallback(callback, "test_addon")
+
+        chunks = list(addon.example_stream("a", "b"))
+
+        assert callback.call_count == len(chunks)
+        event = callback.call_args_list[0].args[0]
+        assert event["addon_id"] == "test_addon"
+        assert event["event"] == "action_chunk"
+        assert event["data"] is chunks[0]
+
+    def test_stream_action_survives_observer_failure(self):
+        addon = TemplateRoomsAddon()
+        addon.setObserverCallback(Mock(side_effect=Exception("observer down")), "test_addon")
+
+        chunks = list(addon.streamAction("example", param1="a", param2="b"))
+
+        assert len(chunks) == 1
+
+    def test_astream_action(self):
+        import asyncio
+
+        addon = TemplateRoomsAddon()
+        callback = Mock()
+        addon.setObserverCallback(callback, "test_addon")
+
+        async def collect():
+            return [chunk async for chunk in addon.astreamAction("example_stream", param1="a", param2="b")]
+
+        chunks = asyncio.run(collect())
+
+        assert chunks[-1].final is True
+        assert callback.call_count == len(chunks)
+
     def test_load_addon_config_success(self, sample_config):
         addon = TemplateRoomsAddon()
 
         with patch('template_rooms_pkg.configuration.CustomAddonConfig') as MockConfig:
-            mock_config_instance = Mock()
+            mock_config_instance = Mock(config={}, secrets={})
             MockConfig.return_value = mock_config_instance
 
             result = addon.loadAddonConfig(sample_config)
@@ -87,6 +332,42 @@ class TestTemplateRoomsAddon:
             assert addon.config == mock_config_instance
             assert result is True
 
+    def test_load_addon_config_reuses_validated_config(self):
+        from template_rooms_pkg.configuration import config_cache
+
+        config_cache.clear()
+        addon_config = {
+            "id": "addon_1",
+            "type": "example",
+            "name": "Example",
+            "example_param1": "value1",
+            "secrets": {"example_api_key": "KEY", "example_secret": "SECRET"},
+        }
+        first, second = TemplateRoomsAddon(), TemplateRoomsAddon()
+
+        assert first.loadAddonConfig(addon_config) is True
+        assert second.loadAddonConfig(dict(reversed(list(addon_config.items())))) is True
+
+        assert config_cache.stats()["hits"] == 1
+        assert first.config == second.config
+        assert first.config is not second.config
+        assert first.config.secrets is not second.config.secrets
+
+    def test_load_addon_config_readonly(self):
+        addon_config = {
+            "id": "addon_ro",
+            "type": "example",
+            "name": "Example",
+            "example_param1": "value1",
+            "secrets": {"example_api_key": "KEY", "example_secret": "SECRET"},
+        }
+        first, second = TemplateRoomsAddon(), TemplateRoomsAddon()
+
+        first.loadAddonConfig(addon_config, readonly=True)
+        second.loadAddonConfig(addon_config, readonly=True)
+
+        assert first.config is second.config
+
     def test_load_addon_config_failure(self):
         addon = TemplateRoomsAddon()
 
@@ -126,6 +407,77 @@ class TestTemplateRoomsAddon:
 
         assert result is False
 
+    def test_resolve_credentials(self):
+        from template_rooms_pkg.services.credentials import CredentialResolver, MockVaultSecretProvider
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="resolve_addon", secrets={"api_key": "API_KEY_ENV"})
+        resolver = CredentialResolver([MockVaultSecretProvider({"API_KEY_ENV": "secret"})])
+
+        with patch.object(addon, 'loadCredentials', return_value=True) as mock_load:
+            result = addon.resolveCredentials(resolver)
+
+        mock_load.assert_called_once_with(api_key="secret")
+        assert result is True
+
+    def test_resolve_credentials_keeps_resolver_and_writes_back_refreshes(self):
+        from template_rooms_pkg.services.credentials import CredentialResolver, MockVaultSecretProvider
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="refresh_addon", secrets={"api_key": "API_KEY_ENV"})
+        vault = MockVaultSecretProvider({"API_KEY_ENV": "old"})
+        resolver = CredentialResolver([vault], ttl=10, refresh_ahead=1.0)
+
+        assert addon.resolveCredentials(resolver) is True
+        vault.secrets["API_KEY_ENV"] = "rotated"
+        vault.latency = 0.05
+        assert addon.resolveCredentials() is True
+        resolver.shutdown(wait=True)
+
+        assert addon.credential_resolver is resolver
+        assert addon.credentials.get("api_key") == "rotated"
+        addon.close()
+
+    def test_resolved_credentials_refreshed_without_reads(self):
+        from template_rooms_pkg.services.credentials import CredentialResolver, MockVaultSecretProvider
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="timer_refresh_addon", secrets={"api_key": "API_KEY_ENV"})
+        vault = MockVaultSecretProvider({"API_KEY_ENV": "old"})
+        resolver = CredentialResolver([vault], ttl=0.2, refresh_ahead=0.5)
+
+        assert addon.resolveCredentials(resolver) is True
+        vault.secrets["API_KEY_ENV"] = "rotated"
+
+        deadline = time.monotonic() + 1
+        while addon.credentials.get("api_key") != "rotated" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        resolver.shutdown()
+
+        assert addon.credentials.get("api_key") == "rotated"
+        addon.close()
+
+    def test_close_stops_own_resolver(self):
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="own_resolver_addon", secrets={})
+        addon.resolveCredentials()
+        resolver = addon.credential_resolver
+
+        addon.close()
+
+        assert addon.credential_resolver is None
+        assert resolver._closed is True
+
+    def test_resolve_credentials_missing_secret(self):
+        from template_rooms_pkg.services.credentials import CredentialResolver, MockVaultSecretProvider
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="resolve_addon", secrets={"api_key": "API_KEY_ENV"})
+
+        result = addon.resolveCredentials(CredentialResolver([MockVaultSecretProvider()]))
+
+        assert result is False
+
     def test_load_credentials_failure(self, sample_credentials):
         addon = TemplateRoomsAddon()
 
@@ -134,6 +486,144 @@ class TestTemplateRoomsAddon:
 
             assert result is False
 
+    def test_health_check_without_config(self):
+        addon = TemplateRoomsAddon()
+
+        report = addon.healthCheck(use_cache=False)
+
+        checks = {check["name"]: check for check in report["checks"]}
+        assert report["status"] == "fail"
+        assert report["type"] == "Unknown"
+        assert checks["config"]["status"] == "error"
+        assert all(checks[name]["status"] == "ok" for name in addon.modules)
+
+    def test_health_check_ready(self):
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="health_addon", secrets={"api_key": "API_KEY"})
+        addon.setObserverCallback(Mock(), "health_addon")
+        addon.loadCredentials(api_key="value")
+        addon.registerHealthCheck("database", lambda: {"ping_ms": 0.1})
+
+        report = addon.healthCheck(use_cache=False)
+
+        checks = {check["name"]: check for check in report["checks"]}
+        assert report["status"] == "ok"
+        assert report["addon_id"] == "health_addon"
+        assert checks["credentials"]["detail"] == {"count": 1}
+        assert checks["database"]["detail"] == {"ping_ms": 0.1}
+
+    def test_health_check_missing_credentials(self):
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="health_addon_2", secrets={"api_key": "API_KEY"})
+        addon.setObserverCallback(Mock(), "health_addon_2")
+
+        report = addon.healthCheck(use_cache=False)
+
+        checks = {check["name"]: check for check in report["checks"]}
+        assert checks["credentials"]["status"] == "error"
+        assert "api_key" in checks["credentials"]["error"]
+
+    def test_connection_pool(self, tmp_path):
+        from template_rooms_pkg.storage import sqlite_connect
+
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(id="db_addon", host="localhost", port=5432, database=str(tmp_path / "addon.db"), secrets={})
+
+        pool = addon.openConnectionPool(sqlite_connect, max_size=2)
+        with addon.connection() as connection:
+            assert connection.execute("SELECT 1").fetchone() == (1,)
+
+        checks = {check["name"]: check for check in addon.healthCheck(use_cache=False)["checks"]}
+        assert checks["database"]["status"] == "ok"
+        assert checks["database"]["detail"]["max_size"] == 2
+
+        addon.closeConnectionPool()
+        assert addon.pool is None
+        assert pool.metrics()["size"] == 0
+
+    def test_connection_without_pool(self):
+        addon = TemplateRoomsAddon()
+
+        with pytest.raises(RuntimeError):
+            addon.connection()
+
+    def test_throttled_call_uses_llm_config(self):
+        addon = TemplateRoomsAddon()
+        addon.config = Mock(provider="openai", model="gpt-test", max_tokens=500)
+        backend = Mock(return_value="answer")
+
+        with patch('template_rooms_pkg.services.ratelimit.llm_rate_limiter.call', return_value="answer") as mock_call:
+            assert addon.throttledCall(backend, "prompt") == "answer"
+
+        mock_call.assert_called_once_with(
+            "openai", "gpt-test", backend, "prompt", estimated_tokens=500, coalesce_key=None
+        )
+
+    def test_cpu_bound_actions_run_on_process_pool(self):
+        import os
+
+        from tests.actions.test_workers import worker_info
+
+        addon = TemplateRoomsAddon()
+        addon.loadAddonConfig({"id": "pool_addon", "type": "example", "name": "Pool addon",
+                               "example_param1": "x",
+                               "secrets": {"example_api_key": "KEY", "example_secret": "SECRET", "api_key": "API"}})
+        addon.setObserverCallback(Mock(), "pool_host_id")
+        addon.loadCredentials(example_api_key="key", example_secret="secret", api_key="secret")
+        addon.startProcessPool(max_workers=2)
+        pool = addon.process_pool
+
+        try:
+            response = addon._runAction(worker_info, value="a")
+            batch = list(addon.runBatch("example", [{"param1": "b", "param2": "c"}], executor="process"))
+
+            assert response.output.data["pid"] != os.getpid()
+            assert response.output.data["config_id"] != addon.addon_id
+            assert response.output.data["api_key"] == "secret"
+            assert batch[0].output.data["processed"] == "b- processed -"
+            assert addon.process_pool is pool
+            assert addon.getMetrics()["worker_info"]["calls"] == 1
+
+            addon.loadCredentials(example_api_key="key", example_secret="secret", api_key="rotated")
+            assert addon.process_pool is None
+        finally:
+            addon.closeProcessPool()
+
+    def test_metrics_record_actions_streams_and_batches(self):
+        addon = TemplateRoomsAddon()
+
+        addon.example("a", "b")
+        list(addon.example_stream("a", "b"))
+        list(addon.runBatch("example", [{"param1": "x", "param2": "y"}] * 3))
+
+        metrics = addon.getMetrics()
+        assert metrics["example"]["calls"] == 4
+        assert metrics["example"]["errors"] == 0
+        assert metrics["example_stream"]["calls"] == 1
+        assert metrics["example_stream"]["tokens"] > 0
+
+    def test_export_metrics_labels_addon(self):
+        addon = TemplateRoomsAddon()
+        addon.setObserverCallback(Mock(), "test_addon")
+        addon.example("a", "b")
+
+        text = addon.exportMetrics()
+
+        assert 'rooms_action_calls_total{addon_id="test_addon",addon_type="Unknown",action="example"} 1' in text
+
+    def test_metrics_reporting_pushes_to_observer(self):
+        addon = TemplateRoomsAddon()
+        callback = Mock()
+        addon.setObserverCallback(callback, "test_addon")
+
+        addon.startMetricsReporting(interval=60)
+        addon.stopMetricsReporting()
+
+        event = callback.call_args.args[0]
+        assert event["event"] == "metrics"
+        assert "actions" in event["data"]
+        assert addon.metrics_reporter is None
+
     def test_test_method_success(self):
         addon = TemplateRoomsAddon()
 
@@ -0,0 +1,77 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from harness import compare, measure  # noqa: E402
+
+
+class TestHarness:
+    def test_measure(self):
+        calls = []
+
+        result = measure(lambda state: calls.append(state), setup=lambda: "state", iterations=10, warmup=2, ops_per_call=5)
+
+        assert calls == ["state"] * 13
+        assert result["iterations"] == 10
+        assert result["p50_us"] <= result["p99_us"]
+        assert result["ops_per_sec"] > 0
+        assert result["alloc_peak_bytes"] >= 0
+
+    def test_compare_flags_regressions_over_threshold(self):
+        baseline = {"fast": {"p50_us": 10.0, "alloc_peak_bytes": 100}, "gone": {"p50_us": 1.0}}
+        results = {"fast": {"p50_us": 13.0, "alloc_peak_bytes": 110}, "new": {"p50_us": 99.0}}
+
+        regressions = compare(results, baseline, threshold=0.2)
+
+        assert regressions == [
+            {"benchmark": "fast", "metric": "p50_us", "baseline": 10.0, "current": 13.0, "change": 0.3}
+        ]
+        assert compare(results, baseline, threshold=0.5) == []
+
+
+@pytest.fixture
+def restore_logger():
+    from loguru import logger
+
+    yield
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+class TestSuite:
+    def test_suite_writes_report_and_compares_baseline(self, tmp_path, restore_logger):
+        import suite
+
+        output = tmp_path / "results.json"
+        baseline = tmp_path / "baseline.json"
+        args = ["--only", "[1]", "--scale", "0.001", "--output", str(output)]
+
+        assert suite.main(args + ["--save-baseline", str(baseline)]) == 0
+        report = json.loads(output.read_text())
+        assert set(report["results"]) == {
+            "register_tools[1]", "tool_call[1]", "tool_schemas_cold[1]", "tool_schemas_warm[1]", "tool_snapshot[1]",
+            "tool_payload_serialize[1]", "tool_payload_cached[1]",
+            "load_addon_config[1]", "load_credentials[1]",
+        }
+
+        # a baseline that is much faster than anything we measure forces a regression
+        fast = json.loads(baseline.read_text())
+        for result in fast["results"].values():
+            result["p50_us"] = 1e-6
+        baseline.write_text(json.dumps(fast))
+        assert suite.main(args + ["--baseline", str(baseline)]) == 1
+        assert json.loads(output.read_text())["regressions"]
+
+    def test_suite_runs_action_cases(self, tmp_path, restore_logger):
+        import suite
+
+        output = tmp_path / "results.json"
+
+        assert suite.main(["--only", "action_", "--scale", "0.001", "--output", str(output)]) == 0
+        assert set(json.loads(output.read_text())["results"]) == {
+            "action_direct", "action_invoke", "action_invoke_cache_miss", "action_invoke_cache_hit", "action_batch[100]",
+        }
@@ -1,8 +1,11 @@
+from unittest.mock import patch
+
 import pytest
 from pydantic import ValidationError
 
 from template_rooms_pkg.configuration.addonconfig import CustomAddonConfig
 from template_rooms_pkg.configuration.baseconfig import BaseAddonConfig
+from template_rooms_pkg.configuration.cache import ConfigCache, config_fingerprint
 
 
 class TestBaseAddonConfig:
@@ -110,3 +113,122 @@ class TestCustomAddonConfig:
                 description="Test addon",
                 secrets={"example_api_key": "key123", "example_secret": "secret456"}
             )
+
+
+def custom_config_data(**overrides):
+    data = {
+        "id": "test_addon_id",
+        "type": "example",
+        "name": "test_addon",
+        "example_param1": "value1",
+        "secrets": {"example_api_key": "key123", "example_secret": "secret456"},
+    }
+    data.update(overrides)
+    return data
+
+
+class TestRequiredSecretNames:
+    def test_required_secret_names(self):
+        assert CustomAddonConfig.required_secret_names() == ("example_api_key", "example_secret")
+
+    def test_required_secret_names_computed_once(self):
+        CustomAddonConfig.required_secret_names()
+
+        with patch.object(CustomAddonConfig, 'get_required_secrets') as mock_get:
+            CustomAddonConfig(**custom_config_data())
+
+            mock_get.assert_not_called()
+
+    def test_base_config_has_no_required_secrets(self):
+        assert BaseAddonConfig.required_secret_names() == ()
+
+
+class TestReadOnlyConfig:
+    def test_readonly_class_is_cached_subclass(self):
+        readonly_cls = CustomAddonConfig.readonly()
+
+        assert readonly_cls is CustomAddonConfig.readonly()
+        assert issubclass(readonly_cls, CustomAddonConfig)
+
+    def test_readonly_config_rejects_assignment(self):
+        config = CustomAddonConfig.readonly()(**custom_config_data())
+
+        with pytest.raises(ValidationError):
+            config.example_param1 = "changed"
+
+    def test_readonly_config_still_validates(self):
+        with pytest.raises(ValidationError, match="Missing required secrets"):
+            CustomAddonConfig.readonly()(**custom_config_data(secrets={}))
+
+
+class TestConfigCache:
+    def test_fingerprint_ignores_key_order(self):
+        assert config_fingerprint({"a": 1, "b": {"c": 2, "d": 3}}) == config_fingerprint({"b": {"d": 3, "c": 2}, "a": 1})
+        assert config_fingerprint({"a": 1}) != config_fingerprint({"a": 2})
+
+    def test_cache_hit_skips_validation(self):
+        cache = ConfigCache()
+        cache.load(CustomAddonConfig, custom_config_data())
+
+        with patch.object(CustomAddonConfig, '__init__', side_effect=AssertionError("validated again")):
+            config = cache.load(CustomAddonConfig, custom_config_data())
+
+        assert config.example_param1 == "value1"
+        assert cache.stats()["hits"] == 1
+
+    def test_mutable_loads_are_isolated(self):
+        cache = ConfigCache()
+        first = cache.load(CustomAddonConfig, custom_config_data())
+        first.example_param1 = "changed"
+        first.secrets["extra"] = "value"
+
+        second = cache.load(CustomAddonConfig, custom_config_data())
+
+        assert second.example_param1 == "value1"
+        assert "extra" not in second.secrets
+
+    def test_mutable_loads_do_not_share_nested_values(self):
+        cache = ConfigCache()
+        first = cache.load(CustomAddonConfig, custom_config_data(config={"nested": {"a": 1}}))
+        first.config["nested"]["a"] = 999
+        second = cache.load(CustomAddonConfig, custom_config_data(config={"nested": {"a": 1}}))
+        second.config["nested"]["a"] = 555
+
+        third = cache.load(CustomAddonConfig, custom_config_data(config={"nested": {"a": 1}}))
+
+        assert third.config["nested"] == {"a": 1}
+
+    def test_readonly_loads_share_instance(self):
+        cache = ConfigCache()
+
+        first = cache.load(CustomAddonConfig, custom_config_data(), readonly=True)
+        second = cache.load(CustomAddonConfig, custom_config_data(), readonly=True)
+
+        assert first is second
+        assert isinstance(first, CustomAddonConfig)
+
+    def test_invalid_config_not_cached(self):
+        cache = ConfigCache()
+
+        with pytest.raises(ValidationError):
+            cache.load(CustomAddonConfig, custom_config_data(secrets={}))
+
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        cache = ConfigCache(maxsize=2)
+
+        for i in range(3):
+            cache.load(CustomAddonConfig, custom_config_data(id=f"addon_{i}"))
+
+        assert cache.stats()["size"] == 2
+        cache.load(CustomAddonConfig, custom_config_data(id="addon_0"))
+        assert cache.stats()["misses"] == 4
+
+    def test_clear(self):
+        cache = ConfigCache()
+        cache.load(CustomAddonConfig, custom_config_data())
+
+        cache.clear()
+
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 256}
@@ -1,8 +1,17 @@
-from unittest.mock import patch
+import threading
+import time
+from unittest.mock import Mock, patch
 
 import pytest
 
-from template_rooms_pkg.services.credentials import CredentialsRegistry
+from template_rooms_pkg.services.credentials import (
+    CredentialResolver,
+    CredentialShard,
+    CredentialsRegistry,
+    EnvSecretProvider,
+    FileSecretProvider,
+    MockVaultSecretProvider,
+)
 
 
 class TestCredentialsRegistry:
@@ -88,3 +97,267 @@ class TestCredentialsRegistry:
         result = registry.keys()
 
         assert result == []
+
+
+class TestScopedCredentials:
+    def setup_method(self):
+        CredentialsRegistry._instance = None
+        CredentialsRegistry._credentials = {}
+        CredentialsRegistry._shards = {}
+        CredentialsRegistry._users = {}
+
+    def test_scoped_returns_same_shard(self):
+        registry = CredentialsRegistry()
+
+        shard = registry.scoped("addon_a")
+
+        assert isinstance(shard, CredentialShard)
+        assert registry.scoped("addon_a") is shard
+        assert CredentialsRegistry().scoped("addon_a") is shard
+
+    def test_scoped_none_returns_registry(self):
+        registry = CredentialsRegistry()
+
+        assert registry.scoped(None) is registry
+
+    def test_shards_are_isolated(self):
+        registry = CredentialsRegistry()
+        shard_a = registry.scoped("addon_a")
+        shard_b = registry.scoped("addon_b")
+
+        shard_a.store("api_key", "key_a")
+        shard_b.store_multiple({"api_key": "key_b", "other": "value"})
+
+        assert shard_a.get("api_key") == "key_a"
+        assert shard_b.get("api_key") == "key_b"
+        assert shard_a.has("other") is False
+        assert registry.has("api_key") is False
+        assert sorted(shard_b.keys()) == ["api_key", "other"]
+
+    def test_shard_clear_only_affects_its_addon(self):
+        registry = CredentialsRegistry()
+        registry.store("global_key", "value")
+        registry.scoped("addon_a").store("key", "a")
+        registry.scoped("addon_b").store("key", "b")
+
+        registry.scoped("addon_a").clear()
+
+        assert registry.scoped("addon_a").keys() == []
+        assert registry.scoped("addon_b").get("key") == "b"
+        assert registry.get("global_key") == "value"
+
+    def test_drop_and_addon_ids(self):
+        registry = CredentialsRegistry()
+        registry.scoped("addon_a").store("key", "a")
+        registry.scoped("addon_b")
+
+        registry.drop("addon_a")
+
+        assert registry.addon_ids() == ["addon_b"]
+        assert registry.scoped("addon_a").get("key") is None
+
+    def test_release_drops_shard_after_last_user(self):
+        registry = CredentialsRegistry()
+        shard = registry.acquire("addon_a")
+        assert registry.acquire("addon_a") is shard
+        shard.store("key", "a")
+
+        registry.release("addon_a")
+        assert registry.scoped("addon_a").get("key") == "a"
+
+        registry.release("addon_a")
+        assert registry.addon_ids() == []
+
+    def test_concurrent_shard_creation(self):
+        registry = CredentialsRegistry()
+        shards = []
+        barrier = threading.Barrier(8)
+
+        def worker(index):
+            barrier.wait()
+            shard = registry.scoped("shared_addon")
+            shard.store(f"key_{index}", str(index))
+            shards.append(shard)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(shard is shards[0] for shard in shards)
+        assert len(shards[0].keys()) == 8
+
+
+class TestSecretProviders:
+    def test_env_provider(self, monkeypatch):
+        monkeypatch.setenv("TEST_SECRET_ENV", "env_value")
+
+        assert EnvSecretProvider().fetch("TEST_SECRET_ENV") == "env_value"
+        assert EnvSecretProvider().fetch("TEST_SECRET_MISSING") is None
+
+    def test_file_provider(self, tmp_path):
+        (tmp_path / "DB_PASSWORD").write_text("file_value\n")
+
+        provider = FileSecretProvider(tmp_path)
+
+        assert provider.fetch("DB_PASSWORD") == "file_value"
+        assert provider.fetch("MISSING") is None
+
+    def test_mock_vault_provider(self):
+        provider = MockVaultSecretProvider({"API_KEY": "vault_value"})
+
+        assert provider.fetch("API_KEY") == "vault_value"
+        assert provider.fetch("MISSING") is None
+        assert provider.fetch_count == 2
+
+
+class TestCredentialResolver:
+    def test_resolve_uses_first_provider_with_value(self):
+        resolver = CredentialResolver([
+            MockVaultSecretProvider({"A": "first"}),
+            MockVaultSecretProvider({"A": "second", "B": "second"}),
+        ])
+
+        assert resolver.resolve("A") == "first"
+        assert resolver.resolve("B") == "second"
+        assert resolver.resolve("C") is None
+
+    def test_resolve_secrets_mapping(self):
+        resolver = CredentialResolver([MockVaultSecretProvider({"ENV_KEY": "value"})])
+
+        result = resolver.resolve_secrets({"api_key": "ENV_KEY", "other": "MISSING"})
+
+        assert result == {"api_key": "value", "other": None}
+
+    def test_values_cached_within_ttl(self):
+        vault = MockVaultSecretProvider({"A": "value"})
+        resolver = CredentialResolver([vault], ttl=60)
+
+        for _ in range(5):
+            assert resolver.resolve("A") == "value"
+
+        assert vault.fetch_count == 1
+        assert resolver.stats()["hits"] == 4
+
+    def test_expired_values_reloaded(self):
+        vault = MockVaultSecretProvider({"A": "old"})
+        resolver = CredentialResolver([vault], ttl=0.01, refresh_ahead=0)
+        resolver.resolve("A")
+        vault.secrets["A"] = "new"
+
+        time.sleep(0.02)
+
+        assert resolver.resolve("A") == "new"
+        assert vault.fetch_count == 2
+
+    def test_refresh_ahead_runs_in_background(self):
+        vault = MockVaultSecretProvider({"A": "old"})
+        resolver = CredentialResolver([vault], ttl=10, refresh_ahead=1.0)
+        resolver.resolve("A")
+        vault.secrets["A"] = "new"
+        vault.latency = 0.05
+
+        start = time.perf_counter()
+        assert resolver.resolve("A") == "old"
+        assert time.perf_counter() - start < 0.05
+
+        resolver.shutdown(wait=True)
+        assert resolver.resolve("A") == "new"
+
+    def test_refresh_notifies_listeners_of_changes(self):
+        vault = MockVaultSecretProvider({"A": "old", "B": "same"})
+        resolver = CredentialResolver([vault], ttl=10, refresh_ahead=1.0)
+        listener = Mock()
+        resolver.add_listener(listener)
+        resolver.resolve("A")
+        resolver.resolve("B")
+        vault.secrets["A"] = "new"
+
+        resolver.resolve("A")
+        resolver.resolve("B")
+        resolver.shutdown(wait=True)
+
+        listener.assert_called_once_with("A", "new")
+
+    def test_values_refreshed_before_expiry_without_reads(self):
+        vault = MockVaultSecretProvider({"A": "old"})
+        resolver = CredentialResolver([vault], ttl=0.2, refresh_ahead=0.5)
+        listener = Mock()
+        resolver.add_listener(listener)
+        resolver.resolve("A")
+        vault.secrets["A"] = "new"
+
+        deadline = time.monotonic() + 1
+        while not listener.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        resolver.shutdown()
+
+        listener.assert_called_once_with("A", "new")
+        assert resolver.stats()["misses"] == 1
+
+    def test_shutdown_stops_refresh_timers(self):
+        vault = MockVaultSecretProvider({"A": "value"})
+        resolver = CredentialResolver([vault], ttl=0.05, refresh_ahead=0.5)
+        resolver.resolve("A")
+
+        resolver.shutdown()
+        time.sleep(0.1)
+
+        assert vault.fetch_count == 1
+
+    def test_misses_cached_for_miss_ttl(self):
+        vault = MockVaultSecretProvider()
+        resolver = CredentialResolver([vault], ttl=60, miss_ttl=0.01)
+        resolver.resolve("A")
+        resolver.resolve("A")
+        assert vault.fetch_count == 1
+
+        vault.secrets["A"] = "added"
+        time.sleep(0.02)
+
+        assert resolver.resolve("A") == "added"
+        assert vault.fetch_count == 2
+
+    def test_misses_not_cached_with_zero_miss_ttl(self):
+        vault = MockVaultSecretProvider()
+        resolver = CredentialResolver([vault], miss_ttl=0)
+
+        resolver.resolve("A")
+        resolver.resolve("A")
+
+        assert vault.fetch_count == 2
+        assert resolver.stats()["size"] == 0
+
+    def test_concurrent_requests_coalesced(self):
+        vault = MockVaultSecretProvider({"A": "value"}, latency=0.05)
+        resolver = CredentialResolver([vault])
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(resolver.resolve("A"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 8
+        assert vault.fetch_count == 1
+
+    def test_invalidate(self):
+        vault = MockVaultSecretProvider({"A": "value", "B": "value"})
+        resolver = CredentialResolver([vault])
+        resolver.resolve("A")
+        resolver.resolve("B")
+
+        resolver.invalidate("A")
+        resolver.resolve("A")
+        resolver.resolve("B")
+        assert vault.fetch_count == 3
+
+        resolver.invalidate()
+        assert resolver.stats()["size"] == 0
@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest.mock import patch
+
+from template_rooms_pkg.services.health import HealthChecker
+
+
+def checks_by_name(report):
+    return {check["name"]: check for check in report["checks"]}
+
+
+class TestHealthChecker:
+    def test_module_checks(self):
+        checker = HealthChecker("template_rooms_pkg", ["tools", "utils"])
+
+        report = checker.run()
+
+        assert report["status"] == "ok"
+        assert report["cached"] is False
+        checks = checks_by_name(report)
+        assert checks["tools"]["kind"] == "module"
+        assert checks["tools"]["status"] == "ok"
+        assert checks["tools"]["detail"]["components"] == 4
+        assert checks["tools"]["duration_ms"] >= 0
+
+    def test_missing_module_fails(self):
+        checker = HealthChecker("template_rooms_pkg", ["nonexistent"])
+
+        report = checker.run()
+
+        assert report["status"] == "fail"
+        assert checks_by_name(report)["nonexistent"]["status"] == "error"
+        assert "ModuleNotFoundError" in checks_by_name(report)["nonexistent"]["error"]
+
+    def test_verified_modules_not_imported_again(self):
+        checker = HealthChecker("template_rooms_pkg", ["utils"])
+        checker.run()
+
+        with patch('importlib.import_module') as mock_import:
+            report = checker.run(use_cache=False)
+
+            mock_import.assert_not_called()
+
+        assert checks_by_name(report)["utils"]["detail"]["verified"] is True
+
+    def test_dependency_checks(self):
+        checker = HealthChecker("template_rooms_pkg", [])
+        checker.add_check("ok_check", lambda: {"latency_ms": 1})
+        checker.add_check("false_check", lambda: False)
+        checker.add_check("raising_check", lambda: 1 / 0)
+
+        report = checker.run()
+
+        checks = checks_by_name(report)
+        assert checks["ok_check"] == {**checks["ok_check"], "status": "ok", "kind": "dependency",
+                                      "detail": {"latency_ms": 1}}
+        assert checks["false_check"]["status"] == "error"
+        assert "ZeroDivisionError" in checks["raising_check"]["error"]
+        assert report["status"] == "fail"
+
+    def test_checks_run_concurrently(self):
+        checker = HealthChecker("template_rooms_pkg", [])
+        for i in range(4):
+            checker.add_check(f"slow_{i}", lambda: time.sleep(0.1))
+
+        start = time.perf_counter()
+        report = checker.run()
+
+        assert time.perf_counter() - start < 0.3
+        assert report["status"] == "ok"
+
+    def test_timeout(self):
+        checker = HealthChecker("template_rooms_pkg", [], timeout=0.05)
+        checker.add_check("hanging", lambda: time.sleep(0.5))
+
+        start = time.perf_counter()
+        report = checker.run()
+
+        assert time.perf_counter() - start < 0.3
+        assert checks_by_name(report)["hanging"]["status"] == "timeout"
+        assert report["status"] == "fail"
+        checker.shutdown()
+
+    def test_timed_out_check_not_started_again(self):
+        release = threading.Event()
+        calls = []
+        checker = HealthChecker("template_rooms_pkg", [], timeout=0.05)
+        checker.add_check("hanging", lambda: calls.append(1) or release.wait(5))
+
+        for _ in range(3):
+            report = checker.run(use_cache=False)
+            assert checks_by_name(report)["hanging"]["status"] == "timeout"
+
+        assert len(calls) == 1
+        release.set()
+        assert checks_by_name(checker.run(use_cache=False))["hanging"]["status"] == "ok"
+        checker.shutdown()
+
+    def test_report_cached(self):
+        calls = []
+        checker = HealthChecker("template_rooms_pkg", [], cache_ttl=60)
+        checker.add_check("counted", lambda: calls.append(1))
+
+        checker.run()
+        report = checker.run()
+
+        assert report["cached"] is True
+        assert len(calls) == 1
+
+        checker.run(max_age=0)
+        assert len(calls) == 2
+
+    def test_add_check_invalidates_cache(self):
+        checker = HealthChecker("template_rooms_pkg", [])
+        checker.run()
+
+        checker.add_check("new_check", lambda: True)
+        report = checker.run()
+
+        assert report["cached"] is False
+        assert "new_check" in checks_by_name(report)
@@ -0,0 +1,190 @@
+import http.client
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from template_rooms_pkg.services.http import HttpClient, LatencyHistogram, api_request
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.2)
+            elif self.path.startswith("/busy"):
+                time.sleep(0.05)
+            self.reply(200, {"path": self.path, "auth": self.headers.get("Authorization")})
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.reply(201, {"received": body})
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.active = 0
+    server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(timeout=2.0)
+    yield client
+    client.close()
+
+
+class TestHttpClient:
+    def test_get_json(self, server, client):
+        response = client.get(f"{server.url}/items?page=2")
+
+        assert response.ok
+        assert response.json()["path"] == "/items?page=2"
+
+    def test_post_json(self, server, client):
+        response = client.post(f"{server.url}/items", json={"name": "a"})
+
+        assert response.status == 201
+        assert response.json() == {"received": {"name": "a"}}
+
+    def test_keep_alive_reuses_connection(self, server, client):
+        for _ in range(5):
+            assert client.get(f"{server.url}/ping").ok
+
+        assert server.connections == 1
+        metrics = client.metrics()[server.url]
+        assert metrics["requests"] == 5
+        assert metrics["reused"] == 4
+        assert metrics["connections"] == 1
+
+    def test_reconnects_when_server_drops_connection(self, server, client):
+        client.get(f"{server.url}/ping")
+        for connection, _ in client._get_pool("http", "127.0.0.1", server.server_address[1]).idle:
+            connection.sock.close()
+            connection.sock = None
+
+        assert client.get(f"{server.url}/ping").ok
+
+    def test_stale_connection_retries_only_idempotent_methods(self, server, client):
+        client.get(f"{server.url}/ping")
+        stale = http.client.RemoteDisconnected("closed")
+
+        with patch.object(client, "_exchange", side_effect=[stale, (200, {}, b"{}", False)]) as exchange:
+            assert client.get(f"{server.url}/ping").ok
+        assert exchange.call_count == 2
+
+        with patch.object(client, "_exchange", side_effect=[stale, (201, {}, b"{}", False)]) as exchange:
+            with pytest.raises(http.client.RemoteDisconnected):
+                client.post(f"{server.url}/items", json={"name": "a"})
+        assert exchange.call_count == 1
+
+    def test_idle_connections_expire_after_keep_alive(self, server):
+        client = HttpClient(timeout=2.0, keep_alive=0.05)
+        try:
+            client.get(f"{server.url}/ping")
+            time.sleep(0.1)
+
+            with patch.object(client, "_exchange", wraps=client._exchange) as exchange:
+                assert client.post(f"{server.url}/items", json={"name": "a"}).status == 201
+            metrics = client.metrics()[server.url]
+        finally:
+            client.close()
+
+        assert exchange.call_count == 1
+        assert metrics["expired"] == 1
+        assert metrics["connections"] == 2
+        assert metrics["reused"] == 0
+
+    def test_timeout(self, server, client):
+        with pytest.raises(TimeoutError):
+            client.get(f"{server.url}/slow", timeout=0.05)
+
+        assert client.metrics()[server.url]["errors"] == 1
+
+    def test_bounded_in_flight(self, server):
+        client = HttpClient(max_in_flight=2)
+        try:
+            responses = client.request_many([{"method": "GET", "url": f"{server.url}/busy"}] * 6)
+        finally:
+            client.close()
+
+        assert all(response.ok for response in responses)
+        assert server.peak == 2
+
+    def test_request_many_return_exceptions(self, server, client):
+        results = client.request_many(
+            [{"method": "GET", "url": f"{server.url}/ping"}, {"method": "GET", "url": "ftp://invalid"}],
+            return_exceptions=True,
+        )
+
+        assert results[0].ok
+        assert isinstance(results[1], ValueError)
+
+    def test_latency_histogram(self, server, client):
+        client.get(f"{server.url}/ping")
+        client.get(f"{server.url}/busy")
+
+        latency = client.metrics()[server.url]["latency"]
+        assert latency["count"] == 2
+        assert latency["p99_ms"] >= 50
+        assert sum(latency["buckets"].values()) == 2
+
+    def test_api_request_uses_config(self, server, client):
+        config = SimpleNamespace(endpoint=f"{server.url}/v1/", method="GET", timeout=5)
+
+        response = api_request(config, {"api_key": "secret"}, "models", client=client)
+
+        assert response.json() == {"path": "/v1/models", "auth": "Bearer secret"}
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        for value in [1, 2, 3, 50, 500]:
+            histogram.observe(value)
+
+        assert histogram.percentile(0.5) == 10
+        assert histogram.percentile(0.8) == 100
+        assert histogram.percentile(1.0) == 500
+        assert histogram.snapshot()["buckets"] == {"le_10": 3, "le_100": 1, "le_inf": 1}
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(0.5) is None
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import template_rooms_pkg
+from template_rooms_pkg import configuration, services, tools
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def imported_modules(statement: str) -> set:
+    code = f"import sys; {statement}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={"PYTHONPATH": str(SRC)},
+    )
+    return set(result.stdout.split())
+
+
+class TestLazyImports:
+    def test_addon_import_defers_pydantic(self):
+        modules = imported_modules("import template_rooms_pkg.addon")
+
+        assert "pydantic" not in modules
+        assert "template_rooms_pkg.actions.example" not in modules
+
+    def test_package_import_defers_submodules(self):
+        modules = imported_modules("import template_rooms_pkg.configuration")
+
+        assert "template_rooms_pkg.configuration.addonconfig" not in modules
+        assert "pydantic" not in modules
+
+    def test_lazy_attribute_resolves_and_binds(self):
+        from template_rooms_pkg.configuration.cache import ConfigCache
+
+        assert configuration.ConfigCache is ConfigCache
+        assert "ConfigCache" in vars(configuration)
+
+    def test_lazy_root_attribute(self):
+        from template_rooms_pkg.addon import TemplateRoomsAddon
+
+        assert template_rooms_pkg.TemplateRoomsAddon is TemplateRoomsAddon
+
+    def test_dir_lists_lazy_attributes(self):
+        assert set(services.__all__) <= set(dir(services))
+        assert set(tools.__all__) <= set(dir(tools))
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            _ = tools.missing
+
+    def test_action_entrypoint_not_shadowed_by_submodule(self):
+        import template_rooms_pkg.actions.example  # noqa: F401
+        from template_rooms_pkg import actions
+
+        example_module = sys.modules["template_rooms_pkg.actions.example"]
+        assert actions.example is example_module.example
+        assert callable(actions.example)
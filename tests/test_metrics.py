@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest.mock import Mock
+
+from template_rooms_pkg.services.metrics import Metrics, MetricsReporter
+
+
+class TestMetrics:
+    def test_record_counts_latency_and_tokens(self):
+        metrics = Metrics(buckets_ms=(10, 100))
+        metrics.record("example", 5, tokens=100)
+        metrics.record("example", 50, tokens=200)
+        metrics.record("example", 500, error=True)
+        metrics.record_retry("example")
+
+        stats = metrics.snapshot()["example"]
+
+        assert stats["calls"] == 3
+        assert stats["errors"] == 1
+        assert stats["retries"] == 1
+        assert stats["tokens"] == 300
+        assert stats["latency"]["sum_ms"] == 555
+        assert stats["latency"]["buckets"] == {10: 1, 100: 1, "inf": 1}
+        assert stats["latency"]["p50_ms"] == 100
+
+    def test_merges_thread_shards(self):
+        metrics = Metrics()
+
+        def worker():
+            for _ in range(1000):
+                metrics.record("example", 1, tokens=1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = metrics.snapshot()["example"]
+        assert stats["calls"] == 8000
+        assert stats["tokens"] == 8000
+
+    def test_dead_thread_shards_are_retired(self):
+        metrics = Metrics()
+
+        for _ in range(5):
+            thread = threading.Thread(target=metrics.record, args=("example", 1), kwargs={"tokens": 2})
+            thread.start()
+            thread.join()
+
+        stats = metrics.snapshot()["example"]
+        assert stats["calls"] == 5
+        assert stats["tokens"] == 10
+        assert len(metrics._shards) == 0
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_reset(self):
+        metrics = Metrics()
+        metrics.record("example", 1)
+
+        metrics.reset()
+
+        assert metrics.snapshot() == {}
+
+    def test_to_prometheus(self):
+        metrics = Metrics(buckets_ms=(10, 100))
+        metrics.record("example", 5, tokens=7)
+        metrics.record("example", 50)
+
+        text = metrics.to_prometheus(labels={"addon_id": 'a"1'})
+
+        assert "# TYPE rooms_action_calls_total counter" in text
+        assert 'rooms_action_calls_total{addon_id="a\\"1",action="example"} 2' in text
+        assert 'rooms_action_tokens_total{addon_id="a\\"1",action="example"} 7' in text
+        assert "# TYPE rooms_action_latency_seconds histogram" in text
+        assert 'rooms_action_latency_seconds_bucket{addon_id="a\\"1",action="example",le="0.01"} 1' in text
+        assert 'rooms_action_latency_seconds_bucket{addon_id="a\\"1",action="example",le="0.1"} 2' in text
+        assert 'rooms_action_latency_seconds_bucket{addon_id="a\\"1",action="example",le="+Inf"} 2' in text
+        assert 'rooms_action_latency_seconds_count{addon_id="a\\"1",action="example"} 2' in text
+        assert text.endswith("\n")
+
+
+class TestMetricsReporter:
+    def test_pushes_snapshots_at_interval(self):
+        metrics = Metrics()
+        metrics.record("example", 1)
+        callback = Mock()
+
+        reporter = MetricsReporter(metrics, callback, interval=0.01).start()
+        deadline = time.monotonic() + 2
+        while callback.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        reporter.stop(flush=False)
+
+        assert callback.call_count >= 2
+        snapshot = callback.call_args.args[0]
+        assert snapshot["interval"] == 0.01
+        assert snapshot["actions"]["example"]["calls"] == 1
+
+    def test_stop_flushes(self):
+        callback = Mock()
+        reporter = MetricsReporter(Metrics(), callback, interval=60).start()
+
+        reporter.stop()
+
+        callback.assert_called_once()
+        assert callback.call_args.args[0]["actions"] == {}
@@ -0,0 +1,209 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from template_rooms_pkg.actions.base import TokensSchema
+from template_rooms_pkg.services.ratelimit import (
+    LLMRateLimiter,
+    RateLimiter,
+    RateLimitExceeded,
+    TokenBucket,
+    used_tokens,
+)
+
+
+class SameRepr:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "same"
+
+
+class TestTokenBucket:
+    def test_refill_capped_at_capacity(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.take(5)
+
+        bucket.refill(bucket.updated + 0.2)
+        assert bucket.level == pytest.approx(2)
+
+        bucket.refill(bucket.updated + 10)
+        assert bucket.level == 5
+
+    def test_wait_time(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        bucket.take(5)
+
+        assert bucket.wait_time(2) == pytest.approx(0.2)
+        assert bucket.wait_time(100) == pytest.approx(0.5)
+
+
+class TestRateLimiter:
+    def test_requests_per_second(self):
+        limiter = RateLimiter(requests_per_second=20, burst=2)
+
+        start = time.perf_counter()
+        for _ in range(4):
+            limiter.acquire()
+        elapsed = time.perf_counter() - start
+
+        assert 0.08 <= elapsed < 0.3
+        assert limiter.stats["requests"] == 4
+        assert limiter.stats["throttled"] >= 1
+
+    def test_unlimited(self):
+        limiter = RateLimiter()
+
+        for _ in range(100):
+            limiter.acquire(tokens=1000)
+
+        assert limiter.stats["throttled"] == 0
+
+    def test_tokens_per_minute_timeout(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter.acquire(tokens=600)
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire(tokens=100, timeout=0.05)
+
+    def test_settle_refunds_unused_tokens(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter.acquire(tokens=600)
+        limiter.settle(reserved=600, used=100)
+
+        limiter.acquire(tokens=400, timeout=0.01)
+        assert limiter.stats["tokens"] == 100
+
+    def test_settle_charges_extra_tokens(self):
+        limiter = RateLimiter(tokens_per_minute=6000)
+        limiter.acquire(tokens=100)
+        limiter.settle(reserved=100, used=6000)
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire(tokens=100, timeout=0.01)
+
+    def test_waiters_served_in_arrival_order(self):
+        limiter = RateLimiter(requests_per_second=50, burst=1)
+        limiter.acquire()
+        order = []
+
+        def worker(i):
+            limiter.acquire()
+            order.append(i)
+
+        threads = []
+        for i in range(5):
+            thread = threading.Thread(target=worker, args=(i,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.005)
+        for thread in threads:
+            thread.join()
+
+        assert order == [0, 1, 2, 3, 4]
+
+
+class TestLLMRateLimiter:
+    def test_used_tokens(self):
+        assert used_tokens(TokensSchema(stepAmount=5, totalCurrentAmount=10)) == 5
+        assert used_tokens(Mock(tokens=TokensSchema(stepAmount=7, totalCurrentAmount=10))) == 7
+        assert used_tokens("text") is None
+
+    def test_budget_per_provider_and_model(self):
+        limiter = LLMRateLimiter(requests_per_second=1)
+        limiter.set_budget("openai", "gpt", requests_per_second=100)
+
+        assert limiter.limiter("openai", "gpt").requests_per_second == 100
+        assert limiter.limiter("anthropic", "claude").requests_per_second == 1
+        assert limiter.limiter("openai", "gpt") is limiter.limiter("openai", "gpt")
+
+    def test_settles_with_result_tokens(self):
+        limiter = LLMRateLimiter(tokens_per_minute=10000)
+
+        def backend(prompt):
+            return Mock(tokens=TokensSchema(stepAmount=42, totalCurrentAmount=42))
+
+        limiter.call("openai", "gpt", backend, "hello", estimated_tokens=1000)
+
+        assert limiter.limiter("openai", "gpt").stats["tokens"] == 42
+
+    def test_identical_calls_coalesced(self):
+        limiter = LLMRateLimiter()
+        calls = []
+        barrier = threading.Event()
+
+        def backend(prompt):
+            calls.append(prompt)
+            barrier.wait(1)
+            return f"answer to {prompt}"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(limiter.call("openai", "gpt", backend, "same prompt")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        barrier.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["same prompt"]
+        assert results == ["answer to same prompt"] * 5
+        assert limiter.stats()["coalesced"] == 4
+        assert limiter.stats()["limiters"]["openai/gpt"]["requests"] == 1
+
+    def test_different_calls_not_coalesced(self):
+        limiter = LLMRateLimiter()
+        backend = Mock(side_effect=lambda prompt: prompt)
+
+        assert limiter.call("openai", "gpt", backend, "a") == "a"
+        assert limiter.call("openai", "gpt", backend, "b") == "b"
+        assert backend.call_count == 2
+
+    @pytest.mark.parametrize("first, second", [
+        (("a", [1, 2]), ("a", (1, 2))),
+        ({1: "x"}, {"1": "x"}),
+        (SameRepr(1), SameRepr(2)),
+    ])
+    def test_calls_with_same_repr_not_coalesced(self, first, second):
+        limiter = LLMRateLimiter()
+        release = threading.Event()
+        results = {}
+
+        def backend(value):
+            release.wait(1)
+            return value
+
+        threads = [
+            threading.Thread(target=lambda v=value: results.__setitem__(id(v), limiter.call("openai", "gpt", backend, v)))
+            for value in (first, second)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == {id(first): first, id(second): second}
+        assert limiter.stats()["coalesced"] == 0
+
+    def test_unpicklable_arguments_not_coalesced(self):
+        limiter = LLMRateLimiter()
+        backend = Mock(return_value="ok")
+
+        assert limiter.call("openai", "gpt", backend, lambda: None) == "ok"
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_failure_refunds_reservation(self):
+        limiter = LLMRateLimiter(tokens_per_minute=600)
+
+        with pytest.raises(RuntimeError):
+            limiter.call("openai", "gpt", Mock(side_effect=RuntimeError("backend down")), estimated_tokens=600)
+
+        limiter.limiter("openai", "gpt").acquire(tokens=600, timeout=0.01)
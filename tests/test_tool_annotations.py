@@ -0,0 +1,156 @@
+import dataclasses
+import enum
+from typing import Any, Literal, Optional, TypedDict, Union
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from template_rooms_pkg.tools.annotations import UnsupportedAnnotation, annotation_schema, signature_schema
+from template_rooms_pkg.tools.base import ToolRegistry
+from template_rooms_pkg.tools.cache import schema_cache
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class SearchOptions(TypedDict, total=False):
+    depth: int
+    exact: bool
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float = 0.0
+    labels: list[str] = dataclasses.field(default_factory=list)
+
+
+class Node(TypedDict):
+    children: list["Node"]
+
+
+class Query(BaseModel):
+    text: str
+
+
+class TestAnnotationSchema:
+    @pytest.mark.parametrize("annotation, expected", [
+        (str, {"type": "string"}),
+        (int, {"type": "integer"}),
+        (float, {"type": "number"}),
+        (bool, {"type": "boolean"}),
+        (None, {"type": "null"}),
+        (Any, {}),
+        (list, {"type": "array"}),
+        (list[int], {"type": "array", "items": {"type": "integer"}}),
+        (set[str], {"type": "array", "items": {"type": "string"}, "uniqueItems": True}),
+        (tuple[int, ...], {"type": "array", "items": {"type": "integer"}}),
+        (tuple[int, str], {"type": "array", "prefixItems": [{"type": "integer"}, {"type": "string"}],
+                           "minItems": 2, "maxItems": 2}),
+        (dict, {"type": "object"}),
+        (dict[str, float], {"type": "object", "additionalProperties": {"type": "number"}}),
+        (Optional[int], {"anyOf": [{"type": "integer"}, {"type": "null"}]}),
+        (Union[int, str], {"anyOf": [{"type": "integer"}, {"type": "string"}]}),
+        (Literal["a", "b"], {"enum": ["a", "b"], "type": "string"}),
+        (Literal[1, "a"], {"enum": [1, "a"]}),
+        (Color, {"enum": ["red", "blue"], "type": "string"}),
+    ])
+    def test_annotations(self, annotation, expected):
+        assert annotation_schema(annotation) == expected
+
+    def test_typeddict(self):
+        assert annotation_schema(SearchOptions) == {
+            "type": "object",
+            "properties": {"depth": {"type": "integer"}, "exact": {"type": "boolean"}},
+            "required": [],
+        }
+
+    def test_dataclass(self):
+        assert annotation_schema(Point) == {
+            "type": "object",
+            "properties": {
+                "x": {"type": "number"},
+                "y": {"type": "number", "default": 0.0},
+                "labels": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["x"],
+        }
+
+    @pytest.mark.parametrize("annotation", [Query, dict[int, str], Node, bytes])
+    def test_unsupported(self, annotation):
+        with pytest.raises(UnsupportedAnnotation):
+            annotation_schema(annotation)
+
+
+class TestSignatureSchema:
+    def test_defaults_are_optional(self):
+        def tool(query: str, limit: int = 10, color: Color = Color.RED, tags: Optional[list[str]] = None) -> dict:
+            return {}
+
+        schema = signature_schema(tool)
+
+        assert schema["required"] == ["query"]
+        assert schema["properties"]["limit"] == {"type": "integer", "default": 10}
+        assert schema["properties"]["color"]["default"] == "red"
+        assert schema["properties"]["tags"]["default"] is None
+
+    def test_unserializable_default_is_not_advertised(self):
+        marker = object()
+
+        def tool(value: Any = marker) -> None:
+            pass
+
+        assert signature_schema(tool) == {"type": "object", "properties": {"value": {}}, "required": []}
+
+    def test_declines_what_pydantic_handles(self):
+        def unannotated(param):
+            pass
+
+        def with_model(query: Query):
+            pass
+
+        def with_kwargs(query: str, **options: Any):
+            pass
+
+        assert signature_schema(unannotated) is None
+        assert signature_schema(with_model) is None
+        assert signature_schema(with_kwargs) is None
+
+
+class TestRegistrySchemaPaths:
+    def setup_method(self):
+        schema_cache.clear()
+
+    def test_simple_signature_skips_pydantic(self):
+        def tool(query: str, options: SearchOptions, mode: Literal["fast", "slow"] = "fast") -> dict:
+            return {}
+
+        with patch('pydantic.create_model') as mock_create_model:
+            schema = ToolRegistry()._convert_annotations_to_schema(tool)
+
+            mock_create_model.assert_not_called()
+
+        assert schema["required"] == ["query", "options"]
+        assert schema["properties"]["mode"] == {"enum": ["fast", "slow"], "type": "string", "default": "fast"}
+
+    def test_model_parameters_use_pydantic(self):
+        def tool(query: Query) -> dict:
+            return {}
+
+        schema = ToolRegistry()._convert_annotations_to_schema(tool)
+
+        assert schema["required"] == ["query"]
+        assert "$defs" in schema
+
+    def test_basic_type_converter_handles_complex_types_and_defaults(self):
+        def tool(query: str, tags: list[str], limit: Optional[int] = None) -> dict:
+            return {}
+
+        schema = ToolRegistry()._basic_type_converter(tool)
+
+        assert schema["properties"]["tags"] == {"type": "array", "items": {"type": "string"}}
+        assert schema["properties"]["limit"] == {"anyOf": [{"type": "integer"}, {"type": "null"}]}
+        assert schema["required"] == ["query", "tags"]
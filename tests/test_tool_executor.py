@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from template_rooms_pkg.tools.base import ToolRegistry
+from template_rooms_pkg.tools.executor import ToolExecutor
+
+
+class TestToolExecutor:
+    def test_invoke_sync_tool(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        result = asyncio.run(registry.invoke("test_tool", {"param1": "value"}))
+
+        assert result == {"tool": "test_tool", "param1": "value", "param2": 5}
+
+    def test_invoke_sync_tool_runs_in_thread_pool(self):
+        registry = ToolRegistry()
+        registry.register_tools({"thread_name": lambda: threading.current_thread().name})
+
+        result = asyncio.run(registry.invoke("thread_name"))
+
+        assert result.startswith("tool")
+
+    def test_invoke_async_tool(self):
+        registry = ToolRegistry()
+
+        async def async_tool(value: int) -> int:
+            await asyncio.sleep(0)
+            return value * 2
+
+        registry.register_tools({"async_tool": async_tool})
+
+        assert asyncio.run(registry.invoke("async_tool", {"value": 21})) == 42
+
+    def test_invoke_unknown_tool(self):
+        registry = ToolRegistry()
+
+        with pytest.raises(ValueError, match="Unknown tool"):
+            asyncio.run(registry.invoke("nonexistent"))
+
+    def test_invoke_retries_with_configured_max_retries(self):
+        registry = ToolRegistry()
+        registry.configure_executor(backoff_base=0)
+        calls = []
+
+        def flaky_tool() -> str:
+            calls.append(1)
+            if len(calls) < 3:
+                raise RuntimeError("temporary failure")
+            return "ok"
+
+        registry.register_tools({"flaky_tool": flaky_tool}, tool_max_retries={"flaky_tool": 2})
+
+        assert asyncio.run(registry.invoke("flaky_tool")) == "ok"
+        assert len(calls) == 3
+
+    def test_invoke_records_metrics(self):
+        from template_rooms_pkg.services.metrics import Metrics
+
+        registry = ToolRegistry()
+        registry.configure_executor(backoff_base=0)
+        registry.metrics = Metrics()
+        calls = []
+
+        def flaky_tool() -> str:
+            calls.append(1)
+            if len(calls) < 2:
+                raise RuntimeError("temporary failure")
+            return "ok"
+
+        registry.register_tools({"flaky_tool": flaky_tool}, tool_max_retries={"flaky_tool": 1})
+        asyncio.run(registry.invoke("flaky_tool"))
+
+        stats = registry.metrics.snapshot()["tool.flaky_tool"]
+        assert stats["calls"] == 1
+        assert stats["retries"] == 1
+        assert stats["errors"] == 0
+
+    def test_invoke_raises_after_retries_exhausted(self):
+        registry = ToolRegistry()
+        registry.configure_executor(backoff_base=0)
+        calls = []
+
+        def failing_tool() -> str:
+            calls.append(1)
+            raise RuntimeError("permanent failure")
+
+        registry.register_tools({"failing_tool": failing_tool}, tool_max_retries={"failing_tool": 1})
+
+        with pytest.raises(RuntimeError, match="permanent failure"):
+            asyncio.run(registry.invoke("failing_tool"))
+        assert len(calls) == 2
+
+    def test_invoke_many_runs_in_parallel(self):
+        registry = ToolRegistry()
+
+        def slow_tool(delay: float) -> float:
+            time.sleep(delay)
+            return delay
+
+        registry.register_tools({"slow_tool": slow_tool})
+        registry.configure_executor(max_workers=4, per_tool_concurrency=4)
+
+        start = time.perf_counter()
+        results = asyncio.run(registry.invoke_many([("slow_tool", {"delay": 0.1})] * 4))
+        elapsed = time.perf_counter() - start
+
+        assert results == [0.1] * 4
+        assert elapsed < 0.35
+
+    def test_invoke_many_return_exceptions(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        results = asyncio.run(registry.invoke_many(
+            [("another_tool", None), ("nonexistent", None)], return_exceptions=True
+        ))
+
+        assert results[0] == "success"
+        assert isinstance(results[1], ValueError)
+
+    def test_per_tool_concurrency_limit(self):
+        registry = ToolRegistry()
+        active = []
+        peak = []
+
+        async def tracked_tool() -> None:
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+        registry.register_tools({"tracked_tool": tracked_tool})
+        registry.configure_executor(tool_concurrency={"tracked_tool": 2})
+
+        asyncio.run(registry.invoke_many([("tracked_tool", None)] * 6))
+
+        assert max(peak) == 2
+
+    def test_global_concurrency_limit(self):
+        registry = ToolRegistry()
+        active = []
+        peak = []
+
+        async def tracked_tool() -> None:
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+        registry.register_tools({"tool_a": tracked_tool, "tool_b": tracked_tool})
+        registry.configure_executor(max_concurrency=3)
+
+        asyncio.run(registry.invoke_many([("tool_a", None), ("tool_b", None)] * 4))
+
+        assert max(peak) == 3
+
+    def test_executor_reusable_across_event_loops(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        assert asyncio.run(registry.invoke("another_tool")) == "success"
+        assert asyncio.run(registry.invoke("another_tool")) == "success"
+
+    def test_concurrent_event_loops_keep_their_own_limits(self):
+        active, peak = {}, {}
+
+        async def tracked_tool():
+            name = threading.current_thread().name
+            active[name] = active.get(name, 0) + 1
+            peak[name] = max(peak.get(name, 0), active[name])
+            await asyncio.sleep(0.01)
+            active[name] -= 1
+            return "done"
+
+        registry = ToolRegistry()
+        registry.register_tools({"tracked_tool": tracked_tool})
+        registry.configure_executor(per_tool_concurrency=1)
+
+        async def staggered(index):
+            await asyncio.sleep(index * 0.003)
+            return await registry.invoke("tracked_tool")
+
+        async def run():
+            return await asyncio.gather(*(staggered(index) for index in range(8)))
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.extend(asyncio.run(run()))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["done"] * 16
+        assert set(peak.values()) == {1}
+        asyncio.run(registry.invoke("tracked_tool"))
+        assert len(registry.executor._limits) <= 1
+
+    def test_backoff_delay_is_capped(self):
+        executor = ToolExecutor(ToolRegistry(), backoff_base=1.0, backoff_max=2.0)
+
+        assert executor._backoff_delay(10) <= 2.0
+        assert executor._backoff_delay(0) >= 0.5
+
+    def test_shutdown(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+        asyncio.run(registry.invoke("another_tool"))
+
+        registry.executor.shutdown()
+
+        assert registry.executor._pool is None
@@ -1,11 +1,16 @@
+import json
 from unittest.mock import Mock, patch
 
 import pytest
 
 from template_rooms_pkg.tools.base import ToolRegistry
+from template_rooms_pkg.tools.cache import SchemaCache, schema_cache
 
 
 class TestToolRegistry:
+    def setup_method(self):
+        schema_cache.clear()
+
     def test_tool_registry_initialization(self):
         registry = ToolRegistry()
 
@@ -63,7 +68,7 @@ class TestToolRegistry:
         assert registry.functions["test_func"] == test_func
         assert registry.tool_definitions["test_func"]["name"] == "test_func"
         assert registry.tool_definitions["test_func"]["description"] == "Test function"
-        assert "input_schema" in registry.tool_definitions["test_func"]
+        assert "input_schema" in registry.get_tool_definition("test_func")
 
     def test_convert_annotations_to_schema_with_pydantic(self):
         registry = ToolRegistry()
@@ -154,6 +159,46 @@ class TestToolRegistry:
         assert "another_tool" in tools
         assert tools is not registry.tool_definitions
 
+    def test_register_tools_defers_schema_generation(self, sample_tools):
+        registry = ToolRegistry()
+
+        with patch.object(registry, '_convert_annotations_to_schema') as mock_convert:
+            registry.register_tools(sample_tools)
+
+            mock_convert.assert_not_called()
+
+        assert "input_schema" not in registry.tool_definitions["test_tool"]
+        assert registry.get_tool_names() == ["test_tool", "another_tool"]
+
+    def test_get_tool_definition_memoizes_schema(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        with patch.object(registry, '_convert_annotations_to_schema', return_value={"type": "object"}) as mock_convert:
+            first = registry.get_tool_definition("test_tool")
+            second = registry.get_tool_definition("test_tool")
+
+            mock_convert.assert_called_once_with(sample_tools["test_tool"])
+
+        assert first is second
+        assert first["input_schema"] == {"type": "object"}
+        assert "input_schema" not in registry.tool_definitions["another_tool"]
+
+    def test_get_tool_definition_nonexistent(self):
+        registry = ToolRegistry()
+
+        assert registry.get_tool_definition("nonexistent") is None
+
+    def test_get_tools_for_action_subset(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        tools = registry.get_tools_for_action(["another_tool", "nonexistent"])
+
+        assert list(tools.keys()) == ["another_tool"]
+        assert "input_schema" in tools["another_tool"]
+        assert "input_schema" not in registry.tool_definitions["test_tool"]
+
     def test_get_function(self, sample_tools):
         registry = ToolRegistry()
         registry.register_tools(sample_tools)
@@ -254,3 +299,340 @@ class TestToolRegistry:
         schema = registry._basic_type_converter(no_annotations_func)
 
         assert schema == {"type": "object", "properties": {}, "required": []}
+
+
+class TestVersionedRegistry:
+    def test_generation_moves_on_every_change(self, sample_tools):
+        registry = ToolRegistry()
+        generations = [registry.generation]
+
+        registry.register_tools(sample_tools)
+        generations.append(registry.generation)
+        registry.add_tool("new_tool", lambda: "new")
+        generations.append(registry.generation)
+        registry.replace_tool("new_tool", lambda: "replaced")
+        generations.append(registry.generation)
+        registry.remove_tool("new_tool")
+        generations.append(registry.generation)
+        registry.clear()
+        generations.append(registry.generation)
+
+        assert generations == sorted(set(generations))
+
+    def test_add_replace_remove(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools, {"test_tool": "Custom"}, {"test_tool": 2})
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.add_tool("test_tool", lambda: None)
+        with pytest.raises(ValueError, match="Unknown tool"):
+            registry.replace_tool("nonexistent", lambda: None)
+
+        def replacement(query: str) -> str:
+            return query
+
+        registry.replace_tool("test_tool", replacement)
+
+        assert registry.get_function("test_tool") is replacement
+        assert registry.tool_definitions["test_tool"]["description"] == "Custom"
+        assert registry.get_max_retries("test_tool") == 2
+        assert registry.get_tool_definition("test_tool")["input_schema"]["required"] == ["query"]
+
+        assert registry.remove_tool("test_tool") is True
+        assert registry.remove_tool("test_tool") is False
+        assert registry.get_tool_names() == ["another_tool"]
+
+    def test_snapshot_rebuilt_only_on_new_generation(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        snapshot = registry.snapshot()
+
+        assert registry.snapshot() is snapshot
+        assert "input_schema" in snapshot["test_tool"]
+        with pytest.raises(TypeError):
+            snapshot["new_tool"] = {}
+
+        registry.add_tool("new_tool", lambda: None)
+
+        assert registry.snapshot() is not snapshot
+        assert "new_tool" in registry.snapshot()
+        assert "new_tool" not in snapshot
+
+    def test_sync_applies_only_differences(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+        definition = registry.get_tool_definition("another_tool")
+        generation = registry.generation
+
+        def new_tool() -> str:
+            return "new"
+
+        changes = registry.sync(
+            {"another_tool": sample_tools["another_tool"], "new_tool": new_tool},
+            tool_max_retries={"new_tool": 1},
+        )
+
+        assert changes == {"added": ["new_tool"], "removed": ["test_tool"], "changed": []}
+        assert registry.get_tool_definition("another_tool") is definition
+        assert registry.get_max_retries("new_tool") == 1
+        assert registry.generation > generation
+
+        generation = registry.generation
+        unchanged = registry.sync(
+            {"another_tool": sample_tools["another_tool"], "new_tool": new_tool},
+            tool_max_retries={"new_tool": 1},
+        )
+
+        assert unchanged == {"added": [], "removed": [], "changed": []}
+        assert registry.generation == generation
+
+    def test_diff_detects_changed_description(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        changes = registry.diff(sample_tools, {"test_tool": "New description"})
+
+        assert changes == {"added": [], "removed": [], "changed": ["test_tool"]}
+        assert registry.tool_definitions["test_tool"]["description"] == "Execute test_tool action"
+
+
+class TestToolFormats:
+    def test_openai_and_anthropic_payloads(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools, {"test_tool": "A test tool"})
+
+        openai_tools = registry.format_tools("openai")
+        anthropic_tools = registry.format_tools("anthropic")
+
+        assert openai_tools[0]["type"] == "function"
+        assert openai_tools[0]["function"]["name"] == "test_tool"
+        assert openai_tools[0]["function"]["description"] == "A test tool"
+        assert openai_tools[0]["function"]["parameters"]["required"] == ["param1"]
+        assert anthropic_tools[0] == {
+            "name": "test_tool",
+            "description": "A test tool",
+            "input_schema": registry.get_tool_definition("test_tool")["input_schema"],
+        }
+
+    def test_payload_cached_per_format_and_generation(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        payload = registry.format_tools("openai")
+        encoded = registry.format_tools_json("openai")
+
+        assert registry.format_tools("openai") is payload
+        assert registry.format_tools_json("openai") is encoded
+        assert json.loads(encoded) == payload
+        assert registry.format_tools("generic") is not payload
+
+        registry.remove_tool("another_tool")
+
+        assert registry.format_tools("openai") is not payload
+        assert [tool["function"]["name"] for tool in json.loads(registry.format_tools_json("openai"))] == ["test_tool"]
+
+    def test_format_subset(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        tools = registry.format_tools("anthropic", ["another_tool", "nonexistent"])
+
+        assert [tool["name"] for tool in tools] == ["another_tool"]
+
+    def test_custom_and_unknown_formats(self, sample_tools):
+        from template_rooms_pkg.tools.base import tool_formats
+
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        with pytest.raises(ValueError, match="Unknown tool format"):
+            registry.format_tools("nonexistent")
+
+        tool_formats["names"] = lambda definition: {"name": definition["name"]}
+        try:
+            assert registry.format_tools_json("names") == b'[{"name":"test_tool"},{"name":"another_tool"}]'
+        finally:
+            del tool_formats["names"]
+
+
+class TestToolCall:
+    def test_call_coerces_and_applies_defaults(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        result = registry.call("test_tool", {"param1": "value", "param2": "7"})
+
+        assert result == {"tool": "test_tool", "param1": "value", "param2": 7}
+        assert registry.call("test_tool", {"param1": "value"})["param2"] == 5
+        assert registry.call("another_tool") == "success"
+
+    def test_call_rejects_invalid_arguments(self, sample_tools):
+        from pydantic import ValidationError
+
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        with pytest.raises(ValidationError):
+            registry.call("test_tool", {"param2": 1})
+        with pytest.raises(ValidationError):
+            registry.call("test_tool", {"param1": "value", "unknown": 1})
+
+        stats = registry.get_call_stats()["test_tool"]
+        assert stats["validation_errors"] == 2
+        assert stats["calls"] == 0
+
+    def test_call_unknown_tool(self):
+        with pytest.raises(ValueError, match="Unknown tool"):
+            ToolRegistry().call("nonexistent", {})
+
+    def test_validator_compiled_once_and_reset_on_reregister(self, sample_tools):
+        registry = ToolRegistry()
+        registry.register_tools(sample_tools)
+
+        registry.call("test_tool", {"param1": "a"})
+        validator = registry._validators["test_tool"]
+        registry.call("test_tool", {"param1": "b"})
+
+        assert registry._validators["test_tool"] is validator
+        stats = registry.get_call_stats()["test_tool"]
+        assert stats["calls"] == 2
+        assert stats["mean_validate_us"] > 0
+
+        registry.register_tools({"test_tool": lambda param1: param1})
+        assert "test_tool" not in registry._validators
+        assert registry.call("test_tool", {"param1": "c"}) == "c"
+
+    def test_call_passes_kwargs_and_positional_only(self):
+        def tool(query: str, /, limit: int = 1, **options) -> tuple:
+            return query, limit, options
+
+        registry = ToolRegistry()
+        registry.register_tools({"tool": tool})
+
+        assert registry.call("tool", {"query": "q", "limit": "2", "extra": True}) == ("q", 2, {"extra": True})
+
+    def test_call_accepts_private_and_reserved_parameter_names(self):
+        from pydantic import ValidationError
+
+        def private(_private: int, n: int) -> tuple:
+            return _private, n
+
+        def reserved(model_config: dict, n: int) -> tuple:
+            return model_config, n
+
+        registry = ToolRegistry()
+        registry.register_tools({"private": private, "reserved": reserved})
+
+        assert registry.call("private", {"_private": "1", "n": 2}) == (1, 2)
+        assert registry.call("reserved", {"model_config": {"a": 1}, "n": "3"}) == ({"a": 1}, 3)
+        with pytest.raises(ValidationError):
+            registry.call("private", {"_private": 1, "n": 2, "field_0": 1})
+
+    def test_call_records_metrics(self, sample_tools):
+        from template_rooms_pkg.services.metrics import Metrics
+
+        registry = ToolRegistry()
+        registry.metrics = Metrics()
+        registry.register_tools(sample_tools)
+
+        registry.call("another_tool", {})
+
+        assert registry.metrics.snapshot()["tool.another_tool"]["calls"] == 1
+
+    def test_call_async_tool_records_after_await(self):
+        import asyncio
+
+        from template_rooms_pkg.services.metrics import Metrics
+
+        async def slow(delay: float) -> str:
+            await asyncio.sleep(delay)
+            return "done"
+
+        async def failing() -> None:
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        registry = ToolRegistry()
+        registry.metrics = Metrics()
+        registry.register_tools({"slow": slow, "failing": failing})
+
+        assert asyncio.run(registry.call("slow", {"delay": "0.02"})) == "done"
+        with pytest.raises(RuntimeError):
+            asyncio.run(registry.call("failing"))
+
+        assert registry.get_call_stats()["slow"]["mean_run_us"] >= 20000
+        assert registry.get_call_stats()["failing"]["errors"] == 1
+        assert registry.metrics.snapshot()["tool.failing"]["errors"] == 1
+
+
+class TestSchemaCache:
+    def setup_method(self):
+        schema_cache.clear()
+
+    def test_reregistering_tool_hits_cache(self, sample_tools):
+        first = ToolRegistry()
+        first.register_tools(sample_tools)
+        first.get_tools_for_action()
+
+        with patch('pydantic.create_model') as mock_create_model:
+            registry = ToolRegistry()
+            registry.register_tools(sample_tools)
+            tools = registry.get_tools_for_action()
+
+            mock_create_model.assert_not_called()
+
+        assert schema_cache.stats()["hits"] == 2
+        assert tools["test_tool"]["input_schema"]["required"] == ["param1"]
+
+    def test_registries_do_not_share_cached_schemas(self, sample_tools):
+        first = ToolRegistry()
+        first.register_tools(sample_tools)
+        first.get_tools_for_action()["test_tool"]["input_schema"]["required"].append("mutated")
+
+        second = ToolRegistry()
+        second.register_tools(sample_tools)
+
+        assert second.get_tools_for_action()["test_tool"]["input_schema"]["required"] == ["param1"]
+
+    def test_changed_signature_misses_cache(self):
+        registry = ToolRegistry()
+
+        def tool(param: str) -> str:
+            return param
+
+        first = registry._convert_annotations_to_schema(tool)
+
+        def tool(param: int) -> int:  # noqa: F811
+            return param
+
+        second = registry._convert_annotations_to_schema(tool)
+
+        assert first["properties"]["param"]["type"] == "string"
+        assert second["properties"]["param"]["type"] == "integer"
+        assert schema_cache.stats()["misses"] == 2
+
+    def test_lru_eviction(self):
+        cache = SchemaCache(maxsize=2)
+
+        cache.put(("a",), {"a": 1})
+        cache.put(("b",), {"b": 1})
+        cache.get(("a",))
+        cache.put(("c",), {"c": 1})
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == {"a": 1}
+        assert len(cache) == 2
+
+    def test_stats_and_clear(self):
+        cache = SchemaCache(maxsize=8)
+        cache.put(("a",), {})
+
+        cache.get(("a",))
+        cache.get(("missing",))
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 8}
+
+        cache.clear()
+
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 8}
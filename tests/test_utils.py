@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from template_rooms_pkg.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_returns_result(self):
+        flight = SingleFlight()
+
+        assert flight.do("key", lambda x: x * 2, 21) == 42
+        assert flight.in_flight() == 0
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        results = []
+        barrier = threading.Barrier(5)
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return "shared"
+
+        def worker():
+            barrier.wait()
+            results.append(flight.do("key", slow))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["shared"] * 5
+        assert len(calls) == 1
+
+    def test_exception_propagates_and_key_released(self):
+        flight = SingleFlight()
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            flight.do("key", failing)
+
+        assert flight.do("key", lambda: "recovered") == "recovered"